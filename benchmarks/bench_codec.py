@@ -0,0 +1,51 @@
+# -*- coding: utf8 -*-
+"""Measure the cost of decoding one page of task runs.
+
+Compares the former ``json.loads(r.text)`` path, which first decodes the body
+to str, against every installed codec decoding the raw bytes.
+
+Usage::
+
+    $ python benchmarks/bench_codec.py [rows_per_page]
+"""
+
+import json
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from pbclient import codec  # noqa: E402
+from stub_server import make_row  # noqa: E402
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    page = [make_row('taskrun', i) for i in range(1, rows + 1)]
+    body = json.dumps(page).encode('utf-8')
+    print('page of %d task runs, %d KB' % (rows, len(body) // 1024))
+
+    def report(label, func):
+        n, total = timeit.Timer(func).autorange()
+        print('%-30s %8.2f ms/page' % (label, total / n * 1000))
+
+    report('json.loads(body.decode())', lambda: json.loads(body.decode()))
+    for name in codec.PREFERENCE:
+        try:
+            c = codec.get_codec(name)
+        except ImportError:
+            print('%-30s not installed' % name)
+            continue
+        report('%s.loads(bytes)' % name, lambda: c.loads(body))
+    print('')
+    report('json.dumps(page) (str)', lambda: json.dumps(page))
+    for name in codec.PREFERENCE:
+        try:
+            c = codec.get_codec(name)
+        except ImportError:
+            continue
+        report('%s.dumps(page)' % name, lambda: c.dumps(page))
+
+
+if __name__ == '__main__':
+    main()
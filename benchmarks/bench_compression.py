@@ -0,0 +1,63 @@
+# -*- coding: utf8 -*-
+"""Measure the bytes sent and the latency with and without gzip.
+
+Creates tasks with a large ``info`` payload with request compression off and
+on, and reads pages of task runs with and without a gzipped answer, against
+the stub server emulating a link of limited bandwidth.
+
+Usage::
+
+    $ python benchmarks/bench_compression.py [n_requests] [bandwidth_kb_s]
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+import pbclient  # noqa: E402
+from stub_server import StubServer, make_row  # noqa: E402
+
+
+def run(label, server, n, call):
+    """Time n calls and print the latency and the bytes transferred."""
+    pbclient.close()
+    bytes_in, bytes_out = server.bytes_in, server.bytes_out
+    start = time.time()
+    for i in range(n):
+        call(i)
+    elapsed = time.time() - start
+    print('%-36s %8.1f ms/req %9d B up %9d B down'
+          % (label, elapsed / n * 1000,
+             (server.bytes_in - bytes_in) // n,
+             (server.bytes_out - bytes_out) // n))
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    bandwidth = int(sys.argv[2]) if len(sys.argv) > 2 else 1024
+    server = StubServer(rows=1000, gzip=True,
+                        bandwidth=bandwidth * 1024).start()
+    pbclient.set('endpoint', server.endpoint)
+    info = dict(rows=[make_row('taskrun', i) for i in range(1, 201)])
+    print('link of %d KB/s' % bandwidth)
+    try:
+        pbclient.set('compress', None)
+        run('create_task, compress off', server, n,
+            lambda i: pbclient.create_task(1, info))
+        pbclient.set('compress', True)
+        run('create_task, compress on', server, n,
+            lambda i: pbclient.create_task(1, info))
+        pbclient.set('accept_encoding', None)
+        run('1000 task runs, identity answer', server, n,
+            lambda i: pbclient.get_taskruns(1, limit=1000, last_id=0))
+        pbclient.set('accept_encoding', 'gzip')
+        run('1000 task runs, gzip answer', server, n,
+            lambda i: pbclient.get_taskruns(1, limit=1000, last_id=0))
+    finally:
+        pbclient.close()
+        server.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+# -*- coding: utf8 -*-
+"""Measure the speed and peak memory of streaming exports.
+
+The peak memory traced while exporting should stay flat as the number of
+rows grows.
+
+Usage::
+
+    $ python benchmarks/bench_export.py [rows]
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+import pbclient  # noqa: E402
+from stub_server import StubServer  # noqa: E402
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    tmp = tempfile.mkdtemp()
+    try:
+        for count in (rows // 10, rows):
+            server = StubServer(rows=count, latency=0).start()
+            client = pbclient.PyBossaClient(server.endpoint)
+            try:
+                for name in ('taskruns.ndjson', 'taskruns.csv',
+                             'taskruns.ndjson.gz', 'taskruns.ndjson.zst'):
+                    fmt = 'csv' if '.csv' in name else 'ndjson'
+                    path = os.path.join(tmp, name)
+                    tracemalloc.start()
+                    try:
+                        result = client.export(1, 'taskrun', path, fmt,
+                                               page_size=500)
+                    except ImportError:
+                        print('%-22s not available' % name)
+                        continue
+                    finally:
+                        peak = tracemalloc.get_traced_memory()[1]
+                        tracemalloc.stop()
+                    print('%-22s %7d rows %9.0f rows/s %7.1f MB peak '
+                          '%7.1f MB file' % (
+                              name, result.rows, result.throughput,
+                              peak / 1e6, os.path.getsize(path) / 1e6))
+            finally:
+                client.close()
+                server.stop()
+    finally:
+        shutil.rmtree(tmp)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+# -*- coding: utf8 -*-
+"""Measure the memory and attribute access cost of the domain objects.
+
+Compares the compact TaskRun objects with the former dict per object
+representation, and times building lazy objects from JSON documents.
+
+Usage::
+
+    $ python benchmarks/bench_objects.py [objects]
+"""
+
+import gc
+import json
+import os
+import sys
+import timeit
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+import pbclient  # noqa: E402
+from stub_server import make_row  # noqa: E402
+
+
+class DictTaskRun(object):
+
+    """Former representation: one dict per object, in __dict__."""
+
+    def __init__(self, data):
+        self.__dict__['data'] = data
+
+    def __getattr__(self, name):
+        data = self.__dict__['data']
+        if name == 'data':
+            return data
+        if name in data:
+            return data[name]
+        raise AttributeError('unknown attribute: ' + name)
+
+
+def retained(build, body):
+    """Return the objects built from body and the bytes they retain."""
+    gc.collect()
+    tracemalloc.start()
+    objects = build(body)
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return objects, size
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    rows = [make_row('taskrun', i) for i in range(1, count + 1)]
+    body = json.dumps(rows)
+    docs = [json.dumps(row) for row in rows]
+    del rows
+    print('%d task runs, %d keys each' %
+          (count, len(make_row('taskrun', 1))))
+
+    builders = [
+        ('dict per object', lambda b: [DictTaskRun(r) for r in json.loads(b)]),
+        ('compact', lambda b: [pbclient.TaskRun(r) for r in json.loads(b)]),
+        ('lazy, unread', lambda b: [pbclient.TaskRun.from_json(d.encode())
+                                    for d in docs]),
+    ]
+    for label, build in builders:
+        objects, size = retained(build, body)
+        print('%-20s %8.1f MB  %6d bytes/object' %
+              (label, size / 1e6, size // count))
+        del objects
+
+    print('')
+    old = DictTaskRun(make_row('taskrun', 1))
+    new = pbclient.TaskRun(make_row('taskrun', 1))
+    for label, obj in (('dict per object', old), ('compact', new)):
+        n, total = timeit.Timer(lambda: obj.task_id).autorange()
+        print('%-20s %8.1f ns/attribute' % (label, total / n * 1e9))
+    n, total = timeit.Timer(
+        lambda: pbclient.TaskRun.from_json(docs[0]).task_id).autorange()
+    print('%-20s %8.1f us/object' % ('lazy, first read', total / n * 1e6))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,46 @@
+# -*- coding: utf8 -*-
+"""Measure how a parallel id-range export scales with the worker count.
+
+The stub server adds a fixed latency to every request to emulate the round
+trip to a remote PYBOSSA server.
+
+Usage::
+
+    $ python benchmarks/bench_parallel.py [rows] [latency_seconds]
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+import pbclient  # noqa: E402
+from stub_server import StubServer  # noqa: E402
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    latency = float(sys.argv[2]) if len(sys.argv) > 2 else 0.02
+    server = StubServer(rows=rows, latency=latency).start()
+    client = pbclient.PyBossaClient(server.endpoint, pool_maxsize=16)
+    try:
+        start = time.time()
+        n = sum(1 for _ in client.iter_taskruns(1, page_size=100))
+        base = time.time() - start
+        print('%-22s %7d rows %7.2fs' % ('sequential keyset', n, base))
+        for workers in (1, 2, 4, 8, 16):
+            start = time.time()
+            n = sum(1 for _ in client.iter_parallel('taskrun', 1,
+                                                    workers=workers,
+                                                    page_size=100))
+            elapsed = time.time() - start
+            print('%-22s %7d rows %7.2fs  x%.1f' % (
+                'parallel, %d workers' % workers, n, elapsed,
+                base / elapsed))
+    finally:
+        client.close()
+        server.stop()
+
+
+if __name__ == '__main__':
+    main()
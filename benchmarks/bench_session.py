@@ -0,0 +1,44 @@
+# -*- coding: utf8 -*-
+"""Compare per-call connections against the pooled keep-alive session.
+
+Usage::
+
+    $ python benchmarks/bench_session.py [n_requests]
+"""
+
+import os
+import sys
+import time
+
+import requests
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+import pbclient  # noqa: E402
+from stub_server import StubServer  # noqa: E402
+
+
+def run(label, n, get):
+    """Time n GET requests and print requests per second."""
+    start = time.time()
+    for i in range(n):
+        get(i % 100 + 1)
+    elapsed = time.time() - start
+    print('%-28s %8.1f req/s' % (label, n / elapsed))
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    server = StubServer(rows=100).start()
+    url = server.endpoint + '/api/project/'
+    pbclient.set('endpoint', server.endpoint)
+    try:
+        run('requests.get (no pooling)', n,
+            lambda i: requests.get(url + str(i), params={}).json())
+        run('pbclient pooled session', n, pbclient.get_project)
+    finally:
+        pbclient.close()
+        server.stop()
+
+
+if __name__ == '__main__':
+    main()
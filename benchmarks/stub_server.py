@@ -0,0 +1,166 @@
+# -*- coding: utf8 -*-
+"""Minimal local PYBOSSA API stub used by the benchmarks.
+
+It speaks HTTP/1.1 with keep-alive, serves a synthetic data set for every
+domain with keyset (``last_id``/``limit``) pagination, and answers POST, PUT
+and DELETE like the real server would. It accepts gzipped request bodies, can
+gzip its answers, and can emulate a network link of limited bandwidth.
+"""
+
+import gzip
+import json
+import threading
+import time
+try:
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+    from socketserver import ThreadingMixIn
+    from urllib.parse import urlparse, parse_qs
+except ImportError:  # pragma: no cover
+    from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+    from SocketServer import ThreadingMixIn
+    from urlparse import urlparse, parse_qs
+
+
+def make_row(domain, id):
+    """Return a synthetic object for the given domain and id."""
+    row = dict(id=id, project_id=1, created='2017-01-01T00:00:00',
+               info=dict(answer='yes' if id % 2 else 'no', score=id * 0.5,
+                         text='lorem ipsum dolor sit amet %d' % id))
+    if domain == 'taskrun':
+        row.update(task_id=id // 3 + 1, user_id=id % 50,
+                   finish_time='2017-01-01T00:00:10')
+    elif domain == 'result':
+        row.update(task_id=id, task_run_ids=[id * 3, id * 3 + 1],
+                   last_version=True)
+    elif domain == 'task':
+        row.update(state='completed', n_answers=3, quorum=0,
+                   priority_0=0.0, calibration=0)
+    return row
+
+
+class StubServer(ThreadingMixIn, HTTPServer):
+
+    """Threaded HTTP server holding the stub state."""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, rows=10000, latency=0.0, address=('127.0.0.1', 0),
+                 gzip=False, bandwidth=None):
+        HTTPServer.__init__(self, address, StubHandler)
+        self.rows = rows
+        self.latency = latency
+        self.gzip = gzip
+        self.bandwidth = bandwidth
+        self.hits = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self._lock = threading.Lock()
+        self._next_id = rows + 1
+
+    @property
+    def endpoint(self):
+        """Return the base URL of the server."""
+        return 'http://%s:%d' % self.server_address[:2]
+
+    def new_id(self):
+        """Return a fresh object id."""
+        with self._lock:
+            self._next_id += 1
+            return self._next_id
+
+    def transfer(self, size):
+        """Wait the time size bytes take on the emulated link."""
+        if self.bandwidth:
+            time.sleep(float(size) / self.bandwidth)
+
+    def count(self, sent, received):
+        """Record one request."""
+        with self._lock:
+            self.hits += 1
+            self.bytes_in += sent
+            self.bytes_out += received
+
+    def start(self):
+        """Serve on a daemon thread and return self."""
+        thread = threading.Thread(target=self.serve_forever)
+        thread.daemon = True
+        thread.start()
+        return self
+
+    def stop(self):
+        """Stop serving."""
+        self.shutdown()
+        self.server_close()
+
+
+class StubHandler(BaseHTTPRequestHandler):
+
+    """Request handler for :class:`StubServer`."""
+
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+    wbufsize = -1
+
+    def log_message(self, *args):
+        """Silence request logging."""
+
+    def _parse(self):
+        url = urlparse(self.path)
+        parts = [p for p in url.path.split('/') if p][1:]
+        params = dict((k, v[0]) for k, v in parse_qs(url.query).items())
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length) if length else b''
+        self.server.transfer(length)
+        self.received = length
+        if self.headers.get('Content-Encoding') == 'gzip':
+            body = gzip.decompress(body)
+        return parts, params, body
+
+    def _send(self, status, obj):
+        body = b'' if obj is None else json.dumps(obj).encode('utf-8')
+        encode = (self.server.gzip and body and
+                  'gzip' in self.headers.get('Accept-Encoding', ''))
+        if encode:
+            body = gzip.compress(body, 6)
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        self.server.transfer(len(body))
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        if encode:
+            self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        self.server.count(self.received, len(body))
+
+    def do_GET(self):
+        parts, params, body = self._parse()
+        domain = parts[0]
+        rows = self.server.rows
+        if len(parts) > 1:
+            return self._send(200, make_row(domain, int(parts[1])))
+        limit = int(params.get('limit', 20))
+        if params.get('desc') in ('true', 'True', '1'):
+            ids = range(rows, max(rows - limit, 0), -1)
+        else:
+            start = int(params.get('last_id', params.get('offset', 0))) + 1
+            ids = range(start, min(start + limit, rows + 1))
+        self._send(200, [make_row(domain, i) for i in ids])
+
+    def do_POST(self):
+        parts, params, body = self._parse()
+        obj = json.loads(body.decode('utf-8')) if body else {}
+        obj['id'] = self.server.new_id()
+        self._send(200, obj)
+
+    def do_PUT(self):
+        parts, params, body = self._parse()
+        obj = json.loads(body.decode('utf-8')) if body else {}
+        obj['id'] = int(parts[1])
+        self._send(200, obj)
+
+    def do_DELETE(self):
+        parts, params, body = self._parse()
+        self._send(204, None)
@@ -9,11 +9,35 @@ A simple PYBOSSA client
 """
 
 
+import contextlib
+import functools
+import os
+import re
 import requests
-import json
-
-
-_opts = dict()
+import sys
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from collections import deque, namedtuple
+import threading
+import time
+import weakref
+try:
+    import queue
+except ImportError:  # pragma: no cover
+    import Queue as queue
+
+from pbclient.retry import Retry, DEFAULT_RETRY
+from pbclient.ratelimit import RateLimiter, get_limiter
+from pbclient.timeouts import Deadline, DeadlineExceeded, _clock
+from pbclient.singleflight import SingleFlight, request_key
+from pbclient.codec import ACCEPT_ENCODING, compress, get_codec
+from pbclient.cache import ConditionalCache, TTLCache
+from pbclient.frames import build_frame
+from pbclient.exporter import ExportResult, export_pages
+from pbclient.multipart import MultipartEncoder
+from pbclient.hooks import (CACHE, COALESCED, NOT_MODIFIED, UNCHANGED,
+                            RequestHook, RequestInfo, TimedAdapter, Trace)
+from pbclient.metrics import Metrics
+from pbclient.uploads import HASH_KEY, PATH_KEY, SyncResult, hash_files
 
 
 OFFSET_WARNING = """
@@ -22,83 +46,174 @@ OFFSET_WARNING = """
     https://github.com/PYBOSSA/pybossa-client#on-queries-and-performance
     """
 
+#: Default settings for the pooled HTTP session. They can be changed with
+#: :meth:`PyBossaClient.set` and take effect the next time the session is
+#: created.
+SESSION_DEFAULTS = dict(pool_connections=10, pool_maxsize=10,
+                        pool_block=False, keep_alive=True)
 
-def set(key, val):
-    """Set key to value."""
-    global _opts
-    _opts[key] = val
+#: Initial value of the :attr:`PyBossaClient.stats` counters.
+STATS_DEFAULTS = dict(requests=0, retries=0, retry_wait=0.0, throttled=0,
+                      rate_limit_wait=0.0, coalesced=0)
 
+#: Maximum number of consecutive 429 answers waited out for one request.
+MAX_THROTTLED = 10
 
-def _pybossa_req(method, domain, id=None, payload=None, params={},
-                 headers={'content-type': 'application/json'},
-                 files=None):
-    """
-    Send a JSON request.
+#: Default (connect, read) timeout in seconds of every request. It can be
+#: changed with the ``timeout`` setting (``None`` waits forever).
+DEFAULT_TIMEOUT = (10, 60)
+
+#: Largest ``limit`` answered by the PYBOSSA API. Larger page sizes are
+#: lowered to it, as the server silently caps longer pages.
+MAX_PAGE_SIZE = 100
+
+
+#: Maximum number of key schemas shared between domain objects. Objects with
+#: other keys keep their fields in a plain dict.
+MAX_SCHEMAS = 1024
+
+_schemas = {}
+_set = object.__setattr__
+_FIELD_NAME = re.compile(r'[A-Za-z]\w*$')
 
-    Returns True if everything went well, otherwise it returns the status
-    code of the response.
+
+def _compact_class(cls, keys):
+    """Return the subclass of cls storing the fields keys in slots, or None.
+
+    Every object of a class with the same keys shares it, so the keys are
+    stored once per schema instead of once per object.
     """
-    url = _opts['endpoint'] + '/api/' + domain
-    if id is not None:
-        url += '/' + str(id)
-    if 'api_key' in _opts:
-        params['api_key'] = _opts['api_key']
-    if method == 'get':
-        r = requests.get(url, params=params)
-    elif method == 'post':
-        if files is None and headers['content-type'] == 'application/json':
-            r = requests.post(url, params=params, headers=headers,
-                              data=json.dumps(payload))
-        else:
-            r = requests.post(url, params=params, files=files, data=payload)
-    elif method == 'put':
-        r = requests.put(url, params=params, headers=headers,
-                         data=json.dumps(payload))
-    elif method == 'delete':
-        r = requests.delete(url, params=params, headers=headers,
-                            data=json.dumps(payload))
-    if r.status_code // 100 == 2:
-        if r.text and r.text != '""':
-            return json.loads(r.text)
-        else:
-            return True
-    else:
-        return json.loads(r.text)
+    compact = _schemas.get((cls, keys))
+    if compact is None and len(_schemas) < MAX_SCHEMAS:
+        for key in keys:
+            if (not isinstance(key, str) or not _FIELD_NAME.match(key) or
+                    hasattr(cls, key)):
+                return None
+        compact = type(cls.__name__, (cls,),
+                       dict(__slots__=keys, __module__=cls.__module__,
+                            _fields=keys))
+        compact = _schemas.setdefault((cls, keys), compact)
+    return compact
 
 
 class DomainObject(object):
 
-    """Main Domain object Class."""
+    """Main Domain object Class.
+
+    The fields are stored in the slots of a subclass shared by all the
+    objects with the same keys, which needs far less memory than a dict per
+    object and reads them at plain attribute speed. Reading ``data`` turns
+    the object into a dict backed one, so changes to the returned dict are
+    kept.
+    """
+
+    __slots__ = ('_values', '_raw')
+
+    _fields = None
+
+    def __new__(cls, data=None):
+        """Return an instance of the compact class for the keys of data."""
+        called = cls
+        if cls._fields is not None:
+            cls = cls.__base__
+        if type(data) is dict:
+            cls = _compact_class(cls, tuple(data)) or cls
+        obj = object.__new__(cls)
+        if not isinstance(obj, called):
+            # Python only calls __init__ on instances of the class called.
+            obj.__init__(data)
+        return obj
 
     def __init__(self, data):
         """Init method."""
-        self.__dict__['data'] = data
+        _set(self, '_raw', None)
+        if self._fields is None:
+            _set(self, '_values', data)
+            return
+        _set(self, '_values', None)
+        for key, value in zip(self._fields, data.values()):
+            _set(self, key, value)
+
+    @classmethod
+    def from_json(cls, raw):
+        """Return an object parsing the JSON raw only when first read.
+
+        :param raw: JSON document of the object
+        :type raw: bytes or string
+        """
+        obj = object.__new__(cls._fields and cls.__base__ or cls)
+        _set(obj, '_values', None)
+        _set(obj, '_raw', raw)
+        return obj
+
+    def _parse(self):
+        raw = self._raw
+        _set(self, '_raw', None)
+        _set(self, '_values', get_codec().loads(raw))
+
+    def _as_dict(self):
+        if self._raw is not None:
+            self._parse()
+        if self._values is None:
+            return dict((key, getattr(self, key)) for key in self._fields)
+        return self._values
+
+    def _detach(self):
+        """Move the fields from the slots to a dict and return it."""
+        data = self._as_dict()
+        if self._fields is not None and self._values is None:
+            for key in self._fields:
+                object.__delattr__(self, key)
+            _set(self, '_values', data)
+        return data
+
+    @property
+    def data(self):
+        """Return the fields of the object as a dict."""
+        return self._detach()
 
     def __getattr__(self, name):
         """Get attribute."""
-        data = self.__dict__['data']
-        if name == 'data':
-            return data
-        if name in data:
-            return data[name]
+        if self._raw is not None:
+            self._parse()
+        values = self._values
+        if values is not None and name in values:
+            return values[name]
         raise AttributeError('unknown attribute: ' + name)
 
     def __setattr__(self, name, value):
         """Set attribute."""
-        data = self.__dict__['data']
         if name == 'data':
-            self.__dict__['data'] = value
+            self._detach()
+            _set(self, '_raw', None)
+            _set(self, '_values', value)
             return True
-        if name in data:
-            data[name] = value
+        if self._raw is not None:
+            self._parse()
+        values = self._values
+        if values is None:
+            if name in self._fields:
+                _set(self, name, value)
+                return True
+        elif name in values:
+            values[name] = value
             return True
         raise AttributeError('unknown attribute: ' + name)
 
+    def __reduce__(self):
+        """Pickle the object as its class and data."""
+        cls = type(self)
+        if cls._fields is not None:
+            cls = cls.__base__
+        return (cls, (self._as_dict(),))
+
 
 class Project(DomainObject):
 
     """Project class."""
 
+    __slots__ = ()
+
     reserved_keys = dict(id=None, created=None, updated=None,
                          completed=None, contacted=None, published=None,
                          secret_key=None)
@@ -113,6 +228,8 @@ class Category(DomainObject):
 
     """Category class."""
 
+    __slots__ = ()
+
     def __repr__(self):  # pragma: no cover
         """Return a representation."""
         tmp = ('pybossa.Category("' + self.short_name + '", '
@@ -124,6 +241,8 @@ class Task(DomainObject):
 
     """Task Class."""
 
+    __slots__ = ()
+
     reserved_keys = dict(id=None, created=None, state=None,
                          fav_user_ids=None)
 
@@ -136,6 +255,8 @@ class TaskRun(DomainObject):
 
     """Class TaskRun."""
 
+    __slots__ = ()
+
     reserved_keys = dict(id=None, created=None, finish_time=None)
 
     def __repr__(self):  # pragma: no cover
@@ -147,6 +268,8 @@ class Result(DomainObject):
 
     """Class Result."""
 
+    __slots__ = ()
+
     reserved_keys = dict(id=None, created=None, project_id=None,
                          task_id=None, task_run_ids=None, last_version=None)
 
@@ -159,648 +282,2225 @@ class HelpingMaterial(DomainObject):
 
     """Class HelpingMaterial."""
 
+    __slots__ = ()
+
     reserved_keys = dict(id=None, created=None)
 
     def __repr__(self):  # pragma: no cover
         """Return representation."""
         return 'pybossa.HelpingMaterial(' + str(self.id) + ')'
 
-
-# Projects
-def get_projects(limit=100, offset=0, last_id=None):
-    """Return a list of registered projects.
-
-    :param limit: Number of returned items, default 100
-    :type limit: integer
-    :param offset: Offset for the query, default 0
-    :type offset: integer
-    :param last_id: id of the last project, used for pagination. If provided, offset is ignored
-    :type last_id: integer
-    :rtype: list
-    :returns: A list of PYBOSSA Projects
-
-    """
-    if last_id is not None:
-        params = dict(limit=limit, last_id=last_id)
-    else:
-        print(OFFSET_WARNING)
-        params = dict(limit=limit, offset=offset)
-    try:
-        res = _pybossa_req('get', 'project',
-                           params=params)
-        if type(res).__name__ == 'list':
-            return [Project(project) for project in res]
-        else:
-            raise TypeError
-    except:  # pragma: no cover
-        raise
-
-
-def get_project(project_id):
-    """Return a PYBOSSA Project for the project_id.
-
-    :param project_id: PYBOSSA Project ID
-    :type project_id: integer
-    :rtype: PYBOSSA Project
-    :returns: A PYBOSSA Project object
-
-    """
-    try:
-        res = _pybossa_req('get', 'project', project_id)
-        if res.get('id'):
-            return Project(res)
-        else:
-            return res
-    except:  # pragma: no cover
-        raise
+#: Domain object class for every API domain.
+DOMAINS = dict(project=Project, category=Category, task=Task,
+               taskrun=TaskRun, result=Result,
+               helpingmaterial=HelpingMaterial)
 
 
-def find_project(**kwargs):
-    """Return a list with matching project arguments.
+def _rewind(files):
+    """Seek the files of a multipart request back to the start."""
+    if isinstance(files, MultipartEncoder):
+        files.rewind()
+        return
+    for f in (files or {}).values():
+        if hasattr(f, 'seek'):
+            f.seek(0)
 
-    :param kwargs: PYBOSSA Project members
-    :rtype: list
-    :returns: A list of projects that match the kwargs
 
-    """
-    try:
-        res = _pybossa_req('get', 'project', params=kwargs)
-        if type(res).__name__ == 'list':
-            return [Project(project) for project in res]
-        else:
-            return res
-    except:  # pragma: no cover
-        raise
+def _forbidden_attributes(obj):
+    """Return the object without the forbidden attributes."""
+    for key in list(obj.data.keys()):
+        if key in list(obj.reserved_keys.keys()):
+            obj.data.pop(key)
+    return obj
 
 
-def create_project(name, short_name, description):
-    """Create a project.
+class PyBossaError(Exception):
 
-    :param name: PYBOSSA Project Name
-    :type name: string
-    :param short_name: PYBOSSA Project short name or slug
-    :type short_name: string
-    :param description: PYBOSSA Project description
-    :type decription: string
-    :returns: True -- the response status code
+    """Error answered by the PYBOSSA server.
 
+    Raised by the operations that cannot return the error dict, such as the
+    ``iter_*`` generators. The server answer is available as ``error``.
     """
-    try:
-        project = dict(name=name, short_name=short_name,
-                       description=description)
-        res = _pybossa_req('post', 'project', payload=project)
-        if res.get('id'):
-            return Project(res)
-        else:
-            return res
-    except:  # pragma: no cover
-        raise
-
 
-def update_project(project):
-    """Update a project instance.
-
-    :param project: PYBOSSA project
-    :type project: PYBOSSA Project
-    :returns: True -- the response status code
-
-    """
-    try:
-        project_id = project.id
-        project = _forbidden_attributes(project)
-        res = _pybossa_req('put', 'project', project_id, payload=project.data)
-        if res.get('id'):
-            return Project(res)
-        else:
-            return res
-    except:  # pragma: no cover
-        raise
+    def __init__(self, error):
+        """Init method."""
+        Exception.__init__(self, error)
+        self.error = error
 
 
-def delete_project(project_id):
-    """Delete a Project with id = project_id.
+class Outcome(namedtuple('Outcome', ['index', 'item', 'result', 'error'])):
 
-    :param project_id: PYBOSSA Project ID
-    :type project_id: integer
-    :returns: True -- the response status code
+    """Outcome of one item of a bulk operation.
 
+    ``result`` is what the single-object function returned, and ``error``
+    is either the error answered by the server or the exception raised.
     """
-    try:
-        res = _pybossa_req('delete', 'project', project_id)
-        if type(res).__name__ == 'bool':
-            return True
-        else:
-            return res
-    except:  # pragma: no cover
-        raise
-
 
-# Category
+    __slots__ = ()
 
-def get_categories(limit=20, offset=0, last_id=None):
-    """Return a list of registered categories.
+    @property
+    def ok(self):
+        """Return True if the item succeeded."""
+        return self.error is None
 
-    :param limit: Number of returned items, default 20
-    :type limit: integer
-    :param offset: Offset for the query, default 0
-    :type offset: integer
-    :param last_id: id of the last category, used for pagination. If provided, offset is ignored
-    :type last_id: integer
-    :rtype: list
-    :returns: A list of PYBOSSA Categories
 
-    """
-    if last_id is not None:
-        params = dict(limit=limit, last_id=last_id)
-    else:
-        params = dict(limit=limit, offset=offset)
-        print(OFFSET_WARNING)
+def _outcome(index, item, func):
+    """Call func(item) and return its Outcome."""
     try:
-        res = _pybossa_req('get', 'category',
-                           params=params)
-        if type(res).__name__ == 'list':
-            return [Category(category) for category in res]
-        else:
-            raise TypeError
-    except:
-        raise
-
-
-def get_category(category_id):
-    """Return a PYBOSSA Category for the category_id.
-
-    :param category_id: PYBOSSA Category ID
-    :type category_id: integer
-    :rtype: PYBOSSA Category
-    :returns: A PYBOSSA Category object
-
+        res = func(item)
+    except Exception as e:
+        return Outcome(index, item, None, e)
+    if isinstance(res, DomainObject) or res is True:
+        return Outcome(index, item, res, None)
+    return Outcome(index, item, None, res)
+
+
+def _bulk(func, items, concurrency=8, deadline=None):
+    """Yield the Outcome of func(item) for every item, in input order.
+
+    Up to ``concurrency`` calls run at the same time. The items are read
+    lazily, and no more than twice that number are pending at any time, so
+    the input is never fully materialized. Once the ``deadline`` is spent no
+    more items are read, and DeadlineExceeded is raised after the outcomes
+    of the pending ones.
     """
+    pending = deque()
+    executor = ThreadPoolExecutor(max_workers=concurrency)
     try:
-        res = _pybossa_req('get', 'category', category_id)
-        if res.get('id'):
-            return Category(res)
-        else:
-            return res
-    except:  # pragma: no cover
-        raise
-
-
-def find_category(**kwargs):
-    """Return a list with matching Category arguments.
-
-    :param kwargs: PYBOSSA Category members
-    :rtype: list
-    :returns: A list of project that match the kwargs
-
+        for index, item in enumerate(items):
+            if deadline is not None and not deadline.remaining():
+                break
+            pending.append(executor.submit(_outcome, index, item, func))
+            while len(pending) >= concurrency * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+        if deadline is not None:
+            deadline.check()
+    finally:
+        for future in pending:
+            future.cancel()
+        executor.shutdown(wait=True)
+
+
+def _drive(iterable, depth):
+    """Consume an iterable on a new thread right away, up to depth items ahead.
+
+    Return an iterator of its items. The thread waits while depth items are
+    not read yet, unless nobody can read them anymore: once the iterator is
+    garbage collected, the iterable is consumed to the end without waiting.
     """
-    try:
-        res = _pybossa_req('get', 'category', params=kwargs)
-        if type(res).__name__ == 'list':
-            return [Category(category) for category in res]
-        else:
-            return res
-    except:  # pragma: no cover
-        raise
-
-
-def create_category(name, description):
-    """Create a Category.
-
-    :param name: PYBOSSA Category Name
-    :type name: string
-    :param description: PYBOSSA Category description
-    :type decription: string
-    :returns: True -- the response status code
+    items = queue.Queue(maxsize=depth)
+    abandoned = threading.Event()
+    done = object()
+
+    def put(item):
+        while not abandoned.is_set():
+            try:
+                items.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                pass
+
+    def drain():
+        while True:
+            item, exc_info = items.get()
+            if item is done:
+                if exc_info is not None:
+                    raise exc_info[1]
+                return
+            yield item
+
+    def drive(ref):
+        # ref keeps the weak reference to the iterator, and its callback,
+        # alive while the thread runs.
+        try:
+            for item in iterable:
+                put((item, None))
+            put((done, None))
+        except BaseException:
+            put((done, sys.exc_info()))
+
+    outcomes = drain()
+    ref = weakref.ref(outcomes, lambda _: abandoned.set())
+    thread = threading.Thread(target=drive, args=(ref,))
+    thread.daemon = True
+    thread.start()
+    return outcomes
+
+
+class BulkResult(object):
+
+    """Outcomes of a bulk operation.
+
+    The operation runs on a background thread from the moment it is
+    started, whether or not the outcomes are read. Iterate over it to get
+    the :class:`Outcome` of every item, in input order, as soon as it is
+    ready; the operation waits while ``concurrency`` outcomes are not read,
+    unless the result is dropped. The counters are updated as the outcomes
+    are consumed; call :meth:`wait` to wait for the whole operation, as the
+    program does not wait for it on exit.
     """
-    try:
-        category = dict(name=name, short_name=name.lower().replace(" ", ""),
-                        description=description)
-        res = _pybossa_req('post', 'category', payload=category)
-        if res.get('id'):
-            return Category(res)
-        else:
-            return res
-    except:  # pragma: no cover
-        raise
-
-
-def update_category(category):
-    """Update a Category instance.
 
-    :param category: PYBOSSA Category
-    :type category: PYBOSSA Category
-    :returns: True -- the response status code
-
-    """
-    try:
-        res = _pybossa_req('put', 'category',
-                           category.id, payload=category.data)
-        if res.get('id'):
-            return Category(res)
+    def __init__(self, outcomes):
+        """Init method."""
+        self._outcomes = outcomes
+        self._started = time.time()
+        self.elapsed = 0.0
+        self.succeeded = 0
+        self.failures = []
+
+    def __iter__(self):
+        """Return the iterator of outcomes."""
+        return self
+
+    def __next__(self):
+        """Return the next outcome."""
+        try:
+            outcome = next(self._outcomes)
+        finally:
+            self.elapsed = time.time() - self._started
+        if outcome.ok:
+            self.succeeded += 1
         else:
-            return res
-    except:  # pragma: no cover
-        raise
+            self.failures.append(outcome)
+        return outcome
+
+    next = __next__
+
+    def wait(self):
+        """Wait for the end of the operation, consuming all the outcomes,
+        and return self."""
+        for _ in self:
+            pass
+        return self
+
+    @property
+    def failed(self):
+        """Return the number of failed items."""
+        return len(self.failures)
+
+    @property
+    def total(self):
+        """Return the number of items processed."""
+        return self.succeeded + self.failed
+
+    @property
+    def throughput(self):
+        """Return the processed items per second."""
+        if not self.elapsed:
+            return 0.0
+        return self.total / self.elapsed
 
+    def __repr__(self):  # pragma: no cover
+        """Return representation."""
+        return ('pybossa.BulkResult(total=%d, failed=%d, %.1f items/s)'
+                % (self.total, self.failed, self.throughput))
 
-def delete_category(category_id):
-    """Delete a Category with id = category_id.
 
-    :param category_id: PYBOSSA Category ID
-    :type category_id: integer
-    :returns: True -- the response status code
+def _prefetch(iterable, depth=1, bind=None):
+    """Consume an iterable on a background thread, up to depth items ahead.
 
+    While the caller processes an item, the next ones are already being
+    fetched. The read-ahead is bounded by ``depth`` and the background thread
+    is stopped as soon as the caller stops iterating. ``bind`` wraps the
+    function run by the background thread, such as
+    :meth:`PyBossaClient._bind`.
     """
+    items = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+    done = object()
+
+    def put(item):
+        while not stop.is_set():
+            try:
+                items.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def produce():
+        iterator = iter(iterable)
+        try:
+            for item in iterator:
+                if not put((item, None)) or stop.is_set():
+                    break
+            else:
+                put((done, None))
+        except BaseException:
+            put((done, sys.exc_info()))
+        finally:
+            close = getattr(iterator, 'close', None)
+            if close is not None:
+                close()
+
+    if bind is not None:
+        produce = bind(produce)
+    thread = threading.Thread(target=produce)
+    thread.daemon = True
+    thread.start()
     try:
-        res = _pybossa_req('delete', 'category', category_id)
-        if type(res).__name__ == 'bool':
-            return True
-        else:
-            return res
-    except:  # pragma: no cover
-        raise
-
-
-# Tasks
-
-def get_tasks(project_id, limit=100, offset=0, last_id=None):
-    """Return a list of tasks for a given project ID.
-
-    :param project_id: PYBOSSA Project ID
-    :type project_id: integer
-    :param limit: Number of returned items, default 100
-    :type limit: integer
-    :param offset: Offset for the query, default 0
-    :param last_id: id of the last task, used for pagination. If provided, offset is ignored
-    :type last_id: integer
-    :type offset: integer
-    :returns: True -- the response status code
+        while True:
+            item, exc_info = items.get()
+            if item is done:
+                if exc_info is not None:
+                    raise exc_info[1]
+                return
+            yield item
+    finally:
+        stop.set()
+        # A request in flight is not waited for: the daemon thread drops
+        # its answer and closes the iterable once it is done.
+        thread.join(0.5)
+
+
+class PyBossaClient(object):
+
+    """PYBOSSA API client.
+
+    Each client owns its endpoint, credentials, settings and pooled HTTP
+    session, so a process can talk to several PYBOSSA servers at once. A
+    client can be shared by many threads: requests never modify shared
+    state and the connection pool is thread-safe.
+
+    :param endpoint: PYBOSSA server URL, e.g. ``https://pybossa.com``
+    :type endpoint: string
+    :param api_key: PYBOSSA API key
+    :type api_key: string
+    :param settings: any other setting accepted by :meth:`set`
 
     """
-    if last_id is not None:
-        params = dict(limit=limit, last_id=last_id)
-    else:
-        params = dict(limit=limit, offset=offset)
-        print(OFFSET_WARNING)
-    params['project_id'] = project_id
-    try:
-        res = _pybossa_req('get', 'task',
-                           params=params)
-        if type(res).__name__ == 'list':
-            return [Task(task) for task in res]
-        else:
-            return res
-    except:  # pragma: no cover
-        raise
 
-
-def find_tasks(project_id, **kwargs):
-    """Return a list of matched tasks for a given project ID.
-
-    :param project_id: PYBOSSA Project ID
-    :type project_id: integer
-    :param kwargs: PYBOSSA Task members
-    :type info: dict
-    :rtype: list
-    :returns: A list of tasks that match the kwargs
-
-    """
-    try:
-        kwargs['project_id'] = project_id
-        res = _pybossa_req('get', 'task', params=kwargs)
-        if type(res).__name__ == 'list':
-            return [Task(task) for task in res]
-        else:
-            return res
-    except:  # pragma: no cover
-        raise
-
-
-def create_task(project_id, info, n_answers=30, priority_0=0, quorum=0):
-    """Create a task for a given project ID.
-
-    :param project_id: PYBOSSA Project ID
-    :type project_id: integer
-    :param info: PYBOSSA Project info JSON field
-    :type info: dict
-    :param n_answers: Number of answers or TaskRuns per task, default 30
-    :type n_answers: integer
-    :param priority_0: Value between 0 and 1 indicating priority of task within
-        Project (higher = more important), default 0.0
-    :type priority_0: float
-    :param quorum: Number of times this task should be done by different users,
-        default 0
-    :type quorum: integer
-    :returns: True -- the response status code
-    """
-    try:
-        task = dict(
-            project_id=project_id,
-            info=info,
-            calibration=0,
-            priority_0=priority_0,
-            n_answers=n_answers,
-            quorum=quorum
-        )
-        res = _pybossa_req('post', 'task', payload=task)
-        if res.get('id'):
-            return Task(res)
-        else:
+    def __init__(self, endpoint=None, api_key=None, **settings):
+        """Init method."""
+        self.opts = dict(settings)
+        if endpoint is not None:
+            self.opts['endpoint'] = endpoint
+        if api_key is not None:
+            self.opts['api_key'] = api_key
+        self._session = None
+        self._session_lock = threading.Lock()
+        self._local = threading.local()
+        self._flight = SingleFlight()
+        #: Counters of the requests sent: ``requests`` attempts in total,
+        #: ``retries`` among them, ``retry_wait`` seconds spent waiting
+        #: before retrying, ``throttled`` 429 answers waited out,
+        #: ``rate_limit_wait`` seconds spent pacing under the rate limit and
+        #: ``coalesced`` GETs answered by an identical one in flight.
+        self.stats = dict(STATS_DEFAULTS)
+        self._stats_lock = threading.Lock()
+        self._hooks = ()
+
+    def __enter__(self):
+        """Enter a context that closes the client on exit."""
+        return self
+
+    def __exit__(self, *exc_info):
+        """Close the client."""
+        self.close()
+
+    def set(self, key, val):
+        """Set key to value."""
+        self.opts[key] = val
+        if key in SESSION_DEFAULTS:
+            self.close()
+        elif key == 'accept_encoding':
+            session = self._session
+            if session is not None:
+                session.headers['Accept-Encoding'] = self._accept_encoding()
+
+    def _setting(self, key):
+        """Return the configured value for a session setting."""
+        return self.opts.get(key, SESSION_DEFAULTS[key])
+
+    def _accept_encoding(self):
+        """Return the Accept-Encoding header of the ``accept_encoding``
+        setting."""
+        return self.opts.get('accept_encoding', ACCEPT_ENCODING) or 'identity'
+
+    def _get_session(self):
+        """Return the client HTTP session, creating it on first use.
+
+        All requests go through the same :class:`requests.Session` so TCP
+        (and TLS) connections are kept alive and reused between API calls.
+        """
+        session = self._session
+        if session is not None:
+            return session
+        with self._session_lock:
+            if self._session is None:
+                session = requests.Session()
+                adapter = TimedAdapter(
+                    pool_connections=self._setting('pool_connections'),
+                    pool_maxsize=self._setting('pool_maxsize'),
+                    pool_block=self._setting('pool_block'))
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                if not self._setting('keep_alive'):
+                    session.headers['Connection'] = 'close'
+                session.headers['Accept-Encoding'] = self._accept_encoding()
+                self._session = session
+            return self._session
+
+    def close(self):
+        """Close the HTTP session and release its pooled connections."""
+        with self._session_lock:
+            session, self._session = self._session, None
+        if session is not None:
+            session.close()
+
+    def _req(self, method, domain, id=None, payload=None, params=None,
+             headers=None, files=None, deadline=None):
+        """
+        Send a JSON request.
+
+        Returns True if everything went well, otherwise it returns the status
+        code of the response.
+
+        Failed attempts are retried following the ``retry`` setting, a
+        :class:`pbclient.retry.Retry` policy (``None`` disables retries).
+        Unless the ``rate_limit`` setting is False, requests are paced under
+        the server rate limit and 429 answers are waited out. Every attempt
+        uses the ``timeout`` setting, and the attempts, retries and waits
+        all fit in the ``deadline``, if any.
+
+        With the ``coalesce`` setting, a GET sent while an identical one is
+        in flight waits for it and shares its answer. The shared GET uses
+        the ``timeout`` setting without the overrides of any caller, and
+        each caller only waits for it within its own deadline.
+        """
+        if method == 'get' and self.opts.get('coalesce'):
+            deadline = deadline or getattr(self._local, 'deadline', None)
+            background = (deadline is not None or
+                          vars(self._local).get('timeout') is not None)
+            res, shared = self._flight.do(
+                request_key(domain, id, params),
+                lambda: self._request(method, domain, id, payload, params,
+                                      headers, files),
+                deadline, background)
+            if shared:
+                self._count('coalesced')
+                if self._hooks:
+                    Trace(self._hooks, method, domain, id).served(COALESCED)
             return res
-    except:  # pragma: no cover
-        raise
-
-
-def update_task(task):
-    """Update a task for a given task ID.
-
-    :param task: PYBOSSA task
-
-    """
-    try:
-        task_id = task.id
-        task = _forbidden_attributes(task)
-        res = _pybossa_req('put', 'task', task_id, payload=task.data)
-        if res.get('id'):
-            return Task(res)
-        else:
+        return self._request(method, domain, id, payload, params, headers,
+                             files, deadline)
+
+    def _request(self, method, domain, id=None, payload=None, params=None,
+                 headers=None, files=None, deadline=None):
+        """Send a JSON request, without coalescing it."""
+        url = self.opts['endpoint'] + '/api/' + domain
+        if id is not None:
+            url += '/' + str(id)
+        params = dict(params or {})
+        if 'api_key' in self.opts:
+            params['api_key'] = self.opts['api_key']
+        if headers is None:
+            headers = {'content-type': 'application/json'}
+        cache = self.opts.get('cache')
+        if cache is not None and id is not None and method != 'get':
+            cache.invalidate((domain, id))
+        conditional = entry = None
+        if method == 'get':
+            conditional = self.opts.get('conditional')
+        if conditional is not None:
+            key = conditional.key(url, params)
+            entry = conditional.get(key)
+        retry = self.opts.get('retry', DEFAULT_RETRY)
+        limiter = self._rate_limiter()
+        deadline = deadline or getattr(self._local, 'deadline', None)
+        timeout = self._timeout()
+        trace = None
+        if self._hooks:
+            trace = Trace(self._hooks, method, domain, id)
+        attempt = throttled = 0
+        try:
+            while True:
+                if limiter is not None:
+                    self._wait(limiter.reserve(), 'rate_limit_wait',
+                               deadline)
+                if deadline is not None:
+                    deadline.check()
+                    timeout = deadline.cap(timeout)
+                attempt += 1
+                self._count('requests')
+                if trace is not None:
+                    trace.start(attempt)
+                try:
+                    r = self._send(method, url, params, headers, payload,
+                                   files, timeout,
+                                   conditional.headers(entry)
+                                   if conditional is not None else None)
+                except Exception as e:
+                    if trace is not None:
+                        trace.fail(e)
+                    if retry is None or not retry.should_retry(
+                            method, attempt, exception=e):
+                        raise
+                else:
+                    if trace is not None:
+                        trace.response(r)
+                    if limiter is not None:
+                        limiter.update(r.status_code, r.headers)
+                        if r.status_code == 429 and \
+                                throttled < MAX_THROTTLED:
+                            throttled += 1
+                            attempt -= 1
+                            self._count('throttled')
+                            if trace is not None:
+                                trace.finish()
+                            _rewind(files)
+                            continue
+                    if retry is None or not retry.should_retry(
+                            method, attempt, status=r.status_code):
+                        break
+                    if trace is not None:
+                        trace.finish()
+                self._count('retries')
+                self._wait(retry.backoff(attempt), 'retry_wait', deadline)
+                _rewind(files)
+            if cache is not None and id is not None and method != 'get':
+                cache.invalidate((domain, id))
+            if trace is not None:
+                started = _clock()
+            if conditional is not None:
+                res = conditional.answer(key, entry, r.status_code, r.headers,
+                                         r.content, self._decode)
+            else:
+                res = self._decode(r.status_code, r.content)
+            if trace is not None:
+                cached = None
+                if entry is not None and r.status_code == 304:
+                    cached = NOT_MODIFIED
+                elif entry is not None and res is entry[3]:
+                    cached = UNCHANGED
+                trace.finish(_clock() - started, cached)
             return res
-    except:  # pragma: no cover
-        raise
-
-
-def delete_task(task_id):
-    """Delete a task for a given task ID.
-
-    :param task: PYBOSSA task
-
-    """
-    #: :arg task: A task
-    try:
-        res = _pybossa_req('delete', 'task', task_id)
-        if type(res).__name__ == 'bool':
-            return True
-        else:
+        finally:
+            if trace is not None:
+                trace.finish()
+
+    def _get(self, domain, cls, id):
+        """Return the object of a domain with this id, or the error.
+
+        With the ``cache`` setting, a :class:`pbclient.cache.TTLCache`, the
+        answers are cached until they expire or the object is changed.
+        """
+        cache = self.opts.get('cache')
+        if cache is None:
+            res = self._req('get', domain, id)
+            return cls(res) if res.get('id') else res
+        key = (domain, id)
+        body = cache.get(key)
+        if body is not None:
+            if self._hooks:
+                Trace(self._hooks, 'get', domain, id).served(CACHE)
+            return cls.from_json(body)
+        generation = cache.generation()
+        res = self._req('get', domain, id)
+        if not res.get('id'):
             return res
-    except:  # pragma: no cover
-        raise
-
-
-# Task Runs
-
-def get_taskruns(project_id, limit=100, offset=0, last_id=None):
-    """Return a list of task runs for a given project ID.
-
-    :param project_id: PYBOSSA Project ID
-    :type project_id: integer
-    :param limit: Number of returned items, default 100
-    :type limit: integer
-    :param offset: Offset for the query, default 0
-    :type offset: integer
-    :param last_id: id of the last taskrun, used for pagination. If provided, offset is ignored
-    :type last_id: integer
-    :rtype: list
-    :returns: A list of task runs for the given project ID
-
-    """
-    if last_id is not None:
-        params = dict(limit=limit, last_id=last_id)
-    else:
-        params = dict(limit=limit, offset=offset)
-        print(OFFSET_WARNING)
-    params['project_id'] = project_id
-    try:
-        res = _pybossa_req('get', 'taskrun',
-                           params=params)
-        if type(res).__name__ == 'list':
-            return [TaskRun(taskrun) for taskrun in res]
+        cache.set(key, self._codec().dumps(res), generation)
+        return cls(res)
+
+    def _codec(self):
+        """Return the JSON codec set in the ``codec`` setting.
+
+        It can be a codec name (``orjson``, ``ujson`` or ``json``) or a codec
+        object; by default the fastest codec installed is used.
+        """
+        codec = self.opts.get('codec')
+        if codec is None or isinstance(codec, str):
+            return get_codec(codec)
+        return codec
+
+    def _decode(self, status_code, body):
+        """Return the decoded answer of a request from its raw body."""
+        if status_code // 100 == 2:
+            if body and body != b'""':
+                return self._codec().loads(body)
+            else:
+                return True
         else:
-            raise TypeError
-    except:
-        raise
-
-
-def find_taskruns(project_id, **kwargs):
-    """Return a list of matched task runs for a given project ID.
-
-    :param project_id: PYBOSSA Project ID
-    :type project_id: integer
-    :param kwargs: PYBOSSA Task Run members
-    :rtype: list
-    :returns: A List of task runs that match the query members
-
-    """
-    try:
+            return self._codec().loads(body)
+
+    def _send(self, method, url, params, headers, payload, files,
+              timeout=None, conditional=None):
+        """Send one HTTP request and return the response.
+
+        ``conditional`` are the revalidation headers of a GET, if any. JSON
+        bodies are gzipped following the ``compress`` setting.
+        """
+        session = self._get_session()
+        if method == 'get':
+            if conditional:
+                return session.get(url, params=params, headers=conditional,
+                                   timeout=timeout)
+            return session.get(url, params=params, timeout=timeout)
+        if isinstance(files, MultipartEncoder):
+            return session.post(url, params=params, data=files,
+                                headers={'Content-Type': files.content_type},
+                                timeout=timeout)
+        json_body = headers.get('content-type') == 'application/json'
+        if method == 'post' and (files is not None or not json_body):
+            return session.post(url, params=params, files=files,
+                                data=payload, timeout=timeout)
+        data, headers = compress(self._codec().dumps(payload), headers,
+                                 self.opts.get('compress'))
+        if method == 'post':
+            r = session.post(url, params=params, headers=headers, data=data,
+                             timeout=timeout)
+        elif method == 'put':
+            r = session.put(url, params=params, headers=headers, data=data,
+                            timeout=timeout)
+        elif method == 'delete':
+            r = session.delete(url, params=params, headers=headers,
+                               data=data, timeout=timeout)
+        return r
+
+    def _rate_limiter(self):
+        """Return the RateLimiter of the client API key, or None."""
+        if not self.opts.get('rate_limit', True):
+            return None
+        return get_limiter(self.opts['endpoint'], self.opts.get('api_key'))
+
+    def _wait(self, delay, key, deadline=None):
+        """Sleep delay seconds, adding them to the stats counter key.
+
+        Raises DeadlineExceeded right away if the wait would not leave any
+        time for the request within the deadline.
+        """
+        if deadline is not None and not deadline.allows(delay):
+            raise DeadlineExceeded('deadline of %ss exceeded'
+                                   % deadline.seconds)
+        if delay > 0:
+            self._count(key, delay)
+            time.sleep(delay)
+
+    def _timeout(self):
+        """Return the (connect, read) timeout of the next request."""
+        timeout = vars(self._local).get('timeout')
+        if timeout is None:
+            timeout = self.opts.get('timeout', DEFAULT_TIMEOUT)
+        return timeout
+
+    @contextlib.contextmanager
+    def _override(self, key, value):
+        """Set a thread local override of the requests in the block."""
+        local = vars(self._local)
+        previous = local.get(key)
+        local[key] = value
+        try:
+            yield value
+        finally:
+            local[key] = previous
+
+    def _bind(self, func):
+        """Return func running with the timeout and deadline of this thread.
+
+        The worker threads of the client call the functions bound when an
+        operation starts, so the overrides of :meth:`timeout` and
+        :meth:`deadline` also apply to the requests they send.
+        """
+        local = vars(self._local)
+        timeout = local.get('timeout')
+        deadline = local.get('deadline')
+        if timeout is None and deadline is None:
+            return func
+
+        def bound(*args, **kwargs):
+            with self._override('timeout', timeout):
+                with self._override('deadline', deadline):
+                    return func(*args, **kwargs)
+        return bound
+
+    def timeout(self, timeout):
+        """Use another timeout for the requests sent in the block.
+
+        The override applies to the current thread, and to the worker
+        threads of the operations started in the block::
+
+            with client.timeout((3, 10)):
+                client.get_project(1)
+
+        :param timeout: Seconds to wait for the server, either a number or
+            a (connect, read) tuple
+        """
+        return self._override('timeout', timeout)
+
+    def deadline(self, seconds):
+        """Send all the requests of the block within a time budget.
+
+        Retries and rate limit waits count against the budget, and
+        DeadlineExceeded is raised once it is spent. The budget applies to
+        the current thread, and to the worker threads of the operations
+        started in the block::
+
+            with client.deadline(30):
+                project = client.get_project(1)
+                tasks = client.find_tasks(project.id)
+
+        :param seconds: Time budget in seconds, or a :class:`Deadline`
+        """
+        return self._override('deadline', Deadline.coerce(seconds))
+
+    def _run_bulk(self, func, items, concurrency, deadline):
+        """Return the BulkResult of func over items within a deadline.
+
+        The items are processed on a background thread from now on.
+        """
+        func = self._bind(func)
+        deadline = Deadline.coerce(deadline) or getattr(self._local,
+                                                        'deadline', None)
+        if deadline is not None:
+            bounded = func
+
+            def func(item):
+                with self.deadline(deadline):
+                    return bounded(item)
+        return BulkResult(_drive(_bulk(func, items, concurrency, deadline),
+                                 concurrency))
+
+    def _count(self, key, value=1):
+        """Add value to the stats counter key."""
+        with self._stats_lock:
+            self.stats[key] += value
+
+    def reset_stats(self):
+        """Reset the stats counters to zero."""
+        with self._stats_lock:
+            self.stats.update(STATS_DEFAULTS)
+
+    def add_hook(self, hook):
+        """Call hook around every request sent by this client.
+
+        :param hook: Hook whose ``before_request`` and ``after_request``
+            methods get the :class:`pbclient.hooks.RequestInfo` of every
+            attempt
+        :type hook: pbclient.hooks.RequestHook
+        :returns: The hook, so it can be used as a decorator of a class
+        """
+        with self._stats_lock:
+            self._hooks = self._hooks + (hook,)
+        return hook
+
+    def remove_hook(self, hook):
+        """Stop calling a hook added with :meth:`add_hook`."""
+        with self._stats_lock:
+            self._hooks = tuple(h for h in self._hooks if h is not hook)
+
+    def _iter_pages(self, domain, params=None, page_size=100, last_id=None,
+                    deadline=None):
+        """Yield the pages of a domain walking keyset pagination.
+
+        Each page is the list of raw objects answered by the server. The
+        ``last_id`` of the next request is the id of the last object of the
+        previous page, so every query hits the primary key index.
+        """
+        page_size = min(page_size, MAX_PAGE_SIZE)
+        params = dict(params or {})
+        params['limit'] = page_size
+        while True:
+            if last_id is not None:
+                params['last_id'] = last_id
+            page = self._req('get', domain, params=params, deadline=deadline)
+            if type(page).__name__ != 'list':
+                raise PyBossaError(page)
+            if page:
+                yield page
+            if len(page) < page_size:
+                return
+            last_id = page[-1]['id']
+
+    def _iter(self, domain, cls, params=None, page_size=100, last_id=None,
+              prefetch=0, deadline=None):
+        """Yield the objects of a domain one at a time.
+
+        With ``prefetch`` the next pages are downloaded on a background
+        thread while the current one is being consumed. All the pages are
+        fetched within the ``deadline`` seconds, if any.
+        """
+        pages = self._iter_pages(domain, params, page_size, last_id,
+                                 Deadline.coerce(deadline))
+        if prefetch:
+            pages = _prefetch(pages, prefetch, self._bind)
+        for page in pages:
+            for item in page:
+                yield cls(item)
+
+    def _frame(self, domain, params, fields, page_size, last_id, prefetch,
+               as_frame, deadline):
+        """Return the objects of a domain as a DataFrame or NumPy arrays."""
+        pages = self._iter_pages(domain, params, page_size, last_id,
+                                 Deadline.coerce(deadline))
+        if prefetch:
+            pages = _prefetch(pages, prefetch, self._bind)
+        return build_frame(pages, fields, as_frame)
+
+    def export(self, project_id, domain, path, format='ndjson',
+               compression=None, fields=None, page_size=100, prefetch=1,
+               deadline=None, **kwargs):
+        """Stream the objects of a project to a file.
+
+        The pages are written as they arrive, so the memory used does not
+        depend on the size of the project.
+
+        :param project_id: PYBOSSA Project ID
+        :type project_id: integer
+        :param domain: ``task``, ``taskrun``, ``result`` or
+            ``helpingmaterial``
+        :type domain: string
+        :param path: Path of the file to write
+        :type path: string
+        :param format: ``ndjson`` or ``csv``, default ``ndjson``
+        :type format: string
+        :param compression: ``gzip``, ``zstd`` or None; by default inferred
+            from the ``.gz`` or ``.zst`` extension of path
+        :type compression: string
+        :param fields: Columns of a CSV export, such as ``['id',
+            'info.answer']``; by default every field of the first page
+        :type fields: list of strings
+        :param page_size: Number of objects requested per page, default 100
+        :type page_size: integer
+        :param prefetch: Number of pages to download ahead on a background
+            thread, default 1
+        :type prefetch: integer
+        :param deadline: Time budget of the whole export in seconds
+        :type deadline: float
+        :param kwargs: PYBOSSA members to filter by
+        :rtype: ExportResult
+        :returns: The number of rows written and the rows per second
+
+        """
         kwargs['project_id'] = project_id
-        res = _pybossa_req('get', 'taskrun', params=kwargs)
-        if type(res).__name__ == 'list':
-            return [TaskRun(taskrun) for taskrun in res]
-        else:
-            return res
-    except:  # pragma: no cover
-        raise
-
-
-def delete_taskrun(taskrun_id):
-    """Delete the given taskrun.
-
-    :param task: PYBOSSA task
-    """
-    try:
-        res = _pybossa_req('delete', 'taskrun', taskrun_id)
-        if type(res).__name__ == 'bool':
-            return True
-        else:
-            return res
-    except:  # pragma: no cover
-        raise
-
-
-# Results
-
-def get_results(project_id, limit=100, offset=0, last_id=None):
-    """Return a list of results for a given project ID.
-
-    :param project_id: PYBOSSA Project ID
-    :type project_id: integer
-    :param limit: Number of returned items, default 100
-    :type limit: integer
-    :param offset: Offset for the query, default 0
-    :param last_id: id of the last result, used for pagination. If provided, offset is ignored
-    :type last_id: integer
-    :type offset: integer
-    :returns: True -- the response status code
-
-    """
-    if last_id is not None:
-        params = dict(limit=limit, last_id=last_id)
-    else:
-        params = dict(limit=limit, offset=offset)
-        print(OFFSET_WARNING)
-    params['project_id'] = project_id
-    try:
-        res = _pybossa_req('get', 'result',
-                           params=params)
-        if type(res).__name__ == 'list':
-            return [Result(result) for result in res]
-        else:
-            return res
-    except:  # pragma: no cover
-        raise
-
-
-def find_results(project_id, **kwargs):
-    """Return a list of matched results for a given project ID.
-
-    :param project_id: PYBOSSA Project ID
-    :type project_id: integer
-    :param kwargs: PYBOSSA Results members
-    :type info: dict
-    :rtype: list
-    :returns: A list of results that match the kwargs
-
-    """
-    try:
+        pages = self._iter_pages(domain, kwargs, page_size,
+                                 deadline=Deadline.coerce(deadline))
+        if prefetch:
+            pages = _prefetch(pages, prefetch, self._bind)
+        return export_pages(pages, path, format, compression, fields,
+                            self._codec().dumps)
+
+    def _id_bounds(self, domain, params, deadline=None):
+        """Return the lowest and highest ids matching params, or None."""
+        params = dict(params, limit=1)
+        first = self._req('get', domain, params=params, deadline=deadline)
+        params.update(orderby='id', desc=True)
+        last = self._req('get', domain, params=params, deadline=deadline)
+        for page in (first, last):
+            if type(page).__name__ != 'list':
+                raise PyBossaError(page)
+        if not first or not last:
+            return None
+        return first[0]['id'], last[0]['id']
+
+    def _fetch_range(self, domain, params, low, high, page_size,
+                     deadline=None):
+        """Return the raw objects with low <= id <= high, in id order.
+
+        Ids are unique integers, so the page limit never needs to be larger
+        than the number of ids left in the range.
+        """
+        page_size = min(page_size, MAX_PAGE_SIZE)
+        params = dict(params)
+        items = []
+        last_id = low - 1
+        while last_id < high:
+            limit = min(page_size, high - last_id)
+            params.update(limit=limit, last_id=last_id)
+            page = self._req('get', domain, params=params,
+                             deadline=deadline)
+            if type(page).__name__ != 'list':
+                raise PyBossaError(page)
+            items.extend(item for item in page if item['id'] <= high)
+            if len(page) < limit or page[-1]['id'] >= high:
+                break
+            last_id = page[-1]['id']
+        return items
+
+    def iter_parallel(self, domain, project_id, workers=4, chunk_size=None,
+                      page_size=100, ordered=True, deadline=None, **kwargs):
+        """Iterate over a domain fetching id ranges concurrently.
+
+        Keyset pagination is sequential, as every page needs the last id of
+        the previous one. This splits the id space of the project objects
+        into ranges of ``chunk_size`` ids and walks them with ``workers``
+        threads. At most two ranges per worker are held in memory.
+
+        :param domain: PYBOSSA domain, e.g. ``task``, ``taskrun`` or
+            ``result``
+        :type domain: string
+        :param project_id: PYBOSSA Project ID
+        :type project_id: integer
+        :param workers: Number of concurrent requests, default 4
+        :type workers: integer
+        :param chunk_size: Number of ids per range, default 10 pages
+        :type chunk_size: integer
+        :param page_size: Number of objects requested per page, default 100
+        :type page_size: integer
+        :param ordered: Yield the objects in id order, default True. If
+            False, ranges are yielded as soon as they are fetched.
+        :type ordered: boolean
+        :param deadline: Time budget of the whole export in seconds
+        :type deadline: float
+        :param kwargs: PYBOSSA members to filter by
+        :rtype: generator
+        :returns: A generator of PYBOSSA domain objects
+
+        """
+        cls = DOMAINS[domain]
         kwargs['project_id'] = project_id
-        res = _pybossa_req('get', 'result', params=kwargs)
-        if type(res).__name__ == 'list':
-            return [Result(result) for result in res]
-        else:
-            return res
-    except:  # pragma: no cover
-        raise
-
-
-def update_result(result):
-    """Update a result for a given result ID.
-
-    :param result: PYBOSSA result
-
-    """
-    try:
-        result_id = result.id
-        result = _forbidden_attributes(result)
-        res = _pybossa_req('put', 'result', result_id, payload=result.data)
-        if res.get('id'):
-            return Result(res)
+        deadline = Deadline.coerce(deadline)
+        bounds = self._id_bounds(domain, kwargs, deadline)
+        if bounds is None:
+            return
+        chunk_size = chunk_size or page_size * 10
+        ranges = ((low, min(low + chunk_size - 1, bounds[1]))
+                  for low in range(bounds[0], bounds[1] + 1, chunk_size))
+        fetch_range = self._bind(self._fetch_range)
+        pending = deque()
+        executor = ThreadPoolExecutor(max_workers=workers)
+        try:
+            for low, high in ranges:
+                pending.append(executor.submit(fetch_range, domain,
+                                               kwargs, low, high, page_size,
+                                               deadline))
+                while len(pending) >= workers * 2:
+                    for item in self._next_range(pending, ordered):
+                        yield cls(item)
+            while pending:
+                for item in self._next_range(pending, ordered):
+                    yield cls(item)
+        finally:
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=True)
+
+    @staticmethod
+    def _next_range(pending, ordered):
+        """Pop the next finished range of a parallel iteration."""
+        if ordered:
+            return pending.popleft().result()
+        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+        future = done.pop()
+        pending.remove(future)
+        return future.result()
+
+    def _by_ids(self, domain, cls, ids, page_size, concurrency, deadline):
+        """Return a dict mapping the given ids to their objects.
+
+        The sorted unique ids are split into the fewest runs spanning at
+        most ``page_size`` ids, and each run is fetched with one keyset
+        query, ``last_id`` just before its first id and ``limit`` its span,
+        which returns every object of the run. Up to ``concurrency`` runs
+        are fetched at the same time. Missing ids are left out.
+        """
+        page_size = min(page_size, MAX_PAGE_SIZE)
+        ids = sorted(frozenset(ids))
+        deadline = Deadline.coerce(deadline)
+        runs = []
+        for id in ids:
+            if runs and id - runs[-1][0] < page_size:
+                runs[-1][1] = id
+            else:
+                runs.append([id, id])
+
+        def fetch(run):
+            params = dict(last_id=run[0] - 1, limit=run[1] - run[0] + 1)
+            page = self._req('get', domain, params=params, deadline=deadline)
+            if type(page).__name__ != 'list':
+                raise PyBossaError(page)
+            return page
+
+        wanted = frozenset(ids)
+        objects = {}
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            for page in executor.map(self._bind(fetch), runs):
+                for item in page:
+                    if item['id'] in wanted:
+                        objects[item['id']] = cls(item)
+        return objects
+
+    # Projects
+    def get_projects(self, limit=100, offset=0, last_id=None):
+        """Return a list of registered projects.
+
+        :param limit: Number of returned items, default 100
+        :type limit: integer
+        :param offset: Offset for the query, default 0
+        :type offset: integer
+        :param last_id: id of the last project, used for pagination. If provided, offset is ignored
+        :type last_id: integer
+        :rtype: list
+        :returns: A list of PYBOSSA Projects
+
+        """
+        if last_id is not None:
+            params = dict(limit=limit, last_id=last_id)
         else:
-            return res
-    except:  # pragma: no cover
-        raise
-
-
-def _forbidden_attributes(obj):
-    """Return the object without the forbidden attributes."""
-    for key in list(obj.data.keys()):
-        if key in list(obj.reserved_keys.keys()):
-            obj.data.pop(key)
-    return obj
-
-
-# Helping Material
-
-
-def create_helpingmaterial(project_id, info, media_url=None, file_path=None):
-    """Create a helping material for a given project ID.
-
-    :param project_id: PYBOSSA Project ID
-    :type project_id: integer
-    :param info: PYBOSSA Helping Material info JSON field
-    :type info: dict
-    :param media_url: URL for a media file (image, video or audio)
-    :type media_url: string
-    :param file_path: File path to the local image, video or sound to upload. 
-    :type file_path: string
-    :returns: True -- the response status code
-    """
-    try:
-        helping = dict(
-            project_id=project_id,
-            info=info,
-            media_url=None,
-        )
-        if file_path:
-            files = {'file': open(file_path, 'rb')}
-            payload = {'project_id': project_id}
-            res = _pybossa_req('post', 'helpingmaterial',
-                               payload=payload, files=files)
+            print(OFFSET_WARNING)
+            params = dict(limit=limit, offset=offset)
+        try:
+            res = self._req('get', 'project',
+                            params=params)
+            if type(res).__name__ == 'list':
+                return [Project(project) for project in res]
+            else:
+                raise TypeError
+        except:  # pragma: no cover
+            raise
+
+    def get_project(self, project_id):
+        """Return a PYBOSSA Project for the project_id.
+
+        :param project_id: PYBOSSA Project ID
+        :type project_id: integer
+        :rtype: PYBOSSA Project
+        :returns: A PYBOSSA Project object
+
+        """
+        try:
+            return self._get('project', Project, project_id)
+        except:  # pragma: no cover
+            raise
+
+    def get_projects_by_ids(self, ids, page_size=100, concurrency=8,
+                            deadline=None):
+        """Return the projects with the given ids, in the fewest queries.
+
+        :param ids: PYBOSSA Project IDs, duplicates allowed
+        :type ids: iterable of integers
+        :param page_size: Maximum number of ids spanned by one query,
+            default 100
+        :type page_size: integer
+        :param concurrency: Maximum number of concurrent queries, default 8
+        :type concurrency: integer
+        :param deadline: Time budget of all the queries in seconds
+        :type deadline: float
+        :rtype: dict
+        :returns: A dict mapping every id found to its PYBOSSA Project
+
+        """
+        return self._by_ids('project', Project, ids, page_size,
+                            concurrency, deadline)
+
+    def find_project(self, **kwargs):
+        """Return a list with matching project arguments.
+
+        :param kwargs: PYBOSSA Project members
+        :rtype: list
+        :returns: A list of projects that match the kwargs
+
+        """
+        try:
+            res = self._req('get', 'project', params=kwargs)
+            if type(res).__name__ == 'list':
+                return [Project(project) for project in res]
+            else:
+                return res
+        except:  # pragma: no cover
+            raise
+
+    def iter_projects(self, page_size=100, last_id=None,
+                      prefetch=0, deadline=None,
+                      **kwargs):
+        """Iterate over all the projects, fetching them page by page.
+
+        :param page_size: Number of projects requested per page, default 100
+        :type page_size: integer
+        :param last_id: Start after the project with this id
+        :type last_id: integer
+        :param prefetch: Number of pages to download ahead on a background
+            thread while the current page is consumed, default 0 (disabled)
+        :type prefetch: integer
+        :param deadline: Time budget of the whole iteration in seconds
+        :type deadline: float
+        :param kwargs: PYBOSSA Project members to filter by
+        :rtype: generator
+        :returns: A generator of PYBOSSA Projects
+
+        """
+        return self._iter('project', Project, kwargs, page_size, last_id,
+                          prefetch,
+                          deadline)
+
+    def create_project(self, name, short_name, description):
+        """Create a project.
+
+        :param name: PYBOSSA Project Name
+        :type name: string
+        :param short_name: PYBOSSA Project short name or slug
+        :type short_name: string
+        :param description: PYBOSSA Project description
+        :type decription: string
+        :returns: True -- the response status code
+
+        """
+        try:
+            project = dict(name=name, short_name=short_name,
+                           description=description)
+            res = self._req('post', 'project', payload=project)
+            if res.get('id'):
+                return Project(res)
+            else:
+                return res
+        except:  # pragma: no cover
+            raise
+
+    def update_project(self, project):
+        """Update a project instance.
+
+        :param project: PYBOSSA project
+        :type project: PYBOSSA Project
+        :returns: True -- the response status code
+
+        """
+        try:
+            project_id = project.id
+            project = _forbidden_attributes(project)
+            res = self._req('put', 'project', project_id, payload=project.data)
+            if res.get('id'):
+                return Project(res)
+            else:
+                return res
+        except:  # pragma: no cover
+            raise
+
+    def delete_project(self, project_id):
+        """Delete a Project with id = project_id.
+
+        :param project_id: PYBOSSA Project ID
+        :type project_id: integer
+        :returns: True -- the response status code
+
+        """
+        try:
+            res = self._req('delete', 'project', project_id)
+            if type(res).__name__ == 'bool':
+                return True
+            else:
+                return res
+        except:  # pragma: no cover
+            raise
+
+    # Category
+
+    def get_categories(self, limit=20, offset=0, last_id=None):
+        """Return a list of registered categories.
+
+        :param limit: Number of returned items, default 20
+        :type limit: integer
+        :param offset: Offset for the query, default 0
+        :type offset: integer
+        :param last_id: id of the last category, used for pagination. If provided, offset is ignored
+        :type last_id: integer
+        :rtype: list
+        :returns: A list of PYBOSSA Categories
+
+        """
+        if last_id is not None:
+            params = dict(limit=limit, last_id=last_id)
         else:
-            res = _pybossa_req('post', 'helpingmaterial', payload=helping)
-        if res.get('id'):
-            return HelpingMaterial(res)
+            params = dict(limit=limit, offset=offset)
+            print(OFFSET_WARNING)
+        try:
+            res = self._req('get', 'category',
+                            params=params)
+            if type(res).__name__ == 'list':
+                return [Category(category) for category in res]
+            else:
+                raise TypeError
+        except:
+            raise
+
+    def get_category(self, category_id):
+        """Return a PYBOSSA Category for the category_id.
+
+        :param category_id: PYBOSSA Category ID
+        :type category_id: integer
+        :rtype: PYBOSSA Category
+        :returns: A PYBOSSA Category object
+
+        """
+        try:
+            return self._get('category', Category, category_id)
+        except:  # pragma: no cover
+            raise
+
+    def get_categories_by_ids(self, ids, page_size=100, concurrency=8,
+                              deadline=None):
+        """Return the categories with the given ids, in the fewest queries.
+
+        :param ids: PYBOSSA Category IDs, duplicates allowed
+        :type ids: iterable of integers
+        :param page_size: Maximum number of ids spanned by one query,
+            default 100
+        :type page_size: integer
+        :param concurrency: Maximum number of concurrent queries, default 8
+        :type concurrency: integer
+        :param deadline: Time budget of all the queries in seconds
+        :type deadline: float
+        :rtype: dict
+        :returns: A dict mapping every id found to its PYBOSSA Category
+
+        """
+        return self._by_ids('category', Category, ids, page_size,
+                            concurrency, deadline)
+
+    def find_category(self, **kwargs):
+        """Return a list with matching Category arguments.
+
+        :param kwargs: PYBOSSA Category members
+        :rtype: list
+        :returns: A list of project that match the kwargs
+
+        """
+        try:
+            res = self._req('get', 'category', params=kwargs)
+            if type(res).__name__ == 'list':
+                return [Category(category) for category in res]
+            else:
+                return res
+        except:  # pragma: no cover
+            raise
+
+    def iter_categories(self, page_size=100, last_id=None,
+                        prefetch=0, deadline=None,
+                        **kwargs):
+        """Iterate over all the categories, fetching them page by page.
+
+        :param page_size: Number of categories requested per page, default 100
+        :type page_size: integer
+        :param last_id: Start after the category with this id
+        :type last_id: integer
+        :param prefetch: Number of pages to download ahead on a background
+            thread while the current page is consumed, default 0 (disabled)
+        :type prefetch: integer
+        :param deadline: Time budget of the whole iteration in seconds
+        :type deadline: float
+        :param kwargs: PYBOSSA Category members to filter by
+        :rtype: generator
+        :returns: A generator of PYBOSSA Categories
+
+        """
+        return self._iter('category', Category, kwargs, page_size, last_id,
+                          prefetch,
+                          deadline)
+
+    def create_category(self, name, description):
+        """Create a Category.
+
+        :param name: PYBOSSA Category Name
+        :type name: string
+        :param description: PYBOSSA Category description
+        :type decription: string
+        :returns: True -- the response status code
+        """
+        try:
+            category = dict(name=name,
+                            short_name=name.lower().replace(" ", ""),
+                            description=description)
+            res = self._req('post', 'category', payload=category)
+            if res.get('id'):
+                return Category(res)
+            else:
+                return res
+        except:  # pragma: no cover
+            raise
+
+    def update_category(self, category):
+        """Update a Category instance.
+
+        :param category: PYBOSSA Category
+        :type category: PYBOSSA Category
+        :returns: True -- the response status code
+
+        """
+        try:
+            res = self._req('put', 'category',
+                            category.id, payload=category.data)
+            if res.get('id'):
+                return Category(res)
+            else:
+                return res
+        except:  # pragma: no cover
+            raise
+
+    def delete_category(self, category_id):
+        """Delete a Category with id = category_id.
+
+        :param category_id: PYBOSSA Category ID
+        :type category_id: integer
+        :returns: True -- the response status code
+
+        """
+        try:
+            res = self._req('delete', 'category', category_id)
+            if type(res).__name__ == 'bool':
+                return True
+            else:
+                return res
+        except:  # pragma: no cover
+            raise
+
+    # Tasks
+
+    def get_tasks(self, project_id, limit=100, offset=0, last_id=None):
+        """Return a list of tasks for a given project ID.
+
+        :param project_id: PYBOSSA Project ID
+        :type project_id: integer
+        :param limit: Number of returned items, default 100
+        :type limit: integer
+        :param offset: Offset for the query, default 0
+        :param last_id: id of the last task, used for pagination. If provided, offset is ignored
+        :type last_id: integer
+        :type offset: integer
+        :returns: True -- the response status code
+
+        """
+        if last_id is not None:
+            params = dict(limit=limit, last_id=last_id)
         else:
-            return res
-    except:  # pragma: no cover
-        raise
-
-
-def get_helping_materials(project_id, limit=100, offset=0, last_id=None):
-    """Return a list of helping materials for a given project ID.
-
-    :param project_id: PYBOSSA Project ID
-    :type project_id: integer
-    :param limit: Number of returned items, default 100
-    :type limit: integer
-    :param offset: Offset for the query, default 0
-    :param last_id: id of the last helping material, used for pagination. If provided, offset is ignored
-    :type last_id: integer
-    :type offset: integer
-    :returns: True -- the response status code
-
-    """
-    if last_id is not None:
-        params = dict(limit=limit, last_id=last_id)
-    else:
-        params = dict(limit=limit, offset=offset)
-        print(OFFSET_WARNING)
-    params['project_id'] = project_id
-    try:
-        res = _pybossa_req('get', 'helpingmaterial',
-                           params=params)
-        if type(res).__name__ == 'list':
-            return [HelpingMaterial(helping) for helping in res]
+            params = dict(limit=limit, offset=offset)
+            print(OFFSET_WARNING)
+        params['project_id'] = project_id
+        try:
+            res = self._req('get', 'task',
+                            params=params)
+            if type(res).__name__ == 'list':
+                return [Task(task) for task in res]
+            else:
+                return res
+        except:  # pragma: no cover
+            raise
+
+    def get_task(self, task_id):
+        """Return a PYBOSSA Task for the task_id.
+
+        :param task_id: PYBOSSA Task ID
+        :type task_id: integer
+        :rtype: PYBOSSA Task
+        :returns: A PYBOSSA Task object
+
+        """
+        try:
+            return self._get('task', Task, task_id)
+        except:  # pragma: no cover
+            raise
+
+    def get_tasks_by_ids(self, ids, page_size=100, concurrency=8,
+                         deadline=None):
+        """Return the tasks with the given ids, in the fewest queries.
+
+        :param ids: PYBOSSA Task IDs, duplicates allowed
+        :type ids: iterable of integers
+        :param page_size: Maximum number of ids spanned by one query,
+            default 100
+        :type page_size: integer
+        :param concurrency: Maximum number of concurrent queries, default 8
+        :type concurrency: integer
+        :param deadline: Time budget of all the queries in seconds
+        :type deadline: float
+        :rtype: dict
+        :returns: A dict mapping every id found to its PYBOSSA Task
+
+        """
+        return self._by_ids('task', Task, ids, page_size,
+                            concurrency, deadline)
+
+    def find_tasks(self, project_id, **kwargs):
+        """Return a list of matched tasks for a given project ID.
+
+        :param project_id: PYBOSSA Project ID
+        :type project_id: integer
+        :param kwargs: PYBOSSA Task members
+        :type info: dict
+        :rtype: list
+        :returns: A list of tasks that match the kwargs
+
+        """
+        try:
+            kwargs['project_id'] = project_id
+            res = self._req('get', 'task', params=kwargs)
+            if type(res).__name__ == 'list':
+                return [Task(task) for task in res]
+            else:
+                return res
+        except:  # pragma: no cover
+            raise
+
+    def iter_tasks(self, project_id, page_size=100, last_id=None,
+                   prefetch=0, deadline=None,
+                   **kwargs):
+        """Iterate over the tasks of a project, fetching them page by page.
+
+        :param project_id: PYBOSSA Project ID
+        :type project_id: integer
+        :param page_size: Number of tasks requested per page, default 100
+        :type page_size: integer
+        :param last_id: Start after the object with this id
+        :type last_id: integer
+        :param prefetch: Number of pages to download ahead on a background
+            thread while the current page is consumed, default 0 (disabled)
+        :type prefetch: integer
+        :param deadline: Time budget of the whole iteration in seconds
+        :type deadline: float
+        :param kwargs: PYBOSSA Task members to filter by
+        :rtype: generator
+        :returns: A generator of PYBOSSA Tasks
+
+        """
+        kwargs['project_id'] = project_id
+        return self._iter('task', Task, kwargs, page_size, last_id,
+                          prefetch,
+                          deadline)
+
+    def create_task(self, project_id, info, n_answers=30, priority_0=0,
+                    quorum=0):
+        """Create a task for a given project ID.
+
+        :param project_id: PYBOSSA Project ID
+        :type project_id: integer
+        :param info: PYBOSSA Project info JSON field
+        :type info: dict
+        :param n_answers: Number of answers or TaskRuns per task, default 30
+        :type n_answers: integer
+        :param priority_0: Value between 0 and 1 indicating priority of task within
+            Project (higher = more important), default 0.0
+        :type priority_0: float
+        :param quorum: Number of times this task should be done by different users,
+            default 0
+        :type quorum: integer
+        :returns: True -- the response status code
+        """
+        try:
+            task = dict(
+                project_id=project_id,
+                info=info,
+                calibration=0,
+                priority_0=priority_0,
+                n_answers=n_answers,
+                quorum=quorum
+            )
+            res = self._req('post', 'task', payload=task)
+            if res.get('id'):
+                return Task(res)
+            else:
+                return res
+        except:  # pragma: no cover
+            raise
+
+    def create_tasks(self, project_id, infos, n_answers=30, priority_0=0,
+                     quorum=0, concurrency=8, deadline=None):
+        """Create many tasks for a given project ID concurrently.
+
+        The task infos are read lazily from any iterable, and at most
+        ``concurrency`` POST requests are in flight at the same time.
+
+        :param project_id: PYBOSSA Project ID
+        :type project_id: integer
+        :param infos: PYBOSSA Task info JSON fields
+        :type infos: iterable of dict
+        :param n_answers: Number of answers or TaskRuns per task, default 30
+        :type n_answers: integer
+        :param priority_0: Value between 0 and 1 indicating priority of task
+            within Project (higher = more important), default 0.0
+        :type priority_0: float
+        :param quorum: Number of times this task should be done by different
+            users, default 0
+        :type quorum: integer
+        :param concurrency: Number of concurrent requests, default 8
+        :type concurrency: integer
+        :param deadline: Time budget of the whole operation in seconds. Once
+            it is spent no more items are started, and DeadlineExceeded is
+            raised after the outcomes of the items in flight.
+        :type deadline: float
+        :rtype: BulkResult
+        :returns: The :class:`Outcome` of every info in input order. Failures
+            are reported in the outcome, they do not stop the other tasks.
+        """
+        def create(info):
+            return self.create_task(project_id, info, n_answers=n_answers,
+                                    priority_0=priority_0, quorum=quorum)
+        return self._run_bulk(create, infos, concurrency, deadline)
+
+    def update_task(self, task):
+        """Update a task for a given task ID.
+
+        :param task: PYBOSSA task
+
+        """
+        try:
+            task_id = task.id
+            task = _forbidden_attributes(task)
+            res = self._req('put', 'task', task_id, payload=task.data)
+            if res.get('id'):
+                return Task(res)
+            else:
+                return res
+        except:  # pragma: no cover
+            raise
+
+    def delete_task(self, task_id):
+        """Delete a task for a given task ID.
+
+        :param task: PYBOSSA task
+
+        """
+        #: :arg task: A task
+        try:
+            res = self._req('delete', 'task', task_id)
+            if type(res).__name__ == 'bool':
+                return True
+            else:
+                return res
+        except:  # pragma: no cover
+            raise
+
+    def update_tasks(self, tasks, concurrency=8, deadline=None):
+        """Update many tasks concurrently.
+
+        :param tasks: PYBOSSA tasks
+        :type tasks: iterable of Task
+        :param concurrency: Number of concurrent requests, default 8
+        :type concurrency: integer
+        :param deadline: Time budget of the whole operation in seconds. Once
+            it is spent no more items are started, and DeadlineExceeded is
+            raised after the outcomes of the items in flight.
+        :type deadline: float
+        :rtype: BulkResult
+        :returns: The :class:`Outcome` of every task in input order, with
+            the total throughput and failures.
+        """
+        return self._run_bulk(self.update_task, tasks, concurrency,
+                              deadline)
+
+    def delete_tasks(self, tasks, concurrency=8, deadline=None):
+        """Delete many tasks concurrently.
+
+        :param tasks: PYBOSSA tasks or task IDs
+        :type tasks: iterable
+        :param concurrency: Number of concurrent requests, default 8
+        :type concurrency: integer
+        :param deadline: Time budget of the whole operation in seconds. Once
+            it is spent no more items are started, and DeadlineExceeded is
+            raised after the outcomes of the items in flight.
+        :type deadline: float
+        :rtype: BulkResult
+        :returns: The :class:`Outcome` of every task in input order, with
+            the total throughput and failures.
+        """
+        def delete(task):
+            return self.delete_task(getattr(task, 'id', task))
+        return self._run_bulk(delete, tasks, concurrency, deadline)
+
+    # Task Runs
+
+    def get_taskruns(self, project_id, limit=100, offset=0, last_id=None):
+        """Return a list of task runs for a given project ID.
+
+        :param project_id: PYBOSSA Project ID
+        :type project_id: integer
+        :param limit: Number of returned items, default 100
+        :type limit: integer
+        :param offset: Offset for the query, default 0
+        :type offset: integer
+        :param last_id: id of the last taskrun, used for pagination. If provided, offset is ignored
+        :type last_id: integer
+        :rtype: list
+        :returns: A list of task runs for the given project ID
+
+        """
+        if last_id is not None:
+            params = dict(limit=limit, last_id=last_id)
         else:
-            return res
-    except:  # pragma: no cover
-        raise
-
-
-def find_helping_materials(project_id, **kwargs):
-    """Return a list of matched helping materials for a given project ID.
-
-    :param project_id: PYBOSSA Project ID
-    :type project_id: integer
-    :param kwargs: PYBOSSA HelpingMaterial members
-    :type info: dict
-    :rtype: list
-    :returns: A list of helping materials that match the kwargs
-
-    """
-    try:
+            params = dict(limit=limit, offset=offset)
+            print(OFFSET_WARNING)
+        params['project_id'] = project_id
+        try:
+            res = self._req('get', 'taskrun',
+                            params=params)
+            if type(res).__name__ == 'list':
+                return [TaskRun(taskrun) for taskrun in res]
+            else:
+                raise TypeError
+        except:
+            raise
+
+    def get_taskruns_by_ids(self, ids, page_size=100, concurrency=8,
+                            deadline=None):
+        """Return the task runs with the given ids, in the fewest queries.
+
+        :param ids: PYBOSSA Task Run IDs, duplicates allowed
+        :type ids: iterable of integers
+        :param page_size: Maximum number of ids spanned by one query,
+            default 100
+        :type page_size: integer
+        :param concurrency: Maximum number of concurrent queries, default 8
+        :type concurrency: integer
+        :param deadline: Time budget of all the queries in seconds
+        :type deadline: float
+        :rtype: dict
+        :returns: A dict mapping every id found to its PYBOSSA Task Run
+
+        """
+        return self._by_ids('taskrun', TaskRun, ids, page_size,
+                            concurrency, deadline)
+
+    def find_taskruns(self, project_id, **kwargs):
+        """Return a list of matched task runs for a given project ID.
+
+        :param project_id: PYBOSSA Project ID
+        :type project_id: integer
+        :param kwargs: PYBOSSA Task Run members
+        :rtype: list
+        :returns: A List of task runs that match the query members
+
+        """
+        try:
+            kwargs['project_id'] = project_id
+            res = self._req('get', 'taskrun', params=kwargs)
+            if type(res).__name__ == 'list':
+                return [TaskRun(taskrun) for taskrun in res]
+            else:
+                return res
+        except:  # pragma: no cover
+            raise
+
+    def iter_taskruns(self, project_id, page_size=100, last_id=None,
+                      prefetch=0, deadline=None,
+                      **kwargs):
+        """Iterate over the task runs of a project, fetching them page by page.
+
+        :param project_id: PYBOSSA Project ID
+        :type project_id: integer
+        :param page_size: Number of task runs requested per page, default 100
+        :type page_size: integer
+        :param last_id: Start after the object with this id
+        :type last_id: integer
+        :param prefetch: Number of pages to download ahead on a background
+            thread while the current page is consumed, default 0 (disabled)
+        :type prefetch: integer
+        :param deadline: Time budget of the whole iteration in seconds
+        :type deadline: float
+        :param kwargs: PYBOSSA Task Run members to filter by
+        :rtype: generator
+        :returns: A generator of PYBOSSA Task Runs
+
+        """
+        kwargs['project_id'] = project_id
+        return self._iter('taskrun', TaskRun, kwargs, page_size, last_id,
+                          prefetch,
+                          deadline)
+
+    def taskruns_frame(self, project_id, fields=None, page_size=100,
+                       last_id=None, prefetch=1, as_frame=True, deadline=None,
+                       **kwargs):
+        """Return the task runs of a project as columns.
+
+        The pages are stored in typed columns as they arrive, without
+        building a Task Run object per row. The ``info`` objects are
+        flattened into ``info.<key>`` columns.
+
+        :param project_id: PYBOSSA Project ID
+        :type project_id: integer
+        :param fields: Columns to return, such as ``['id', 'user_id',
+            'info.answer']``; by default every field of the first page
+        :type fields: list of strings
+        :param page_size: Number of task runs requested per page, default 100
+        :type page_size: integer
+        :param last_id: Start after the object with this id
+        :type last_id: integer
+        :param prefetch: Number of pages to download ahead on a background
+            thread, default 1
+        :type prefetch: integer
+        :param as_frame: Return a pandas DataFrame, default True, or a dict
+            of NumPy arrays
+        :type as_frame: boolean
+        :param deadline: Time budget of the whole download in seconds
+        :type deadline: float
+        :param kwargs: PYBOSSA Task Run members to filter by
+        :returns: A pandas DataFrame or a dict of NumPy arrays
+
+        """
         kwargs['project_id'] = project_id
-        res = _pybossa_req('get', 'helpingmaterial', params=kwargs)
-        if type(res).__name__ == 'list':
-            return [HelpingMaterial(helping) for helping in res]
+        return self._frame('taskrun', kwargs, fields, page_size, last_id,
+                           prefetch, as_frame, deadline)
+
+    def delete_taskrun(self, taskrun_id):
+        """Delete the given taskrun.
+
+        :param task: PYBOSSA task
+        """
+        try:
+            res = self._req('delete', 'taskrun', taskrun_id)
+            if type(res).__name__ == 'bool':
+                return True
+            else:
+                return res
+        except:  # pragma: no cover
+            raise
+
+    def delete_taskruns(self, taskruns, concurrency=8, deadline=None):
+        """Delete many task runs concurrently.
+
+        :param taskruns: PYBOSSA task runs or task run IDs
+        :type taskruns: iterable
+        :param concurrency: Number of concurrent requests, default 8
+        :type concurrency: integer
+        :param deadline: Time budget of the whole operation in seconds. Once
+            it is spent no more items are started, and DeadlineExceeded is
+            raised after the outcomes of the items in flight.
+        :type deadline: float
+        :rtype: BulkResult
+        :returns: The :class:`Outcome` of every task run in input order, with
+            the total throughput and failures.
+        """
+        def delete(taskrun):
+            return self.delete_taskrun(getattr(taskrun, 'id', taskrun))
+        return self._run_bulk(delete, taskruns, concurrency, deadline)
+
+    # Results
+
+    def get_results(self, project_id, limit=100, offset=0, last_id=None):
+        """Return a list of results for a given project ID.
+
+        :param project_id: PYBOSSA Project ID
+        :type project_id: integer
+        :param limit: Number of returned items, default 100
+        :type limit: integer
+        :param offset: Offset for the query, default 0
+        :param last_id: id of the last result, used for pagination. If provided, offset is ignored
+        :type last_id: integer
+        :type offset: integer
+        :returns: True -- the response status code
+
+        """
+        if last_id is not None:
+            params = dict(limit=limit, last_id=last_id)
         else:
-            return res
-    except:  # pragma: no cover
-        raise
-
-
-def update_helping_material(helpingmaterial):
-    """Update a helping material for a given helping material ID.
-
-    :param helpingmaterial: PYBOSSA helping material
-
-    """
-    try:
-        helpingmaterial_id = helpingmaterial.id
-        helpingmaterial = _forbidden_attributes(helpingmaterial)
-        res = _pybossa_req('put', 'helpingmaterial',
-                           helpingmaterial_id, payload=helpingmaterial.data)
-        if res.get('id'):
-            return HelpingMaterial(res)
+            params = dict(limit=limit, offset=offset)
+            print(OFFSET_WARNING)
+        params['project_id'] = project_id
+        try:
+            res = self._req('get', 'result',
+                            params=params)
+            if type(res).__name__ == 'list':
+                return [Result(result) for result in res]
+            else:
+                return res
+        except:  # pragma: no cover
+            raise
+
+    def get_results_by_ids(self, ids, page_size=100, concurrency=8,
+                           deadline=None):
+        """Return the results with the given ids, in the fewest queries.
+
+        :param ids: PYBOSSA Result IDs, duplicates allowed
+        :type ids: iterable of integers
+        :param page_size: Maximum number of ids spanned by one query,
+            default 100
+        :type page_size: integer
+        :param concurrency: Maximum number of concurrent queries, default 8
+        :type concurrency: integer
+        :param deadline: Time budget of all the queries in seconds
+        :type deadline: float
+        :rtype: dict
+        :returns: A dict mapping every id found to its PYBOSSA Result
+
+        """
+        return self._by_ids('result', Result, ids, page_size,
+                            concurrency, deadline)
+
+    def get_results_by_task_ids(self, task_ids, concurrency=8,
+                                deadline=None):
+        """Return the results of the given tasks, querying them concurrently.
+
+        :param task_ids: PYBOSSA Task IDs, duplicates allowed
+        :type task_ids: iterable of integers
+        :param concurrency: Maximum number of concurrent queries, default 8
+        :type concurrency: integer
+        :param deadline: Time budget of all the queries in seconds
+        :type deadline: float
+        :rtype: dict
+        :returns: A dict mapping every task with a result to the last
+            version of its PYBOSSA Result
+
+        """
+        deadline = Deadline.coerce(deadline)
+
+        def fetch(task_id):
+            page = self._req('get', 'result', params=dict(task_id=task_id),
+                             deadline=deadline)
+            if type(page).__name__ != 'list':
+                raise PyBossaError(page)
+            return page
+
+        results = {}
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            for page in executor.map(self._bind(fetch),
+                                     sorted(frozenset(task_ids))):
+                if page:
+                    last = max(page, key=lambda item: (
+                        bool(item.get('last_version')), item['id']))
+                    results[last['task_id']] = Result(last)
+        return results
+
+    def find_results(self, project_id, **kwargs):
+        """Return a list of matched results for a given project ID.
+
+        :param project_id: PYBOSSA Project ID
+        :type project_id: integer
+        :param kwargs: PYBOSSA Results members
+        :type info: dict
+        :rtype: list
+        :returns: A list of results that match the kwargs
+
+        """
+        try:
+            kwargs['project_id'] = project_id
+            res = self._req('get', 'result', params=kwargs)
+            if type(res).__name__ == 'list':
+                return [Result(result) for result in res]
+            else:
+                return res
+        except:  # pragma: no cover
+            raise
+
+    def iter_results(self, project_id, page_size=100, last_id=None,
+                     prefetch=0, deadline=None,
+                     **kwargs):
+        """Iterate over the results of a project, fetching them page by page.
+
+        :param project_id: PYBOSSA Project ID
+        :type project_id: integer
+        :param page_size: Number of results requested per page, default 100
+        :type page_size: integer
+        :param last_id: Start after the object with this id
+        :type last_id: integer
+        :param prefetch: Number of pages to download ahead on a background
+            thread while the current page is consumed, default 0 (disabled)
+        :type prefetch: integer
+        :param deadline: Time budget of the whole iteration in seconds
+        :type deadline: float
+        :param kwargs: PYBOSSA Result members to filter by
+        :rtype: generator
+        :returns: A generator of PYBOSSA Results
+
+        """
+        kwargs['project_id'] = project_id
+        return self._iter('result', Result, kwargs, page_size, last_id,
+                          prefetch,
+                          deadline)
+
+    def results_frame(self, project_id, fields=None, page_size=100,
+                      last_id=None, prefetch=1, as_frame=True, deadline=None,
+                      **kwargs):
+        """Return the results of a project as columns.
+
+        The pages are stored in typed columns as they arrive, without
+        building a Result object per row. The ``info`` objects are
+        flattened into ``info.<key>`` columns.
+
+        :param project_id: PYBOSSA Project ID
+        :type project_id: integer
+        :param fields: Columns to return, such as ``['task_id',
+            'info.answer']``; by default every field of the first page
+        :type fields: list of strings
+        :param page_size: Number of results requested per page, default 100
+        :type page_size: integer
+        :param last_id: Start after the object with this id
+        :type last_id: integer
+        :param prefetch: Number of pages to download ahead on a background
+            thread, default 1
+        :type prefetch: integer
+        :param as_frame: Return a pandas DataFrame, default True, or a dict
+            of NumPy arrays
+        :type as_frame: boolean
+        :param deadline: Time budget of the whole download in seconds
+        :type deadline: float
+        :param kwargs: PYBOSSA Result members to filter by
+        :returns: A pandas DataFrame or a dict of NumPy arrays
+
+        """
+        kwargs['project_id'] = project_id
+        return self._frame('result', kwargs, fields, page_size, last_id,
+                           prefetch, as_frame, deadline)
+
+    def update_result(self, result):
+        """Update a result for a given result ID.
+
+        :param result: PYBOSSA result
+
+        """
+        try:
+            result_id = result.id
+            result = _forbidden_attributes(result)
+            res = self._req('put', 'result', result_id, payload=result.data)
+            if res.get('id'):
+                return Result(res)
+            else:
+                return res
+        except:  # pragma: no cover
+            raise
+
+    def update_results(self, results, concurrency=8, deadline=None):
+        """Update many results concurrently.
+
+        :param results: PYBOSSA results
+        :type results: iterable of Result
+        :param concurrency: Number of concurrent requests, default 8
+        :type concurrency: integer
+        :param deadline: Time budget of the whole operation in seconds. Once
+            it is spent no more items are started, and DeadlineExceeded is
+            raised after the outcomes of the items in flight.
+        :type deadline: float
+        :rtype: BulkResult
+        :returns: The :class:`Outcome` of every result in input order, with
+            the total throughput and failures.
+        """
+        return self._run_bulk(self.update_result, results, concurrency,
+                              deadline)
+
+    # Helping Material
+
+    def create_helpingmaterial(self, project_id, info, media_url=None,
+                               file_path=None, progress=None):
+        """Create a helping material for a given project ID.
+
+        The file is streamed from disk in chunks, and closed once sent.
+
+        :param project_id: PYBOSSA Project ID
+        :type project_id: integer
+        :param info: PYBOSSA Helping Material info JSON field
+        :type info: dict
+        :param media_url: URL for a media file (image, video or audio)
+        :type media_url: string
+        :param file_path: File path to the local image, video or sound to
+            upload, or a seekable binary file object such as an open file or
+            an ``mmap.mmap``, which is left open
+        :type file_path: string or path-like object
+        :param progress: Function called with the bytes uploaded so far and
+            the total, as the file is sent
+        :returns: True -- the response status code
+        """
+        try:
+            helping = dict(
+                project_id=project_id,
+                info=info,
+                media_url=None,
+            )
+            if file_path:
+                payload = {'project_id': project_id}
+                with MultipartEncoder(payload, {'file': file_path},
+                                      progress) as body:
+                    res = self._req('post', 'helpingmaterial', files=body)
+            else:
+                res = self._req('post', 'helpingmaterial', payload=helping)
+            if res.get('id'):
+                return HelpingMaterial(res)
+            else:
+                return res
+        except:  # pragma: no cover
+            raise
+
+    def get_helping_materials(self, project_id, limit=100, offset=0,
+                              last_id=None):
+        """Return a list of helping materials for a given project ID.
+
+        :param project_id: PYBOSSA Project ID
+        :type project_id: integer
+        :param limit: Number of returned items, default 100
+        :type limit: integer
+        :param offset: Offset for the query, default 0
+        :param last_id: id of the last helping material, used for pagination. If provided, offset is ignored
+        :type last_id: integer
+        :type offset: integer
+        :returns: True -- the response status code
+
+        """
+        if last_id is not None:
+            params = dict(limit=limit, last_id=last_id)
         else:
-            return res
-    except:  # pragma: no cover
-        raise
+            params = dict(limit=limit, offset=offset)
+            print(OFFSET_WARNING)
+        params['project_id'] = project_id
+        try:
+            res = self._req('get', 'helpingmaterial',
+                            params=params)
+            if type(res).__name__ == 'list':
+                return [HelpingMaterial(helping) for helping in res]
+            else:
+                return res
+        except:  # pragma: no cover
+            raise
+
+    def get_helping_materials_by_ids(self, ids, page_size=100, concurrency=8,
+                                     deadline=None):
+        """Return the helping materials with the given ids, in few queries.
+
+        :param ids: PYBOSSA Helping Material IDs, duplicates allowed
+        :type ids: iterable of integers
+        :param page_size: Maximum number of ids spanned by one query,
+            default 100
+        :type page_size: integer
+        :param concurrency: Maximum number of concurrent queries, default 8
+        :type concurrency: integer
+        :param deadline: Time budget of all the queries in seconds
+        :type deadline: float
+        :rtype: dict
+        :returns: A dict mapping every id found to its PYBOSSA Helping
+            Material
+
+        """
+        return self._by_ids('helpingmaterial', HelpingMaterial, ids,
+                            page_size, concurrency, deadline)
+
+    def find_helping_materials(self, project_id, **kwargs):
+        """Return a list of matched helping materials for a given project ID.
+
+        :param project_id: PYBOSSA Project ID
+        :type project_id: integer
+        :param kwargs: PYBOSSA HelpingMaterial members
+        :type info: dict
+        :rtype: list
+        :returns: A list of helping materials that match the kwargs
+
+        """
+        try:
+            kwargs['project_id'] = project_id
+            res = self._req('get', 'helpingmaterial', params=kwargs)
+            if type(res).__name__ == 'list':
+                return [HelpingMaterial(helping) for helping in res]
+            else:
+                return res
+        except:  # pragma: no cover
+            raise
+
+    def iter_helping_materials(self, project_id, page_size=100, last_id=None,
+                               prefetch=0, deadline=None,
+                               **kwargs):
+        """Iterate over the helping materials of a project, page by page.
+
+        :param project_id: PYBOSSA Project ID
+        :type project_id: integer
+        :param page_size: Number of helping materials requested per page, default 100
+        :type page_size: integer
+        :param last_id: Start after the object with this id
+        :type last_id: integer
+        :param prefetch: Number of pages to download ahead on a background
+            thread while the current page is consumed, default 0 (disabled)
+        :type prefetch: integer
+        :param deadline: Time budget of the whole iteration in seconds
+        :type deadline: float
+        :param kwargs: PYBOSSA Helping Material members to filter by
+        :rtype: generator
+        :returns: A generator of PYBOSSA Helping Materials
+
+        """
+        kwargs['project_id'] = project_id
+        return self._iter('helpingmaterial', HelpingMaterial, kwargs,
+                          page_size, last_id, prefetch,
+                          deadline)
+
+    def update_helping_material(self, helpingmaterial):
+        """Update a helping material for a given helping material ID.
+
+        :param helpingmaterial: PYBOSSA helping material
+
+        """
+        try:
+            helpingmaterial_id = helpingmaterial.id
+            helpingmaterial = _forbidden_attributes(helpingmaterial)
+            res = self._req('put', 'helpingmaterial',
+                            helpingmaterial_id, payload=helpingmaterial.data)
+            if res.get('id'):
+                return HelpingMaterial(res)
+            else:
+                return res
+        except:  # pragma: no cover
+            raise
+
+    def sync_helping_materials(self, project_id, directory, concurrency=8,
+                               processes=None, deadline=None):
+        """Upload the new and changed files of a directory as helping
+        materials of a project.
+
+        The files are hashed in a pool of processes, and their hashes are
+        compared with the ones stored in the ``info`` of the helping
+        materials of earlier syncs, so unchanged files are not sent again.
+        A changed file is uploaded as a new helping material, and the old one
+        is deleted. Files removed from the directory are left on the server.
+        A new helping material whose path and hash could not be stored is
+        deleted, or reported in ``orphaned`` if that fails too, as the next
+        sync would not recognise it.
+
+        :param project_id: PYBOSSA Project ID
+        :type project_id: integer
+        :param directory: Directory of the files to upload
+        :type directory: string
+        :param concurrency: Number of concurrent uploads, default 8
+        :type concurrency: integer
+        :param processes: Number of hashing processes, by default one per CPU
+        :type processes: integer
+        :param deadline: Time budget of the whole sync in seconds
+        :type deadline: float
+        :rtype: pbclient.uploads.SyncResult
+        :returns: The files uploaded and skipped, and the bytes and time
+            saved
+        """
+        started = time.time()
+        deadline = Deadline.coerce(deadline)
+        result = SyncResult()
+        local = hash_files(directory, processes)
+        result.hash_elapsed = time.time() - started
+        remote = {}
+        for page in self._iter_pages('helpingmaterial',
+                                     dict(project_id=project_id),
+                                     deadline=deadline):
+            for hm in page:
+                info = hm.get('info')
+                if isinstance(info, dict) and info.get(PATH_KEY):
+                    remote[info[PATH_KEY]] = hm
+        todo = []
+        for path in sorted(local):
+            digest, size = local[path]
+            old = remote.get(path)
+            if old is not None and old['info'].get(HASH_KEY) == digest:
+                result.unchanged.append(path)
+                result.bytes_skipped += size
+            else:
+                todo.append((path, digest, size, old))
+
+        def discard(hm_id):
+            try:
+                if self._req('delete', 'helpingmaterial', hm_id) is True:
+                    return
+            except Exception:
+                pass
+            result.orphaned.append(hm_id)
+
+        def upload(item):
+            path, digest, size, old = item
+            hm = self.create_helpingmaterial(
+                project_id, {}, file_path=os.path.join(directory,
+                                                       *path.split('/')))
+            if not isinstance(hm, HelpingMaterial):
+                return hm
+            data = hm.data
+            data['info'] = dict(data.get('info') or {})
+            data['info'].update({PATH_KEY: path, HASH_KEY: digest})
+            hm_id = hm.id
+            try:
+                updated = self.update_helping_material(hm)
+            except Exception:
+                discard(hm_id)
+                raise
+            if not isinstance(updated, HelpingMaterial):
+                discard(hm_id)
+                return updated
+            hm = updated
+            if old is not None:
+                res = self._req('delete', 'helpingmaterial', old['id'])
+                if res is not True:
+                    return res
+            return hm
+
+        uploading = time.time()
+        try:
+            for outcome in self._run_bulk(upload, todo, concurrency,
+                                          deadline):
+                path, digest, size, old = outcome.item
+                if not outcome.ok:
+                    result.failures.append(outcome)
+                    continue
+                result.uploaded.append(path)
+                result.bytes_uploaded += size
+                if old is not None:
+                    result.replaced.append(path)
+        finally:
+            result.upload_elapsed = time.time() - uploading
+            result.elapsed = time.time() - started
+        return result
+
+
+# Module level API: a thin facade over a default client configured with
+# :func:`set`.
+
+_default = PyBossaClient()
+_opts = _default.opts
+stats = _default.stats
+
+
+def _delegate(method):
+    """Expose a PyBossaClient method as a function of the default client."""
+    name = method.__name__
+
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        return getattr(_default, name)(*args, **kwargs)
+    return wrapper
+
+
+set = _delegate(PyBossaClient.set)
+close = _delegate(PyBossaClient.close)
+_get_session = _delegate(PyBossaClient._get_session)
+_pybossa_req = _delegate(PyBossaClient._req)
+reset_stats = _delegate(PyBossaClient.reset_stats)
+add_hook = _delegate(PyBossaClient.add_hook)
+remove_hook = _delegate(PyBossaClient.remove_hook)
+timeout = _delegate(PyBossaClient.timeout)
+deadline = _delegate(PyBossaClient.deadline)
+
+get_projects = _delegate(PyBossaClient.get_projects)
+get_project = _delegate(PyBossaClient.get_project)
+get_projects_by_ids = _delegate(PyBossaClient.get_projects_by_ids)
+find_project = _delegate(PyBossaClient.find_project)
+iter_projects = _delegate(PyBossaClient.iter_projects)
+create_project = _delegate(PyBossaClient.create_project)
+update_project = _delegate(PyBossaClient.update_project)
+delete_project = _delegate(PyBossaClient.delete_project)
+get_categories = _delegate(PyBossaClient.get_categories)
+get_category = _delegate(PyBossaClient.get_category)
+get_categories_by_ids = _delegate(PyBossaClient.get_categories_by_ids)
+find_category = _delegate(PyBossaClient.find_category)
+iter_categories = _delegate(PyBossaClient.iter_categories)
+create_category = _delegate(PyBossaClient.create_category)
+update_category = _delegate(PyBossaClient.update_category)
+delete_category = _delegate(PyBossaClient.delete_category)
+get_tasks = _delegate(PyBossaClient.get_tasks)
+get_task = _delegate(PyBossaClient.get_task)
+get_tasks_by_ids = _delegate(PyBossaClient.get_tasks_by_ids)
+find_tasks = _delegate(PyBossaClient.find_tasks)
+iter_tasks = _delegate(PyBossaClient.iter_tasks)
+create_task = _delegate(PyBossaClient.create_task)
+create_tasks = _delegate(PyBossaClient.create_tasks)
+update_task = _delegate(PyBossaClient.update_task)
+update_tasks = _delegate(PyBossaClient.update_tasks)
+delete_task = _delegate(PyBossaClient.delete_task)
+delete_tasks = _delegate(PyBossaClient.delete_tasks)
+get_taskruns = _delegate(PyBossaClient.get_taskruns)
+get_taskruns_by_ids = _delegate(PyBossaClient.get_taskruns_by_ids)
+find_taskruns = _delegate(PyBossaClient.find_taskruns)
+iter_taskruns = _delegate(PyBossaClient.iter_taskruns)
+delete_taskrun = _delegate(PyBossaClient.delete_taskrun)
+delete_taskruns = _delegate(PyBossaClient.delete_taskruns)
+taskruns_frame = _delegate(PyBossaClient.taskruns_frame)
+get_results = _delegate(PyBossaClient.get_results)
+get_results_by_ids = _delegate(PyBossaClient.get_results_by_ids)
+get_results_by_task_ids = _delegate(PyBossaClient.get_results_by_task_ids)
+find_results = _delegate(PyBossaClient.find_results)
+iter_results = _delegate(PyBossaClient.iter_results)
+update_result = _delegate(PyBossaClient.update_result)
+update_results = _delegate(PyBossaClient.update_results)
+results_frame = _delegate(PyBossaClient.results_frame)
+create_helpingmaterial = _delegate(PyBossaClient.create_helpingmaterial)
+get_helping_materials = _delegate(PyBossaClient.get_helping_materials)
+get_helping_materials_by_ids = _delegate(PyBossaClient.get_helping_materials_by_ids)
+find_helping_materials = _delegate(PyBossaClient.find_helping_materials)
+iter_helping_materials = _delegate(PyBossaClient.iter_helping_materials)
+update_helping_material = _delegate(PyBossaClient.update_helping_material)
+sync_helping_materials = _delegate(PyBossaClient.sync_helping_materials)
+iter_parallel = _delegate(PyBossaClient.iter_parallel)
+export = _delegate(PyBossaClient.export)
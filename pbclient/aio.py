@@ -0,0 +1,680 @@
+# -*- coding: utf-8 -*-
+"""asyncio PYBOSSA client.
+
+~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+Coroutine versions of the single object and listing functions of
+:mod:`pbclient`, and of ``create_tasks``, built on `aiohttp
+<https://docs.aiohttp.org>`_ (``pip install pybossa-client[aio]``). They
+return the same domain objects as the blocking client.
+
+:license: MIT
+"""
+
+import asyncio
+from collections import deque
+
+import requests
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover
+    aiohttp = None
+
+from pbclient import (OFFSET_WARNING, SESSION_DEFAULTS, STATS_DEFAULTS,
+                      MAX_THROTTLED, DEFAULT_TIMEOUT, MAX_PAGE_SIZE,
+                      PyBossaClient, PyBossaError, DomainObject, Outcome,
+                      Project, Category, Task, TaskRun, Result,
+                      HelpingMaterial, _forbidden_attributes, _rewind)
+from pbclient.codec import compress
+from pbclient.multipart import MultipartEncoder
+from pbclient.timeouts import Deadline, DeadlineExceeded
+from pbclient.ratelimit import get_limiter
+from pbclient.retry import DEFAULT_RETRY
+from pbclient.singleflight import request_key
+
+#: Settings of the blocking client the async client does not implement.
+UNSUPPORTED_SETTINGS = ('cache', 'conditional')
+
+
+def _object(res, cls):
+    """Return res as a domain object, or the error answered."""
+    if res.get('id'):
+        return cls(res)
+    return res
+
+
+def _objects(res, cls):
+    """Return res as a list of domain objects, or the error answered."""
+    if type(res).__name__ == 'list':
+        return [cls(item) for item in res]
+    return res
+
+
+def _deleted(res):
+    """Return True if res is a successful delete, or the error answered."""
+    if type(res).__name__ == 'bool':
+        return True
+    return res
+
+
+async def _outcome(index, item, func):
+    """Await func(item) and return its Outcome."""
+    try:
+        res = await func(item)
+    except Exception as e:
+        return Outcome(index, item, None, e)
+    if isinstance(res, DomainObject) or res is True:
+        return Outcome(index, item, res, None)
+    return Outcome(index, item, None, res)
+
+
+async def _bulk(func, items, concurrency=8):
+    """Yield the Outcome of func(item) for every item, in input order.
+
+    Up to ``concurrency`` calls run at the same time and the items are
+    read lazily.
+    """
+    pending = deque()
+    try:
+        for index, item in enumerate(items):
+            pending.append(asyncio.ensure_future(_outcome(index, item, func)))
+            if len(pending) >= concurrency:
+                yield await pending.popleft()
+        while pending:
+            yield await pending.popleft()
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+def _as_requests_error(e):
+    """Return the requests exception matching an aiohttp one.
+
+    The :class:`pbclient.retry.Retry` policies are written in terms of the
+    requests exceptions, which both clients share.
+    """
+    if isinstance(e, asyncio.TimeoutError):
+        return requests.Timeout(e)
+    if isinstance(e, aiohttp.ClientConnectionError):
+        return requests.ConnectionError(e)
+    return e
+
+
+async def _stream(body):
+    """Yield the chunks of a multipart body, read off the event loop."""
+    loop = asyncio.get_event_loop()
+    while True:
+        chunk = await loop.run_in_executor(None, body.read, body.chunk_size)
+        if not chunk:
+            return
+        yield chunk
+
+
+def _form_data(payload, files):
+    """Return the multipart body of a request with files."""
+    if isinstance(files, MultipartEncoder):
+        return _stream(files)
+    data = aiohttp.FormData(payload or {})
+    for name, fileobj in files.items():
+        data.add_field(name, fileobj)
+    return data
+
+
+def _client_timeout(timeout):
+    """Return the aiohttp timeout of a (connect, read) timeout."""
+    if timeout is None:
+        return aiohttp.ClientTimeout(total=None)
+    if not isinstance(timeout, tuple):
+        timeout = (timeout, timeout)
+    return aiohttp.ClientTimeout(total=None, sock_connect=timeout[0],
+                                 sock_read=timeout[1])
+
+
+def _page_params(limit, offset, last_id):
+    """Return the pagination params of the get_* coroutines."""
+    if last_id is not None:
+        return dict(limit=limit, last_id=last_id)
+    print(OFFSET_WARNING)
+    return dict(limit=limit, offset=offset)
+
+
+class AsyncSingleFlight(object):
+
+    """Run at most one call per key at a time, across coroutines."""
+
+    def __init__(self):
+        """Init method."""
+        self._calls = {}
+
+    async def do(self, key, func, deadline=None):
+        """Return await func(), or the result of the call of key in flight.
+
+        Works as :meth:`pbclient.singleflight.SingleFlight.do`. The call
+        runs in its own task, so cancelling a caller never cancels it for
+        the others.
+        """
+        task = self._calls.get(key)
+        shared = task is not None
+        if not shared:
+            task = self._calls[key] = asyncio.ensure_future(func())
+            task.add_done_callback(lambda done: self._done(key, done))
+        waiter = asyncio.shield(task)
+        if deadline is None:
+            return await waiter, shared
+        try:
+            return await asyncio.wait_for(waiter,
+                                          deadline.remaining()), shared
+        except asyncio.TimeoutError:
+            deadline.check()
+            raise
+
+    def _done(self, key, task):
+        """Forget the finished call of key."""
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        if not task.cancelled():
+            # Mark the error as retrieved when every caller went away.
+            task.exception()
+
+
+class AsyncPyBossaClient(object):
+
+    """asyncio PYBOSSA API client.
+
+    All requests share one aiohttp connection pool, and at most
+    ``concurrency`` of them are in flight at the same time, however many
+    coroutines use the client.
+
+    :param endpoint: PYBOSSA server URL, e.g. ``https://pybossa.com``
+    :type endpoint: string
+    :param api_key: PYBOSSA API key
+    :type api_key: string
+    :param concurrency: Maximum number of concurrent requests, default 10
+    :type concurrency: integer
+    :param settings: the ``retry``, ``rate_limit``, ``timeout``,
+        ``compress``, ``coalesce``, ``codec``, ``accept_encoding``,
+        ``pool_maxsize`` and ``keep_alive`` settings of
+        :meth:`pbclient.PyBossaClient.set`. The ``cache`` and
+        ``conditional`` settings are not supported and raise ValueError.
+
+    Request hooks, the ``*_by_ids`` functions, the bulk updates and
+    deletes, the frames, ``iter_parallel``, ``export`` and
+    ``sync_helping_materials`` are only available in the blocking client.
+
+    """
+
+    def __init__(self, endpoint=None, api_key=None, concurrency=10,
+                 **settings):
+        """Init method."""
+        if aiohttp is None:  # pragma: no cover
+            raise ImportError('pbclient.aio requires aiohttp: '
+                              'pip install pybossa-client[aio]')
+        self.opts = {}
+        for key, val in settings.items():
+            self.set(key, val)
+        if endpoint is not None:
+            self.opts['endpoint'] = endpoint
+        if api_key is not None:
+            self.opts['api_key'] = api_key
+        self.concurrency = concurrency
+        self.stats = dict(STATS_DEFAULTS)
+        self._flight = AsyncSingleFlight()
+        self._semaphore = None
+        self._session = None
+
+    async def __aenter__(self):
+        """Enter a context that closes the client on exit."""
+        return self
+
+    async def __aexit__(self, *exc_info):
+        """Close the client."""
+        await self.close()
+
+    def set(self, key, val):
+        """Set key to value."""
+        if key in UNSUPPORTED_SETTINGS:
+            raise ValueError('setting not supported by the async client: %s'
+                             % key)
+        self.opts[key] = val
+        if key == 'accept_encoding' and self._session is not None:
+            self._session.headers['Accept-Encoding'] = \
+                self._accept_encoding()
+
+    def _setting(self, key):
+        """Return the configured value for a session setting."""
+        return self.opts.get(key, SESSION_DEFAULTS[key])
+
+    # The JSON codec and encoding settings work as in the blocking client.
+    _codec = PyBossaClient._codec
+    _decode = PyBossaClient._decode
+    _accept_encoding = PyBossaClient._accept_encoding
+
+    def _get_session(self):
+        """Return the client HTTP session, creating it on first use."""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self._setting('pool_maxsize'),
+                force_close=not self._setting('keep_alive'))
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                headers={'Accept-Encoding': self._accept_encoding()})
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        return self._session
+
+    async def close(self):
+        """Close the HTTP session and release its pooled connections."""
+        session, self._session = self._session, None
+        if session is not None:
+            await session.close()
+
+    async def _req(self, method, domain, id=None, payload=None, params=None,
+                   headers=None, files=None, deadline=None):
+        """Send a JSON request.
+
+        Returns the decoded JSON answer, True for an empty successful
+        answer, or the error answered by the server. Retries, rate limits,
+        timeouts, deadlines and the ``coalesce`` setting work as in
+        :meth:`pbclient.PyBossaClient._req`.
+        """
+        if method == 'get' and self.opts.get('coalesce'):
+            res, shared = await self._flight.do(
+                request_key(domain, id, params),
+                lambda: self._request(method, domain, id, payload, params,
+                                      headers, files), deadline)
+            if shared:
+                self.stats['coalesced'] += 1
+            return res
+        return await self._request(method, domain, id, payload, params,
+                                   headers, files, deadline)
+
+    async def _request(self, method, domain, id=None, payload=None,
+                       params=None, headers=None, files=None, deadline=None):
+        """Send a JSON request, without coalescing it."""
+        url = self.opts['endpoint'] + '/api/' + domain
+        if id is not None:
+            url += '/' + str(id)
+        params = dict((k, _query_value(v)) for k, v in (params or {}).items())
+        if 'api_key' in self.opts:
+            params['api_key'] = self.opts['api_key']
+        if headers is None:
+            headers = {'content-type': 'application/json'}
+        if isinstance(files, MultipartEncoder):
+            headers = {'Content-Type': files.content_type,
+                       'Content-Length': str(len(files))}
+            data = None
+        elif files is not None:
+            headers = None
+            data = None
+        elif method == 'get':
+            data = None
+        else:
+            data, headers = compress(self._codec().dumps(payload), headers,
+                                     self.opts.get('compress'))
+        retry = self.opts.get('retry', DEFAULT_RETRY)
+        limiter = None
+        if self.opts.get('rate_limit', True):
+            limiter = get_limiter(self.opts['endpoint'],
+                                  self.opts.get('api_key'))
+        timeout = self.opts.get('timeout', DEFAULT_TIMEOUT)
+        attempt = throttled = 0
+        while True:
+            if limiter is not None:
+                await self._wait(limiter.reserve(), 'rate_limit_wait',
+                                 deadline)
+            if deadline is not None:
+                deadline.check()
+                timeout = deadline.cap(timeout)
+            attempt += 1
+            self.stats['requests'] += 1
+            try:
+                if files is not None:
+                    data = _form_data(payload, files)
+                status, body, r_headers = await self._send(
+                    method, url, params, headers, data, timeout)
+            except Exception as e:
+                if retry is None or not retry.should_retry(
+                        method, attempt, exception=_as_requests_error(e)):
+                    raise
+            else:
+                if limiter is not None:
+                    limiter.update(status, r_headers)
+                    if status == 429 and throttled < MAX_THROTTLED:
+                        throttled += 1
+                        attempt -= 1
+                        self.stats['throttled'] += 1
+                        _rewind(files)
+                        continue
+                if retry is None or not retry.should_retry(method, attempt,
+                                                           status=status):
+                    break
+            self.stats['retries'] += 1
+            await self._wait(retry.backoff(attempt), 'retry_wait', deadline)
+            _rewind(files)
+        return self._decode(status, body)
+
+    async def _send(self, method, url, params, headers, data, timeout=None):
+        """Send one HTTP request and return its status, body and headers."""
+        session = self._get_session()
+        async with self._semaphore:
+            async with session.request(method.upper(), url, params=params,
+                                       headers=headers, data=data,
+                                       timeout=_client_timeout(timeout)) as r:
+                return r.status, await r.read(), r.headers
+
+    async def _wait(self, delay, key, deadline=None):
+        """Sleep delay seconds, adding them to the stats counter key."""
+        if deadline is not None and not deadline.allows(delay):
+            raise DeadlineExceeded('deadline of %ss exceeded'
+                                   % deadline.seconds)
+        if delay > 0:
+            self.stats[key] += delay
+            await asyncio.sleep(delay)
+
+    def reset_stats(self):
+        """Reset the stats counters to zero."""
+        self.stats.update(STATS_DEFAULTS)
+
+    async def _iter_pages(self, domain, params=None, page_size=100,
+                          last_id=None, prefetch=0, deadline=None):
+        """Yield the pages of a domain walking keyset pagination.
+
+        With ``prefetch`` the next page is requested before the current one
+        is handed to the caller.
+        """
+        page_size = min(page_size, MAX_PAGE_SIZE)
+        params = dict(params or {})
+        params['limit'] = page_size
+
+        def fetch(last_id):
+            if last_id is not None:
+                params['last_id'] = last_id
+            return self._req('get', domain, params=dict(params),
+                             deadline=deadline)
+
+        pending = asyncio.ensure_future(fetch(last_id))
+        try:
+            while True:
+                page = await pending
+                pending = None
+                if type(page).__name__ != 'list':
+                    raise PyBossaError(page)
+                more = len(page) == page_size
+                if more and prefetch:
+                    pending = asyncio.ensure_future(fetch(page[-1]['id']))
+                if page:
+                    yield page
+                if not more:
+                    return
+                if pending is None:
+                    pending = asyncio.ensure_future(fetch(page[-1]['id']))
+        finally:
+            if pending is not None:
+                pending.cancel()
+
+    async def _iter(self, domain, cls, params=None, page_size=100,
+                    last_id=None, prefetch=0, deadline=None):
+        """Yield the objects of a domain one at a time."""
+        async for page in self._iter_pages(domain, params, page_size,
+                                           last_id, prefetch,
+                                           Deadline.coerce(deadline)):
+            for item in page:
+                yield cls(item)
+
+    # Projects
+
+    async def get_projects(self, limit=100, offset=0, last_id=None):
+        """Return a list of registered projects.
+
+        See :func:`pbclient.get_projects`.
+        """
+        res = await self._req('get', 'project',
+                              params=_page_params(limit, offset, last_id))
+        if type(res).__name__ == 'list':
+            return [Project(project) for project in res]
+        else:
+            raise TypeError
+
+    async def get_project(self, project_id):
+        """Return a PYBOSSA Project for the project_id."""
+        return _object(await self._req('get', 'project', project_id),
+                       Project)
+
+    async def find_project(self, **kwargs):
+        """Return a list with matching project arguments."""
+        return _objects(await self._req('get', 'project', params=kwargs),
+                        Project)
+
+    def iter_projects(self, page_size=100, last_id=None, prefetch=0,
+                      deadline=None, **kwargs):
+        """Iterate asynchronously over all the projects."""
+        return self._iter('project', Project, kwargs, page_size, last_id,
+                          prefetch, deadline)
+
+    async def create_project(self, name, short_name, description):
+        """Create a project."""
+        project = dict(name=name, short_name=short_name,
+                       description=description)
+        return _object(await self._req('post', 'project', payload=project),
+                       Project)
+
+    async def update_project(self, project):
+        """Update a project instance."""
+        project_id = project.id
+        project = _forbidden_attributes(project)
+        res = await self._req('put', 'project', project_id,
+                              payload=project.data)
+        return _object(res, Project)
+
+    async def delete_project(self, project_id):
+        """Delete a Project with id = project_id."""
+        return _deleted(await self._req('delete', 'project', project_id))
+
+    # Category
+
+    async def get_categories(self, limit=20, offset=0, last_id=None):
+        """Return a list of registered categories."""
+        res = await self._req('get', 'category',
+                              params=_page_params(limit, offset, last_id))
+        if type(res).__name__ == 'list':
+            return [Category(category) for category in res]
+        else:
+            raise TypeError
+
+    async def get_category(self, category_id):
+        """Return a PYBOSSA Category for the category_id."""
+        return _object(await self._req('get', 'category', category_id),
+                       Category)
+
+    async def find_category(self, **kwargs):
+        """Return a list with matching Category arguments."""
+        return _objects(await self._req('get', 'category', params=kwargs),
+                        Category)
+
+    def iter_categories(self, page_size=100, last_id=None, prefetch=0,
+                        deadline=None, **kwargs):
+        """Iterate asynchronously over all the categories."""
+        return self._iter('category', Category, kwargs, page_size, last_id,
+                          prefetch, deadline)
+
+    async def create_category(self, name, description):
+        """Create a Category."""
+        category = dict(name=name,
+                        short_name=name.lower().replace(" ", ""),
+                        description=description)
+        return _object(await self._req('post', 'category',
+                                       payload=category), Category)
+
+    async def update_category(self, category):
+        """Update a Category instance."""
+        return _object(await self._req('put', 'category', category.id,
+                                       payload=category.data), Category)
+
+    async def delete_category(self, category_id):
+        """Delete a Category with id = category_id."""
+        return _deleted(await self._req('delete', 'category', category_id))
+
+    # Tasks
+
+    async def get_tasks(self, project_id, limit=100, offset=0, last_id=None):
+        """Return a list of tasks for a given project ID."""
+        params = _page_params(limit, offset, last_id)
+        params['project_id'] = project_id
+        return _objects(await self._req('get', 'task', params=params), Task)
+
+    async def get_task(self, task_id):
+        """Return a PYBOSSA Task for the task_id."""
+        return _object(await self._req('get', 'task', task_id), Task)
+
+    async def find_tasks(self, project_id, **kwargs):
+        """Return a list of matched tasks for a given project ID."""
+        kwargs['project_id'] = project_id
+        return _objects(await self._req('get', 'task', params=kwargs), Task)
+
+    def iter_tasks(self, project_id, page_size=100, last_id=None, prefetch=0,
+                   deadline=None, **kwargs):
+        """Iterate asynchronously over the tasks of a project."""
+        kwargs['project_id'] = project_id
+        return self._iter('task', Task, kwargs, page_size, last_id, prefetch,
+                          deadline)
+
+    async def create_task(self, project_id, info, n_answers=30, priority_0=0,
+                          quorum=0):
+        """Create a task for a given project ID."""
+        task = dict(project_id=project_id, info=info, calibration=0,
+                    priority_0=priority_0, n_answers=n_answers,
+                    quorum=quorum)
+        return _object(await self._req('post', 'task', payload=task), Task)
+
+    def create_tasks(self, project_id, infos, n_answers=30, priority_0=0,
+                     quorum=0, concurrency=8):
+        """Create many tasks concurrently.
+
+        Asynchronously yields an :class:`pbclient.Outcome` per info, in
+        input order. See :meth:`pbclient.PyBossaClient.create_tasks`.
+        """
+        def create(info):
+            return self.create_task(project_id, info, n_answers=n_answers,
+                                    priority_0=priority_0, quorum=quorum)
+        return _bulk(create, infos, concurrency)
+
+    async def update_task(self, task):
+        """Update a task for a given task ID."""
+        task_id = task.id
+        task = _forbidden_attributes(task)
+        return _object(await self._req('put', 'task', task_id,
+                                       payload=task.data), Task)
+
+    async def delete_task(self, task_id):
+        """Delete a task for a given task ID."""
+        return _deleted(await self._req('delete', 'task', task_id))
+
+    # Task Runs
+
+    async def get_taskruns(self, project_id, limit=100, offset=0,
+                           last_id=None):
+        """Return a list of task runs for a given project ID."""
+        params = _page_params(limit, offset, last_id)
+        params['project_id'] = project_id
+        res = await self._req('get', 'taskrun', params=params)
+        if type(res).__name__ == 'list':
+            return [TaskRun(taskrun) for taskrun in res]
+        else:
+            raise TypeError
+
+    async def find_taskruns(self, project_id, **kwargs):
+        """Return a list of matched task runs for a given project ID."""
+        kwargs['project_id'] = project_id
+        return _objects(await self._req('get', 'taskrun', params=kwargs),
+                        TaskRun)
+
+    def iter_taskruns(self, project_id, page_size=100, last_id=None,
+                      prefetch=0, deadline=None, **kwargs):
+        """Iterate asynchronously over the task runs of a project."""
+        kwargs['project_id'] = project_id
+        return self._iter('taskrun', TaskRun, kwargs, page_size, last_id,
+                          prefetch, deadline)
+
+    async def delete_taskrun(self, taskrun_id):
+        """Delete the given taskrun."""
+        return _deleted(await self._req('delete', 'taskrun', taskrun_id))
+
+    # Results
+
+    async def get_results(self, project_id, limit=100, offset=0,
+                          last_id=None):
+        """Return a list of results for a given project ID."""
+        params = _page_params(limit, offset, last_id)
+        params['project_id'] = project_id
+        return _objects(await self._req('get', 'result', params=params),
+                        Result)
+
+    async def find_results(self, project_id, **kwargs):
+        """Return a list of matched results for a given project ID."""
+        kwargs['project_id'] = project_id
+        return _objects(await self._req('get', 'result', params=kwargs),
+                        Result)
+
+    def iter_results(self, project_id, page_size=100, last_id=None,
+                     prefetch=0, deadline=None, **kwargs):
+        """Iterate asynchronously over the results of a project."""
+        kwargs['project_id'] = project_id
+        return self._iter('result', Result, kwargs, page_size, last_id,
+                          prefetch, deadline)
+
+    async def update_result(self, result):
+        """Update a result for a given result ID."""
+        result_id = result.id
+        result = _forbidden_attributes(result)
+        return _object(await self._req('put', 'result', result_id,
+                                       payload=result.data), Result)
+
+    # Helping Material
+
+    async def create_helpingmaterial(self, project_id, info, media_url=None,
+                                     file_path=None, progress=None):
+        """Create a helping material for a given project ID."""
+        if file_path:
+            with MultipartEncoder({'project_id': project_id},
+                                  {'file': file_path}, progress) as body:
+                res = await self._req('post', 'helpingmaterial', files=body)
+        else:
+            helping = dict(project_id=project_id, info=info, media_url=None)
+            res = await self._req('post', 'helpingmaterial', payload=helping)
+        return _object(res, HelpingMaterial)
+
+    async def get_helping_materials(self, project_id, limit=100, offset=0,
+                                    last_id=None):
+        """Return a list of helping materials for a given project ID."""
+        params = _page_params(limit, offset, last_id)
+        params['project_id'] = project_id
+        return _objects(await self._req('get', 'helpingmaterial',
+                                        params=params), HelpingMaterial)
+
+    async def find_helping_materials(self, project_id, **kwargs):
+        """Return a list of matched helping materials for a project ID."""
+        kwargs['project_id'] = project_id
+        return _objects(await self._req('get', 'helpingmaterial',
+                                        params=kwargs), HelpingMaterial)
+
+    def iter_helping_materials(self, project_id, page_size=100, last_id=None,
+                               prefetch=0, deadline=None, **kwargs):
+        """Iterate asynchronously over the helping materials of a project."""
+        kwargs['project_id'] = project_id
+        return self._iter('helpingmaterial', HelpingMaterial, kwargs,
+                          page_size, last_id, prefetch, deadline)
+
+    async def update_helping_material(self, helpingmaterial):
+        """Update a helping material for a given helping material ID."""
+        helpingmaterial_id = helpingmaterial.id
+        helpingmaterial = _forbidden_attributes(helpingmaterial)
+        return _object(await self._req('put', 'helpingmaterial',
+                                       helpingmaterial_id,
+                                       payload=helpingmaterial.data),
+                       HelpingMaterial)
+
+
+def _query_value(value):
+    """Return value as accepted by aiohttp in a query string."""
+    if isinstance(value, bool):
+        return str(value)
+    return value
@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+"""In-process caches of the PYBOSSA answers.
+
+~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+:license: MIT
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+
+from pbclient.timeouts import _clock
+
+
+class TTLCache(object):
+
+    """Thread safe LRU cache whose entries expire after ttl seconds.
+
+    The clients store the JSON answer of ``get_project``, ``get_category``
+    and ``get_task`` under ``(domain, id)``, and drop it when they update or
+    delete that object. ``hits``, ``misses`` and ``evictions`` count the
+    lookups answered from the cache, the lookups that were not, and the
+    entries dropped to stay under ``maxsize``.
+
+    :param maxsize: Maximum number of entries, default 1024
+    :type maxsize: integer
+    :param ttl: Seconds an entry is used for, default 60
+    :type ttl: float
+
+    """
+
+    def __init__(self, maxsize=1024, ttl=60):
+        """Init method."""
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._data = OrderedDict()
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        """Return the number of entries."""
+        return len(self._data)
+
+    def get(self, key):
+        """Return the value of key, or None if missing or expired."""
+        with self._lock:
+            entry = self._data.pop(key, None)
+            if entry is not None and entry[0] > _clock():
+                self._data[key] = entry
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+            return None
+
+    def generation(self):
+        """Return a stamp to pass to :meth:`set`.
+
+        Take it before reading the value from the server, so a value read
+        while the object was being changed is not stored.
+        """
+        return self._generation
+
+    def set(self, key, value, generation=None):
+        """Store value under key, unless an invalidation happened since
+        generation was taken."""
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+            self._data.pop(key, None)
+            self._data[key] = (_clock() + self.ttl, value)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key):
+        """Drop the entry of key."""
+        with self._lock:
+            self._generation += 1
+            self._data.pop(key, None)
+
+    def clear(self):
+        """Drop every entry."""
+        with self._lock:
+            self._generation += 1
+            self._data.clear()
+
+    def __repr__(self):  # pragma: no cover
+        """Return representation."""
+        return ('pybossa.TTLCache(%d entries, %d hits, %d misses)'
+                % (len(self._data), self.hits, self.misses))
+
+
+class ConditionalCache(TTLCache):
+
+    """LRU cache of GET answers, revalidated with the server.
+
+    Every answer is stored decoded, with its ``ETag`` and ``Last-Modified``
+    validators and a hash of its body. Later GETs of the same URL and
+    parameters send ``If-None-Match`` and ``If-Modified-Since``, and a 304
+    answer is served from the cache. When the server sends no validators, a
+    body with the same hash as the stored one is not decoded again.
+    ``not_modified`` and ``unchanged`` count the answers served either way.
+
+    The cached answers are shared between callers, so do not modify them.
+
+    :param maxsize: Maximum number of entries, default 256
+    :type maxsize: integer
+    :param ttl: Seconds an entry is revalidated for, default forever
+    :type ttl: float
+
+    """
+
+    def __init__(self, maxsize=256, ttl=float('inf')):
+        """Init method."""
+        TTLCache.__init__(self, maxsize, ttl)
+        self.not_modified = 0
+        self.unchanged = 0
+
+    @staticmethod
+    def key(url, params):
+        """Return the cache key of a GET request."""
+        return url, tuple(sorted((k, str(v)) for k, v in params.items()))
+
+    @staticmethod
+    def headers(entry):
+        """Return the conditional headers revalidating entry."""
+        headers = {}
+        if entry is not None:
+            if entry[0]:
+                headers['If-None-Match'] = entry[0]
+            if entry[1]:
+                headers['If-Modified-Since'] = entry[1]
+        return headers
+
+    def answer(self, key, entry, status_code, headers, body, decode):
+        """Return the decoded answer of a GET, reusing entry if unchanged.
+
+        :param decode: Function decoding a status code and body
+        """
+        if status_code == 304 and entry is not None:
+            with self._lock:
+                self.not_modified += 1
+            return entry[3]
+        if status_code != 200:
+            return decode(status_code, body)
+        digest = hashlib.sha1(body).digest()
+        if entry is not None and entry[2] == digest:
+            with self._lock:
+                self.unchanged += 1
+            value = entry[3]
+        else:
+            value = decode(status_code, body)
+        self.set(key, (headers.get('ETag'), headers.get('Last-Modified'),
+                       digest, value))
+        return value
@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+"""JSON codecs used to encode the requests and decode the answers.
+
+~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+The answers are decoded straight from the raw body bytes. `orjson
+<https://github.com/ijl/orjson>`_ or `ujson
+<https://github.com/ultrajson/ultrajson>`_ are used when installed, which
+parse large pages several times faster than the standard library.
+
+Large request bodies can be gzipped with :func:`compress`.
+
+:license: MIT
+"""
+
+import json
+import zlib
+
+
+class JSONCodec(object):
+
+    """Standard library JSON codec."""
+
+    name = 'json'
+
+    def loads(self, data):
+        """Decode a JSON document from bytes or str."""
+        if isinstance(data, bytes):
+            data = data.decode('utf-8')
+        return json.loads(data)
+
+    def dumps(self, obj):
+        """Encode obj as JSON bytes."""
+        return json.dumps(obj).encode('utf-8')
+
+
+class OrjsonCodec(JSONCodec):
+
+    """orjson codec."""
+
+    name = 'orjson'
+
+    def __init__(self):
+        """Init method."""
+        import orjson
+        self._orjson = orjson
+
+    def loads(self, data):
+        """Decode a JSON document from bytes or str."""
+        return self._orjson.loads(data)
+
+    def dumps(self, obj):
+        """Encode obj as JSON bytes.
+
+        Objects orjson rejects, such as integers larger than 64 bits, are
+        encoded by the standard library.
+        """
+        try:
+            return self._orjson.dumps(obj,
+                                      option=self._orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            return JSONCodec.dumps(self, obj)
+
+
+class UjsonCodec(JSONCodec):
+
+    """ujson codec."""
+
+    name = 'ujson'
+
+    def __init__(self):
+        """Init method."""
+        import ujson
+        self._ujson = ujson
+
+    def loads(self, data):
+        """Decode a JSON document from bytes or str."""
+        return self._ujson.loads(data)
+
+    def dumps(self, obj):
+        """Encode obj as JSON bytes.
+
+        Integers too large for ujson are encoded by the standard library.
+        """
+        try:
+            return self._ujson.dumps(obj, ensure_ascii=False).encode('utf-8')
+        except OverflowError:
+            return JSONCodec.dumps(self, obj)
+
+
+CODECS = dict(orjson=OrjsonCodec, ujson=UjsonCodec, json=JSONCodec)
+
+#: Codecs tried, in order, when no codec is configured.
+PREFERENCE = ('orjson', 'ujson', 'json')
+
+_codecs = {}
+
+
+def get_codec(name=None):
+    """Return the codec called name, or the fastest one installed.
+
+    :param name: ``orjson``, ``ujson`` or ``json``; by default the first of
+        them that can be imported
+    :type name: string
+    """
+    if name is None:
+        for name in PREFERENCE:
+            try:
+                return get_codec(name)
+            except ImportError:
+                continue
+    codec = _codecs.get(name)
+    if codec is None:
+        codec = _codecs[name] = CODECS[name]()
+    return codec
+
+
+#: Minimum size in bytes of the bodies gzipped when the ``compress`` setting
+#: is True.
+COMPRESS_THRESHOLD = 1024
+
+#: ``Accept-Encoding`` sent by default: the encodings decoded while the
+#: answer is read.
+ACCEPT_ENCODING = 'gzip, deflate'
+
+
+def compress(body, headers, threshold, level=6):
+    """Return body and headers, gzipped if body has threshold bytes or more.
+
+    :param body: Encoded request body
+    :type body: bytes
+    :param headers: Request headers, not modified
+    :type headers: dict
+    :param threshold: Minimum size in bytes to compress, True for
+        ``COMPRESS_THRESHOLD``, or None to never compress
+    :type threshold: integer
+    :param level: gzip compression level, default 6
+    :type level: integer
+    """
+    if threshold is True:
+        threshold = COMPRESS_THRESHOLD
+    if threshold is None or threshold is False or len(body) < threshold:
+        return body, headers
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    body = compressor.compress(body) + compressor.flush()
+    headers = dict(headers)
+    headers['Content-Encoding'] = 'gzip'
+    return body, headers
@@ -0,0 +1,188 @@
+# -*- coding: utf-8 -*-
+"""Streaming export of PYBOSSA objects to NDJSON and CSV files.
+
+~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+The pages are written to disk as they arrive, through a large write buffer
+and an optional gzip or `zstd <https://pypi.org/project/zstandard/>`_
+compressor, so the memory used does not depend on the size of the project.
+The file is written under a temporary name and renamed once complete.
+
+:license: MIT
+"""
+
+import csv
+import gzip
+import io
+import json
+import os
+import time
+
+from pbclient.frames import _get, _paths
+
+#: Supported export formats.
+FORMATS = ('ndjson', 'csv')
+
+#: Supported compressions, and the file extensions they are inferred from.
+COMPRESSIONS = {'gzip': '.gz', 'zstd': '.zst'}
+
+#: Size in bytes of the write buffer.
+BUFFER_SIZE = 1 << 20
+
+
+def _dumps(obj):
+    return json.dumps(obj).encode('utf-8')
+
+
+def infer_compression(path):
+    """Return the compression matching the extension of path, or None."""
+    for compression, extension in COMPRESSIONS.items():
+        if path.endswith(extension):
+            return compression
+    return None
+
+
+def open_output(path, compression=None, buffer_size=BUFFER_SIZE):
+    """Open path for buffered binary writing, compressing the data.
+
+    :param path: Path of the file
+    :type path: string
+    :param compression: ``gzip``, ``zstd`` or None
+    :type compression: string
+    :param buffer_size: Size in bytes of the write buffer
+    :type buffer_size: integer
+    """
+    if compression is None:
+        return open(path, 'wb', buffering=buffer_size)
+    if compression == 'gzip':
+        return io.BufferedWriter(gzip.open(path, 'wb', compresslevel=6),
+                                 buffer_size)
+    if compression == 'zstd':
+        import zstandard
+        raw = open(path, 'wb')
+        try:
+            writer = zstandard.ZstdCompressor().stream_writer(raw)
+        except:  # pragma: no cover
+            raw.close()
+            raise
+        return io.BufferedWriter(writer, buffer_size)
+    raise ValueError('unknown compression: %s' % compression)
+
+
+class ExportResult(object):
+
+    """Summary of an export.
+
+    :param path: Path of the exported file
+    :type path: string
+    :param rows: Number of rows written
+    :type rows: integer
+    :param elapsed: Duration of the export in seconds
+    :type elapsed: float
+
+    """
+
+    def __init__(self, path, rows, elapsed):
+        """Init method."""
+        self.path = path
+        self.rows = rows
+        self.elapsed = elapsed
+
+    @property
+    def throughput(self):
+        """Return the rows written per second."""
+        if not self.elapsed:
+            return 0.0
+        return self.rows / self.elapsed
+
+    def __repr__(self):  # pragma: no cover
+        """Return representation."""
+        return ('pybossa.ExportResult(%r, rows=%d, %.1f rows/s)'
+                % (self.path, self.rows, self.throughput))
+
+
+def write_ndjson(pages, out, dumps=_dumps):
+    """Write every object of pages as one JSON line, return the count."""
+    rows = 0
+    for page in pages:
+        if page:
+            out.write(b'\n'.join([dumps(row) for row in page]) + b'\n')
+            rows += len(page)
+    return rows
+
+
+def write_csv(pages, out, fields=None, dumps=_dumps):
+    """Write every object of pages as a CSV row, return the count.
+
+    The columns are the dotted ``fields``, by default every field of the
+    first page with the ``info`` objects flattened. Lists and objects are
+    written as JSON.
+    """
+    text = io.TextIOWrapper(out, encoding='utf-8', newline='')
+    writer = csv.writer(text)
+    paths = None
+    rows = 0
+    for page in pages:
+        if paths is None:
+            if fields is None:
+                paths = []
+                for row in page:
+                    for path in _paths(row):
+                        if path not in paths:
+                            paths.append(path)
+                fields = ['.'.join(path) for path in paths]
+            else:
+                paths = [tuple(field.split('.')) for field in fields]
+            writer.writerow(fields)
+        for row in page:
+            values = []
+            for path in paths:
+                value = _get(row, path)
+                if value is None:
+                    value = ''
+                elif isinstance(value, (dict, list)):
+                    value = dumps(value).decode('utf-8')
+                values.append(value)
+            writer.writerow(values)
+        rows += len(page)
+    text.flush()
+    text.detach()
+    return rows
+
+
+def export_pages(pages, path, format='ndjson', compression=None,
+                 fields=None, dumps=_dumps):
+    """Stream pages of objects to the file path.
+
+    :param pages: Iterable of lists of raw objects
+    :param path: Path of the file to write
+    :type path: string
+    :param format: ``ndjson`` or ``csv``, default ``ndjson``
+    :type format: string
+    :param compression: ``gzip``, ``zstd`` or None; by default inferred
+        from the ``.gz`` or ``.zst`` extension of path
+    :type compression: string
+    :param fields: Columns of a CSV export
+    :type fields: list of strings
+    :param dumps: Function encoding an object as JSON bytes
+    :rtype: ExportResult
+    """
+    if format not in FORMATS:
+        raise ValueError('unknown format: %s' % format)
+    if compression is None:
+        compression = infer_compression(path)
+    started = time.time()
+    tmp = path + '.part'
+    out = open_output(tmp, compression)
+    try:
+        if format == 'csv':
+            rows = write_csv(pages, out, fields, dumps)
+        else:
+            rows = write_ndjson(pages, out, dumps)
+        out.close()
+    except:
+        out.close()
+        os.remove(tmp)
+        raise
+    getattr(os, 'replace', os.rename)(tmp, path)
+    return ExportResult(path, rows, time.time() - started)
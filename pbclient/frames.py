@@ -0,0 +1,212 @@
+# -*- coding: utf-8 -*-
+"""Columnar tables of PYBOSSA objects for NumPy and pandas.
+
+~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+The pages answered by the server are appended column by column to typed
+buffers, and then handed to `NumPy <https://numpy.org>`_ as whole arrays, or
+to `pandas <https://pandas.pydata.org>`_ as a DataFrame. No domain object is
+built and every page is dropped once it is stored.
+
+The nested ``info`` objects are flattened into dotted columns, such as
+``info.answer``. The columns and their types are inferred once, from the
+first page; a column falls back to a wider type when a later value does not
+fit, and ints with missing values become floats with NaN.
+
+:license: MIT
+"""
+
+from array import array
+
+#: Type codes of the column buffers, from the narrowest to the widest.
+BOOL, INT, FLOAT, OBJECT = 'b', 'q', 'd', 'O'
+
+_NUMBERS = {BOOL: (bool,), INT: (bool, int), FLOAT: (bool, int, float)}
+
+
+def _kind(values):
+    """Return the narrowest column type holding all the values."""
+    kinds = set()
+    for value in values:
+        if value is None:
+            continue
+        if type(value) is bool:
+            kinds.add(BOOL)
+        elif type(value) is int:
+            kinds.add(INT)
+        elif type(value) is float:
+            kinds.add(FLOAT)
+        else:
+            return OBJECT
+    if not kinds:
+        return OBJECT
+    if len(kinds) == 1:
+        return kinds.pop()
+    return FLOAT if BOOL not in kinds else OBJECT
+
+
+def _paths(row, prefix=()):
+    """Yield the path of every leaf value of row, flattening dicts."""
+    for key, value in row.items():
+        if isinstance(value, dict) and value:
+            for path in _paths(value, prefix + (key,)):
+                yield path
+        else:
+            yield prefix + (key,)
+
+
+def _get(row, path):
+    """Return the value at path in row, or None."""
+    for key in path:
+        if not isinstance(row, dict):
+            return None
+        row = row.get(key)
+    return row
+
+
+class Column(object):
+
+    """Typed buffer of the values of one column.
+
+    :param path: Keys leading to the value in each row
+    :type path: tuple
+    :param kind: ``BOOL``, ``INT``, ``FLOAT`` or ``OBJECT``
+    :type kind: string
+
+    """
+
+    __slots__ = ('path', 'kind', 'values', 'missing')
+
+    def __init__(self, path, kind):
+        """Init method."""
+        self.path = path
+        self.kind = kind
+        self.values = [] if kind == OBJECT else array(kind)
+        self.missing = []
+
+    def extend(self, page):
+        """Append the values of the rows of page."""
+        path, values, missing = self.path, self.values, self.missing
+        for row in page:
+            value = _get(row, path)
+            if self.kind == OBJECT:
+                values.append(value)
+            elif value is None:
+                missing.append(len(values))
+                values.append(0)
+            elif type(value) in _NUMBERS[self.kind]:
+                try:
+                    values.append(value)
+                except OverflowError:
+                    self._widen(OBJECT)
+                    values = self.values
+                    values.append(value)
+            else:
+                self._widen(_kind([value]))
+                values = self.values
+                values.append(value)
+
+    def _widen(self, kind):
+        """Move the values to a buffer also holding values of type kind."""
+        if self.kind == INT and kind == FLOAT:
+            self.values = array(FLOAT, self.values)
+            self.kind = FLOAT
+            return
+        values = self.values.tolist()
+        if self.kind == BOOL:
+            values = [bool(value) for value in values]
+        for index in self.missing:
+            values[index] = None
+        self.values, self.missing, self.kind = values, [], OBJECT
+
+    def to_numpy(self):
+        """Return the column as a NumPy array."""
+        import numpy
+        if self.kind == OBJECT:
+            result = numpy.empty(len(self.values), dtype=object)
+            for index, value in enumerate(self.values):
+                result[index] = value
+            return result
+        result = numpy.frombuffer(self.values, dtype=self.kind).copy()
+        if self.kind == BOOL:
+            result = result.astype(bool)
+        if not self.missing:
+            return result
+        if self.kind == BOOL:
+            result = result.astype(object)
+            result[self.missing] = None
+            return result
+        result = result.astype(float)
+        result[self.missing] = numpy.nan
+        return result
+
+
+class Columns(object):
+
+    """Columnar buffers filled page by page.
+
+    :param fields: Names of the columns, using dots for nested keys such as
+        ``info.answer``; by default every field of the first page
+    :type fields: list of strings
+
+    """
+
+    def __init__(self, fields=None):
+        """Init method."""
+        self.fields = fields
+        self.columns = None
+        self.rows = 0
+
+    def _infer(self, page):
+        if self.fields is None:
+            paths = []
+            seen = set()
+            for row in page:
+                for path in _paths(row):
+                    if path not in seen:
+                        seen.add(path)
+                        paths.append(path)
+            self.fields = ['.'.join(path) for path in paths]
+        else:
+            paths = [tuple(field.split('.')) for field in self.fields]
+        self.columns = [Column(path, _kind(_get(row, path) for row in page))
+                        for path in paths]
+
+    def extend(self, page):
+        """Append the rows of page to the columns."""
+        if self.columns is None:
+            self._infer(page)
+        for column in self.columns:
+            column.extend(page)
+        self.rows += len(page)
+
+    def to_numpy(self):
+        """Return a dict mapping every field to a NumPy array."""
+        import numpy  # noqa: F401
+        return dict((field, column.to_numpy())
+                    for field, column in zip(self.fields or [],
+                                             self.columns or []))
+
+    def to_frame(self):
+        """Return the columns as a pandas DataFrame."""
+        import pandas
+        return pandas.DataFrame(self.to_numpy(), columns=self.fields)
+
+
+def build_frame(pages, fields=None, as_frame=True):
+    """Return the rows of pages as a DataFrame or a dict of NumPy arrays.
+
+    :param pages: Iterable of lists of raw objects
+    :param fields: Names of the columns, using dots for nested keys such as
+        ``info.answer``; by default every field of the first page
+    :type fields: list of strings
+    :param as_frame: Return a pandas DataFrame, default True, or a dict of
+        NumPy arrays
+    :type as_frame: boolean
+    """
+    columns = Columns(fields)
+    for page in pages:
+        columns.extend(page)
+    if as_frame:
+        return columns.to_frame()
+    return columns.to_numpy()
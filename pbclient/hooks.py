@@ -0,0 +1,224 @@
+# -*- coding: utf-8 -*-
+"""Instrumentation hooks called around every request.
+
+~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+Register a :class:`RequestHook` with :func:`pbclient.add_hook` to be told
+about every attempt of every request: ``before_request`` is called before it
+is sent, and ``after_request`` once it is answered or failed, with a
+:class:`RequestInfo` holding the status, the bytes sent and received and
+where the time went. Reads served by a cache are reported too, with no time
+spent on the network.
+
+When no hook is registered, the request path only checks that the list of
+hooks is empty.
+
+:license: MIT
+"""
+
+import threading
+
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+from pbclient.timeouts import _clock
+
+#: Values of :attr:`RequestInfo.cached`.
+CACHE, NOT_MODIFIED, UNCHANGED, COALESCED = (
+    'cache', 'not_modified', 'unchanged', 'coalesced')
+
+_connect = threading.local()
+
+
+class RequestHook(object):
+
+    """Base class of the hooks, doing nothing.
+
+    The hooks are called on the thread sending the request, so they must be
+    thread safe when the client is shared between threads.
+    """
+
+    def before_request(self, info):
+        """Called before an attempt is sent, with the method, domain, id and
+        attempt of info set."""
+
+    def after_request(self, info):
+        """Called once an attempt is answered or failed, or a read is served
+        from a cache."""
+
+
+class RequestInfo(object):
+
+    """One attempt of a request, as seen by the hooks.
+
+    The durations are in seconds:
+
+    * ``connect``: resolving the host name and opening the TCP and TLS
+      connection, 0 when a pooled connection is reused;
+    * ``server``: from sending the request to receiving the headers of the
+      answer;
+    * ``transfer``: reading the body of the answer;
+    * ``decode``: decoding the JSON body;
+    * ``elapsed``: the whole attempt.
+
+    ``cached`` tells how a cache served the read: ``cache`` for the
+    ``cache`` setting, ``not_modified`` and ``unchanged`` for the
+    ``conditional`` setting, ``coalesced`` for an identical GET in flight,
+    or None.
+
+    """
+
+    __slots__ = ('method', 'domain', 'id', 'attempt', 'status_code',
+                 'bytes_sent', 'bytes_received', 'connect', 'server',
+                 'transfer', 'decode', 'elapsed', 'cached', 'error',
+                 '_started')
+
+    def __init__(self, method, domain, id=None, attempt=1):
+        """Init method."""
+        self.method = method
+        self.domain = domain
+        self.id = id
+        self.attempt = attempt
+        self.status_code = None
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.connect = 0.0
+        self.server = 0.0
+        self.transfer = 0.0
+        self.decode = 0.0
+        self.elapsed = 0.0
+        self.cached = None
+        self.error = None
+        self._started = _clock()
+
+    def __repr__(self):  # pragma: no cover
+        """Return representation."""
+        return ('pybossa.RequestInfo(%s %s %s, attempt %d, status %s, '
+                '%.1f ms)' % (self.method.upper(), self.domain, self.id,
+                              self.attempt, self.status_code,
+                              self.elapsed * 1000))
+
+
+def _body_size(body):
+    if body is None:
+        return 0
+    try:
+        return len(body)
+    except TypeError:  # pragma: no cover
+        return 0
+
+
+class Trace(object):
+
+    """Report the attempts of one request to the hooks."""
+
+    __slots__ = ('hooks', 'method', 'domain', 'id', 'info')
+
+    def __init__(self, hooks, method, domain, id=None):
+        """Init method."""
+        self.hooks = hooks
+        self.method = method
+        self.domain = domain
+        self.id = id
+        self.info = None
+
+    def start(self, attempt):
+        """Report the start of an attempt."""
+        self.finish()
+        info = self.info = RequestInfo(self.method, self.domain, self.id,
+                                       attempt)
+        for hook in self.hooks:
+            hook.before_request(info)
+        _connect.seconds = 0.0
+        info._started = _clock()
+
+    def response(self, r):
+        """Record the answer r of the attempt."""
+        info = self.info
+        info.status_code = r.status_code
+        info.bytes_received = len(r.content or b'')
+        request = getattr(r, 'request', None)
+        info.bytes_sent = _body_size(getattr(request, 'body', None))
+        info.connect = getattr(_connect, 'seconds', 0.0)
+        total = _clock() - info._started
+        elapsed = getattr(r, 'elapsed', None)
+        if hasattr(elapsed, 'total_seconds'):
+            headers = min(elapsed.total_seconds(), total)
+            info.transfer = total - headers
+        else:
+            headers = total
+        info.server = max(headers - info.connect, 0.0)
+
+    def fail(self, error):
+        """Report the failure of the attempt."""
+        self.info.error = error
+        self.info.connect = getattr(_connect, 'seconds', 0.0)
+        self.finish()
+
+    def finish(self, decode=0.0, cached=None):
+        """Report the end of the attempt, if not done yet."""
+        info, self.info = self.info, None
+        if info is None:
+            return
+        info.decode = decode
+        info.cached = cached
+        info.elapsed = _clock() - info._started
+        for hook in self.hooks:
+            hook.after_request(info)
+
+    def served(self, cached, status_code=200):
+        """Report a read served without sending it."""
+        self.start(0)
+        self.info.status_code = status_code
+        self.finish(cached=cached)
+
+
+class TimedHTTPConnection(HTTPConnection):
+
+    """Connection recording the time spent connecting."""
+
+    def connect(self):
+        """Connect, adding the time spent to the thread's counter."""
+        started = _clock()
+        try:
+            HTTPConnection.connect(self)
+        finally:
+            _connect.seconds = (getattr(_connect, 'seconds', 0.0) +
+                                _clock() - started)
+
+
+class TimedHTTPSConnection(HTTPSConnection):
+
+    """TLS connection recording the time spent connecting."""
+
+    def connect(self):
+        """Connect, adding the time spent to the thread's counter."""
+        started = _clock()
+        try:
+            HTTPSConnection.connect(self)
+        finally:
+            _connect.seconds = (getattr(_connect, 'seconds', 0.0) +
+                                _clock() - started)
+
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+
+    ConnectionCls = TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+
+    ConnectionCls = TimedHTTPSConnection
+
+
+class TimedAdapter(HTTPAdapter):
+
+    """Transport adapter whose connections record their connect time."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        """Create the pool manager with timed connection pools."""
+        HTTPAdapter.init_poolmanager(self, *args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': _TimedHTTPConnectionPool,
+            'https': _TimedHTTPSConnectionPool}
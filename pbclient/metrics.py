@@ -0,0 +1,286 @@
+# -*- coding: utf-8 -*-
+"""Request metrics aggregated by the client.
+
+~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+A :class:`Metrics` registry is a request hook counting the requests, errors,
+cached reads and bytes per domain and method, and recording their latency in
+log-bucketed histograms::
+
+    >>> metrics = pbclient.add_hook(pbclient.Metrics())
+    >>> metrics.snapshot()['latency']['task']['get']['p95']
+    >>> metrics.write_prometheus('/var/lib/node_exporter/pbclient.prom')
+
+The Prometheus text format needs no extra dependency, and the file is
+replaced atomically, as the node exporter textfile collector expects.
+
+:license: MIT
+"""
+
+import math
+import os
+import threading
+
+from pbclient.hooks import RequestHook
+
+#: Upper bound in seconds of the first latency bucket.
+MIN_LATENCY = 0.0001
+
+#: Buckets per doubling of the latency; each one is about 19% wide.
+SUB_BUCKETS = 4
+
+#: Number of doublings exported as Prometheus buckets, up to about 105s.
+EXPORTED_DOUBLINGS = 20
+
+#: Percentiles reported by :meth:`Histogram.summary`.
+PERCENTILES = (('p50', 0.5), ('p95', 0.95), ('p99', 0.99))
+
+_SCALE = SUB_BUCKETS / math.log(2)
+
+
+class Histogram(object):
+
+    """Log-bucketed histogram of durations in seconds.
+
+    Recording a value costs a logarithm and a dict update, whatever the
+    number of values recorded. Bucket ``i`` counts the values up to
+    ``MIN_LATENCY * 2 ** (i / SUB_BUCKETS)``, so the percentiles are exact
+    within about 19%.
+
+    """
+
+    __slots__ = ('buckets', 'count', 'sum', 'min', 'max')
+
+    def __init__(self):
+        """Init method."""
+        self.buckets = {}
+        self.count = 0
+        self.sum = 0.0
+        self.min = None
+        self.max = None
+
+    @staticmethod
+    def bucket(value):
+        """Return the index of the bucket of value."""
+        if value <= MIN_LATENCY:
+            return 0
+        return int(math.ceil(math.log(value / MIN_LATENCY) * _SCALE - 1e-9))
+
+    @staticmethod
+    def upper(index):
+        """Return the upper bound of the bucket index."""
+        return MIN_LATENCY * 2 ** (float(index) / SUB_BUCKETS)
+
+    def record(self, value):
+        """Add a value."""
+        index = self.bucket(value)
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+        self.count += 1
+        self.sum += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def percentile(self, q):
+        """Return the upper bound of the bucket holding the q quantile."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                return min(self.upper(index), self.max)
+        return self.max  # pragma: no cover
+
+    def cumulative(self, bounds):
+        """Return the number of values up to each bucket index of bounds."""
+        counts = []
+        indexes = sorted(self.buckets)
+        position = seen = 0
+        for bound in bounds:
+            while position < len(indexes) and indexes[position] <= bound:
+                seen += self.buckets[indexes[position]]
+                position += 1
+            counts.append(seen)
+        return counts
+
+    def summary(self):
+        """Return the count, sum, min, max and percentiles as a dict."""
+        summary = dict(count=self.count, sum=self.sum, min=self.min,
+                       max=self.max)
+        for name, q in PERCENTILES:
+            summary[name] = self.percentile(q)
+        return summary
+
+
+def _nested(counters):
+    """Return a dict of counters keyed by tuples as nested dicts."""
+    result = {}
+    for key, value in counters.items():
+        node = result
+        for part in key[:-1]:
+            node = node.setdefault(part, {})
+        node[key[-1]] = value
+    return result
+
+
+def _escape(value):
+    return (str(value).replace('\\', '\\\\').replace('"', '\\"')
+            .replace('\n', '\\n'))
+
+
+def _labels(names, values, extra=''):
+    labels = ['%s="%s"' % (name, _escape(value))
+              for name, value in zip(names, values)]
+    if extra:
+        labels.append(extra)
+    return '{' + ','.join(labels) + '}'
+
+
+def _number(value):
+    if value == int(value) and abs(value) < 1e15:
+        return str(int(value))
+    return repr(float(value))
+
+
+class Metrics(RequestHook):
+
+    """Registry of the metrics of the requests of a client.
+
+    Add it with :func:`pbclient.add_hook`. It counts:
+
+    * ``requests``: the attempts sent, by domain and method;
+    * ``errors``: the attempts answered with a 4xx or 5xx status, or failed
+      with an exception, by domain, method and status code or exception
+      name;
+    * ``cached``: the reads served without reaching the server, by domain,
+      method and cache;
+    * ``bytes_sent`` and ``bytes_received``, by domain and method;
+    * ``latency``: the duration of the attempts, by domain and method.
+
+    """
+
+    def __init__(self):
+        """Init method."""
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Drop every metric."""
+        with self._lock:
+            self._requests = {}
+            self._errors = {}
+            self._cached = {}
+            self._sent = {}
+            self._received = {}
+            self._latency = {}
+
+    def after_request(self, info):
+        """Record a request attempt."""
+        key = (info.domain, info.method)
+        with self._lock:
+            if info.cached is not None:
+                ckey = key + (info.cached,)
+                self._cached[ckey] = self._cached.get(ckey, 0) + 1
+                return
+            self._requests[key] = self._requests.get(key, 0) + 1
+            if info.error is not None:
+                ekey = key + (type(info.error).__name__,)
+            elif info.status_code >= 400:
+                ekey = key + (str(info.status_code),)
+            else:
+                ekey = None
+            if ekey is not None:
+                self._errors[ekey] = self._errors.get(ekey, 0) + 1
+            self._sent[key] = self._sent.get(key, 0) + info.bytes_sent
+            self._received[key] = (self._received.get(key, 0) +
+                                    info.bytes_received)
+            histogram = self._latency.get(key)
+            if histogram is None:
+                histogram = self._latency[key] = Histogram()
+            histogram.record(info.elapsed)
+
+    def snapshot(self):
+        """Return the metrics as nested dicts.
+
+        The counters are keyed by domain, then method, then status or cache
+        for ``errors`` and ``cached``. ``latency`` holds the count, sum, min,
+        max, p50, p95 and p99 in seconds of every domain and method.
+        """
+        with self._lock:
+            return dict(
+                requests=_nested(self._requests),
+                errors=_nested(self._errors),
+                cached=_nested(self._cached),
+                bytes_sent=_nested(self._sent),
+                bytes_received=_nested(self._received),
+                latency=_nested(dict((key, histogram.summary())
+                                     for key, histogram
+                                     in self._latency.items())))
+
+    def to_prometheus(self, prefix='pybossa_client'):
+        """Return the metrics in the Prometheus text exposition format.
+
+        :param prefix: Prefix of the metric names
+        :type prefix: string
+        :rtype: string
+        """
+        lines = []
+
+        def counter(name, help, counters, names):
+            name = prefix + '_' + name
+            lines.append('# HELP %s %s' % (name, help))
+            lines.append('# TYPE %s counter' % name)
+            for key in sorted(counters):
+                lines.append('%s%s %s' % (name, _labels(names, key),
+                                          _number(counters[key])))
+
+        with self._lock:
+            counter('requests_total', 'Requests sent.', self._requests,
+                    ('domain', 'method'))
+            counter('errors_total', 'Requests answered with an error or '
+                    'failed.', self._errors, ('domain', 'method', 'status'))
+            counter('cached_total', 'Reads served from a cache.',
+                    self._cached, ('domain', 'method', 'cache'))
+            counter('sent_bytes_total', 'Request body bytes sent.',
+                    self._sent, ('domain', 'method'))
+            counter('received_bytes_total', 'Answer body bytes received.',
+                    self._received, ('domain', 'method'))
+            name = prefix + '_request_duration_seconds'
+            lines.append('# HELP %s Duration of the requests.' % name)
+            lines.append('# TYPE %s histogram' % name)
+            bounds = [doubling * SUB_BUCKETS
+                      for doubling in range(EXPORTED_DOUBLINGS + 1)]
+            for key in sorted(self._latency):
+                histogram = self._latency[key]
+                counts = histogram.cumulative(bounds)
+                for bound, count in zip(bounds, counts):
+                    le = 'le="%.6g"' % Histogram.upper(bound)
+                    lines.append('%s_bucket%s %d' % (
+                        name, _labels(('domain', 'method'), key, le), count))
+                lines.append('%s_bucket%s %d' % (
+                    name, _labels(('domain', 'method'), key, 'le="+Inf"'),
+                    histogram.count))
+                labels = _labels(('domain', 'method'), key)
+                lines.append('%s_sum%s %s' % (name, labels,
+                                              repr(histogram.sum)))
+                lines.append('%s_count%s %d' % (name, labels,
+                                                histogram.count))
+        return '\n'.join(lines) + '\n'
+
+    def write_prometheus(self, path, prefix='pybossa_client'):
+        """Write the metrics in the Prometheus text format to path.
+
+        The file is written under a temporary name and renamed, so a
+        collector never reads it half written.
+        """
+        tmp = path + '.part'
+        with open(tmp, 'w') as f:
+            f.write(self.to_prometheus(prefix))
+        getattr(os, 'replace', os.rename)(tmp, path)
+
+    def __repr__(self):  # pragma: no cover
+        """Return representation."""
+        return 'pybossa.Metrics(%d requests)' % sum(self._requests.values())
@@ -0,0 +1,279 @@
+# -*- coding: utf-8 -*-
+"""Incremental mirror of PYBOSSA projects in a local SQLite database.
+
+~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+A :class:`Mirror` keeps the tasks, task runs, results and helping materials
+of projects in a SQLite file. Every sync only downloads the objects created
+since the previous one, walking keyset pagination from the last id stored,
+and then re-downloads the objects those new rows may have changed:
+
+* the tasks that got new task runs, as their ``state`` may now be
+  ``completed``;
+* the results of the tasks that got a new result, as the older ones are no
+  longer the ``last_version``.
+
+So a sync costs O(new rows), and the dashboards query the local database.
+Changes made in place without creating new rows, such as
+:func:`pbclient.update_result` or deleted task runs, are only picked up by a
+``full`` sync.
+
+:license: MIT
+"""
+
+import re
+import sqlite3
+import time
+
+from pbclient import DOMAINS, PyBossaError, _bulk, _default, _prefetch
+from pbclient.timeouts import Deadline
+
+#: Domains mirrored by default, in the order they are synced.
+SYNC_DOMAINS = ('taskrun', 'task', 'result', 'helpingmaterial')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sync_state (
+    project_id INTEGER NOT NULL,
+    domain TEXT NOT NULL,
+    last_id INTEGER,
+    synced_at REAL,
+    PRIMARY KEY (project_id, domain)
+);
+"""
+
+TABLE = """
+CREATE TABLE IF NOT EXISTS %(domain)s (
+    id INTEGER PRIMARY KEY,
+    project_id INTEGER,
+    task_id INTEGER,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS %(domain)s_project ON %(domain)s (project_id, id);
+CREATE INDEX IF NOT EXISTS %(domain)s_task ON %(domain)s (task_id);
+"""
+
+#: Members stored in their own indexed column.
+COLUMNS = ('id', 'project_id', 'task_id')
+
+_MEMBER = re.compile(r'[A-Za-z_]\w*$')
+
+
+class Mirror(object):
+
+    """Local SQLite copy of PYBOSSA projects.
+
+    :param path: Path of the SQLite database, created if needed
+    :type path: string
+    :param client: Client used to download the objects, by default the
+        one configured with :func:`pbclient.set`
+    :type client: PyBossaClient
+
+    """
+
+    def __init__(self, path, client=None):
+        """Init method."""
+        self.path = path
+        self.client = client or _default
+        self.db = sqlite3.connect(path)
+        self.db.execute('PRAGMA journal_mode=WAL')
+        self.db.executescript(SCHEMA + ''.join(
+            TABLE % dict(domain=domain) for domain in SYNC_DOMAINS))
+
+    def __enter__(self):
+        """Enter a with block."""
+        return self
+
+    def __exit__(self, *exc_info):
+        """Close the database when leaving a with block."""
+        self.close()
+
+    def close(self):
+        """Close the database."""
+        self.db.close()
+
+    def sync(self, project_id, domains=SYNC_DOMAINS, full=False,
+             page_size=100, concurrency=8, deadline=None):
+        """Download the objects of a project created or changed since the
+        previous sync.
+
+        :param project_id: PYBOSSA Project ID
+        :type project_id: integer
+        :param domains: Domains to sync, by default all of them. The tasks
+            are only refreshed when the task runs are synced too.
+        :type domains: iterable of strings
+        :param full: Drop the local copy and download everything again,
+            default False
+        :type full: boolean
+        :param page_size: Number of objects requested per page, default 100
+        :type page_size: integer
+        :param concurrency: Maximum number of tasks refreshed at the same
+            time, default 8
+        :type concurrency: integer
+        :param deadline: Time budget of the whole sync in seconds
+        :type deadline: float
+        :rtype: dict
+        :returns: The number of ``new`` and ``refreshed`` objects per domain
+
+        """
+        for domain in domains:
+            _check_domain(domain)
+        deadline = Deadline.coerce(deadline)
+        stats = {}
+        touched = set()
+        for domain in SYNC_DOMAINS:
+            if domain not in domains:
+                continue
+            if full:
+                with self.db:
+                    self.db.execute('DELETE FROM %s WHERE project_id = ?'
+                                    % domain, (project_id,))
+                    self._set_last_id(project_id, domain, None)
+            first = self.last_id(project_id, domain) is None
+            new, task_ids = self._pull(project_id, domain, page_size,
+                                       deadline)
+            refreshed = 0
+            if domain == 'taskrun':
+                touched = task_ids
+            elif domain == 'task' and not first:
+                refreshed = self._refresh_tasks(touched - task_ids,
+                                                concurrency, deadline)
+            elif domain == 'result' and not first:
+                refreshed = self._refresh_results(project_id, task_ids,
+                                                  page_size, deadline)
+            stats[domain] = dict(new=new, refreshed=refreshed)
+        return stats
+
+    def _pull(self, project_id, domain, page_size, deadline):
+        """Store the objects after the last synced id.
+
+        Return the number of objects and the ids of their tasks.
+        """
+        last_id = self.last_id(project_id, domain)
+        pages = self.client._iter_pages(domain, dict(project_id=project_id),
+                                        page_size, last_id, deadline)
+        count = 0
+        task_ids = set()
+        for page in _prefetch(pages, 1, self.client._bind):
+            with self.db:
+                self._store(domain, page)
+                self._set_last_id(project_id, domain, page[-1]['id'])
+            count += len(page)
+            for item in page:
+                task_ids.add(item['id'] if domain == 'task'
+                             else item.get('task_id'))
+        task_ids.discard(None)
+        return count, task_ids
+
+    def _refresh_tasks(self, task_ids, concurrency, deadline):
+        """Download again the local tasks among task_ids."""
+        task_ids = [task_id for task_id in sorted(task_ids)
+                    if self._exists('task', task_id)]
+        cls = DOMAINS['task']
+
+        def fetch(task_id):
+            res = self.client._req('get', 'task', task_id, deadline=deadline)
+            if isinstance(res, dict) and 'id' in res:
+                return cls(res)
+            return res
+
+        count = 0
+        for outcome in _bulk(self.client._bind(fetch), task_ids, concurrency,
+                             deadline):
+            error = outcome.error
+            with self.db:
+                if outcome.ok:
+                    self._store('task', [outcome.result.data])
+                    count += 1
+                elif isinstance(error, dict) and \
+                        error.get('status_code') == 404:
+                    self.db.execute('DELETE FROM task WHERE id = ?',
+                                    (outcome.item,))
+                elif isinstance(error, Exception):
+                    raise error
+                else:
+                    raise PyBossaError(error)
+        return count
+
+    def _refresh_results(self, project_id, task_ids, page_size, deadline):
+        """Download again the results of the tasks with several results."""
+        count = 0
+        for task_id in sorted(task_ids):
+            if self.count('result', task_id=task_id) < 2:
+                continue
+            params = dict(project_id=project_id, task_id=task_id)
+            for page in self.client._iter_pages('result', params, page_size,
+                                                deadline=deadline):
+                with self.db:
+                    self._store('result', page)
+                count += len(page)
+        return count
+
+    def _store(self, domain, items):
+        dumps = self.client._codec().dumps
+        self.db.executemany(
+            'INSERT OR REPLACE INTO %s (id, project_id, task_id, data) '
+            'VALUES (?, ?, ?, ?)' % domain,
+            [(item['id'], item.get('project_id'), item.get('task_id'),
+              dumps(item).decode('utf-8')) for item in items])
+
+    def _exists(self, domain, id):
+        return self.db.execute('SELECT 1 FROM %s WHERE id = ?' % domain,
+                               (id,)).fetchone() is not None
+
+    def _set_last_id(self, project_id, domain, last_id):
+        self.db.execute('INSERT OR REPLACE INTO sync_state '
+                        '(project_id, domain, last_id, synced_at) '
+                        'VALUES (?, ?, ?, ?)',
+                        (project_id, domain, last_id, time.time()))
+
+    def last_id(self, project_id, domain):
+        """Return the highest id synced of a project domain, or None."""
+        row = self.db.execute('SELECT last_id FROM sync_state '
+                              'WHERE project_id = ? AND domain = ?',
+                              (project_id, domain)).fetchone()
+        return row[0] if row else None
+
+    def _where(self, domain, kwargs):
+        _check_domain(domain)
+        clauses = []
+        args = []
+        for key in sorted(kwargs):
+            if not _MEMBER.match(key):
+                raise ValueError('invalid member: %s' % key)
+            if key in COLUMNS:
+                clauses.append('%s = ?' % key)
+            else:
+                clauses.append("json_extract(data, '$.%s') = ?" % key)
+            args.append(kwargs[key])
+        sql = ' FROM %s' % domain
+        if clauses:
+            sql += ' WHERE ' + ' AND '.join(clauses)
+        return sql, args
+
+    def find(self, domain, **kwargs):
+        """Yield the local objects of a domain matching the given members.
+
+        The objects parse their JSON when a field is first read.
+
+        :param domain: ``task``, ``taskrun``, ``result`` or
+            ``helpingmaterial``
+        :type domain: string
+        :param kwargs: PYBOSSA members to filter by, such as ``project_id``
+            or ``state``
+        :rtype: generator
+        """
+        sql, args = self._where(domain, kwargs)
+        cls = DOMAINS[domain]
+        cursor = self.db.execute('SELECT data' + sql + ' ORDER BY id', args)
+        for (data,) in cursor:
+            yield cls.from_json(data)
+
+    def count(self, domain, **kwargs):
+        """Return the number of local objects matching the given members."""
+        sql, args = self._where(domain, kwargs)
+        return self.db.execute('SELECT COUNT(*)' + sql, args).fetchone()[0]
+
+
+def _check_domain(domain):
+    if domain not in SYNC_DOMAINS:
+        raise ValueError('unknown domain: %s' % domain)
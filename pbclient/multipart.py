@@ -0,0 +1,190 @@
+# -*- coding: utf-8 -*-
+"""Streaming multipart/form-data request bodies.
+
+~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+A :class:`MultipartEncoder` reads the files it uploads chunk by chunk while
+the body is sent, so uploading a large video does not load it in memory. Its
+length is known in advance, so the request carries a ``Content-Length``.
+
+:license: MIT
+"""
+
+import binascii
+import io
+import mimetypes
+import os
+
+#: Size in bytes of the chunks yielded when iterating over a body.
+CHUNK_SIZE = 1 << 16
+
+
+def _bytes(value):
+    if isinstance(value, bytes):
+        return value
+    return str(value).encode('utf-8')
+
+
+class _Part(object):
+
+    """Bytes of a body read from a seekable file object."""
+
+    __slots__ = ('fileobj', 'start', 'size', 'remaining')
+
+    def __init__(self, fileobj):
+        """Init method."""
+        self.fileobj = fileobj
+        self.start = fileobj.tell()
+        fileobj.seek(0, 2)
+        self.size = fileobj.tell() - self.start
+        self.rewind()
+
+    def __len__(self):
+        """Return the size in bytes of the part."""
+        return self.size
+
+    def rewind(self):
+        """Seek back to the start of the part."""
+        self.fileobj.seek(self.start)
+        self.remaining = self.size
+
+    def read(self, size):
+        """Return at most size bytes of the part."""
+        if not self.remaining:
+            return b''
+        chunk = self.fileobj.read(min(size, self.remaining))
+        if not chunk:
+            raise IOError('file shrank while being uploaded')
+        self.remaining -= len(chunk)
+        return chunk
+
+
+class MultipartEncoder(object):
+
+    """multipart/form-data body streaming its files.
+
+    The files are given as paths, which are opened here and closed by
+    :meth:`close`, or as seekable binary file objects such as open files,
+    ``io.BytesIO`` or ``mmap.mmap``, which are read from their current
+    position and left open. Use the encoder in a with block so the files it
+    opened are closed however the request ends.
+
+    :param fields: Form fields
+    :type fields: dict
+    :param files: Field name and path, as a string or path-like object, or
+        file object of every file
+    :type files: dict
+    :param progress: Function called with the bytes sent so far and the
+        total after every chunk read
+    :param chunk_size: Size in bytes of the chunks yielded when iterating
+    :type chunk_size: integer
+
+    """
+
+    def __init__(self, fields=None, files=None, progress=None,
+                 chunk_size=CHUNK_SIZE, boundary=None):
+        """Init method."""
+        self.boundary = boundary or binascii.hexlify(
+            os.urandom(16)).decode('ascii')
+        self.content_type = 'multipart/form-data; boundary=' + self.boundary
+        self.progress = progress
+        self.chunk_size = chunk_size
+        self._opened = []
+        self._parts = []
+        try:
+            for name, value in sorted((fields or {}).items()):
+                self._add(self._header(name) + _bytes(value) + b'\r\n')
+            for name, source in sorted((files or {}).items()):
+                fileobj, filename = self._open(name, source)
+                self._add(self._header(name, filename))
+                self._parts.append(_Part(fileobj))
+                self._add(b'\r\n')
+            self._add(('--%s--\r\n' % self.boundary).encode('ascii'))
+        except:
+            self.close()
+            raise
+        self.len = sum(len(part) for part in self._parts)
+        self.rewind()
+
+    def _add(self, data):
+        self._parts.append(_Part(io.BytesIO(data)))
+
+    def _header(self, name, filename=None):
+        header = ('--%s\r\nContent-Disposition: form-data; name="%s"'
+                  % (self.boundary, name))
+        if filename is not None:
+            content_type = (mimetypes.guess_type(filename)[0] or
+                            'application/octet-stream')
+            header += ('; filename="%s"\r\nContent-Type: %s'
+                       % (filename, content_type))
+        return (header + '\r\n\r\n').encode('utf-8')
+
+    def _open(self, name, source):
+        """Return the file object and file name of a file to upload."""
+        if hasattr(source, 'read'):
+            fileobj = source
+            path = getattr(source, 'name', None)
+        else:
+            path = os.fspath(source)
+            fileobj = open(path, 'rb')
+            self._opened.append(fileobj)
+        if isinstance(path, bytes):
+            path = os.fsdecode(path)
+        if not isinstance(path, str):
+            path = name
+        return fileobj, os.path.basename(path).replace('"', '')
+
+    def __len__(self):
+        """Return the size in bytes of the body."""
+        return self.len
+
+    def __enter__(self):
+        """Enter a with block."""
+        return self
+
+    def __exit__(self, *exc_info):
+        """Close the files opened when leaving a with block."""
+        self.close()
+
+    def close(self):
+        """Close the files opened from paths."""
+        while self._opened:
+            self._opened.pop().close()
+
+    def rewind(self):
+        """Go back to the start of the body, to send it again."""
+        for part in self._parts:
+            part.rewind()
+        self._index = 0
+        self.sent = 0
+
+    def read(self, size=-1):
+        """Return the next size bytes of the body, or all of the rest."""
+        if size is None or size < 0:
+            size = self.len
+        chunks = []
+        while size > 0 and self._index < len(self._parts):
+            chunk = self._parts[self._index].read(size)
+            if not chunk:
+                self._index += 1
+                continue
+            chunks.append(chunk)
+            size -= len(chunk)
+        data = b''.join(chunks)
+        if data:
+            self.sent += len(data)
+            if self.progress is not None:
+                self.progress(self.sent, self.len)
+        return data
+
+    def __iter__(self):
+        """Yield the rest of the body in chunks of chunk_size bytes."""
+        while True:
+            chunk = self.read(self.chunk_size)
+            if not chunk:
+                return
+            yield chunk
+
+    def __repr__(self):  # pragma: no cover
+        """Return representation."""
+        return 'pybossa.MultipartEncoder(%d bytes)' % self.len
@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+"""Client side scheduling of the PYBOSSA API rate limits.
+
+~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+PYBOSSA limits the number of requests per API key and window, and reports
+it with the ``X-RateLimit-Limit``, ``X-RateLimit-Remaining`` and
+``X-RateLimit-Reset`` headers. A :class:`RateLimiter` reads them and paces
+the requests just under the limit, so bulk operations run at the maximum
+sustainable rate instead of hitting 429 answers.
+
+:license: MIT
+"""
+
+import threading
+import time
+
+_clock = getattr(time, 'monotonic', time.time)
+
+
+class RateLimiter(object):
+
+    """Token bucket shared by all the requests using one API key.
+
+    The bucket refills at the rate that spends the remaining requests of
+    the window evenly until it resets. Callers reserve a token and wait the
+    returned delay, so requests coming from many threads and coroutines are
+    spread over time instead of bursting. After a 429 answer every caller
+    waits until the window resets.
+
+    :param margin: Number of requests of each window left unused, as a
+        safety margin, default 1
+    :type margin: integer
+    :param burst: Maximum number of tokens accumulated, default 10
+    :type burst: integer
+
+    """
+
+    def __init__(self, margin=1, burst=10):
+        """Init method."""
+        self.margin = margin
+        self.burst = burst
+        self.rate = None
+        self.tokens = float(burst)
+        self._updated = _clock()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        if self.rate is not None:
+            self.tokens = min(self.burst, self.tokens +
+                              (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self):
+        """Take a token and return the seconds to wait before using it."""
+        with self._lock:
+            now = _clock()
+            self._refill(now)
+            wait = max(0.0, self._blocked_until - now)
+            if self.rate is None:
+                return wait
+            self.tokens -= 1
+            if self.tokens < 0:
+                wait = max(wait, -self.tokens / self.rate)
+            return wait
+
+    def update(self, status, headers):
+        """Update the bucket with the rate limit headers of an answer."""
+        remaining = _int_header(headers, 'X-RateLimit-Remaining')
+        reset = _int_header(headers, 'X-RateLimit-Reset')
+        with self._lock:
+            now = _clock()
+            self._refill(now)
+            window = None
+            if reset is not None:
+                window = max(reset - time.time(), 0.0)
+            if status == 429:
+                retry_after = _int_header(headers, 'Retry-After')
+                if retry_after is not None:
+                    window = retry_after
+                self._blocked_until = now + (window if window else 1.0)
+                self.tokens = min(self.tokens, 0.0)
+            elif remaining is not None and window is not None:
+                allowed = max(remaining - self.margin, 0)
+                self.rate = max(allowed, 1) / max(window, 1.0)
+                self.tokens = min(self.tokens, allowed)
+
+
+def _int_header(headers, name):
+    """Return the integer value of a header, or None."""
+    try:
+        return int(headers[name])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+
+def get_limiter(endpoint, api_key=None):
+    """Return the RateLimiter shared by every client of endpoint and key."""
+    key = (endpoint, api_key)
+    with _limiters_lock:
+        limiter = _limiters.get(key)
+        if limiter is None:
+            limiter = _limiters[key] = RateLimiter()
+        return limiter
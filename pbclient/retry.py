@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+"""Retry policy for the PYBOSSA API requests.
+
+~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+:license: MIT
+"""
+
+import random
+
+import requests
+
+
+class Retry(object):
+
+    """Retry policy with exponential backoff and jitter.
+
+    A request is retried when it fails with one of ``exceptions`` or when
+    the server answers with one of ``status_forcelist``. GET, PUT and DELETE
+    are idempotent and retried by default; POST is only retried when
+    ``retry_post`` is True, as a retried POST may create the object twice.
+
+    The n-th retry waits a random time between 0 and
+    ``min(backoff_max, backoff_factor * 2 ** (n - 1))`` seconds ("full
+    jitter"), so clients failing at the same time do not retry in lockstep.
+
+    :param max_attempts: Maximum number of attempts, including the first
+        one, default 3
+    :type max_attempts: integer
+    :param backoff_factor: Base of the exponential backoff in seconds,
+        default 0.5
+    :type backoff_factor: float
+    :param backoff_max: Maximum backoff in seconds, default 30
+    :type backoff_max: float
+    :param jitter: Randomize the backoff, default True
+    :type jitter: boolean
+    :param status_forcelist: Status codes to retry, default 500, 502, 503
+        and 504
+    :type status_forcelist: iterable of integers
+    :param exceptions: Exceptions to retry, default connection errors and
+        timeouts
+    :type exceptions: tuple of exception classes
+    :param retry_post: Retry POST requests too, default False
+    :type retry_post: boolean
+
+    """
+
+    IDEMPOTENT_METHODS = frozenset(['get', 'put', 'delete'])
+    DEFAULT_STATUS_FORCELIST = frozenset([500, 502, 503, 504])
+    DEFAULT_EXCEPTIONS = (requests.ConnectionError, requests.Timeout)
+
+    def __init__(self, max_attempts=3, backoff_factor=0.5, backoff_max=30,
+                 jitter=True, status_forcelist=DEFAULT_STATUS_FORCELIST,
+                 exceptions=DEFAULT_EXCEPTIONS, retry_post=False):
+        """Init method."""
+        self.max_attempts = max_attempts
+        self.backoff_factor = backoff_factor
+        self.backoff_max = backoff_max
+        self.jitter = jitter
+        self.status_forcelist = frozenset(status_forcelist)
+        self.exceptions = tuple(exceptions)
+        self.retry_post = retry_post
+
+    def allows(self, method):
+        """Return True if requests with this method can be retried."""
+        return (method in self.IDEMPOTENT_METHODS or
+                (method == 'post' and self.retry_post))
+
+    def should_retry(self, method, attempt, status=None, exception=None):
+        """Return True if the attempt number attempt has to be retried."""
+        if attempt >= self.max_attempts or not self.allows(method):
+            return False
+        if exception is not None:
+            return isinstance(exception, self.exceptions)
+        return status in self.status_forcelist
+
+    def backoff(self, attempt):
+        """Return the seconds to wait before retrying the given attempt."""
+        delay = min(self.backoff_max,
+                    self.backoff_factor * 2 ** (attempt - 1))
+        if self.jitter:
+            return random.uniform(0, delay)
+        return delay
+
+    def __repr__(self):  # pragma: no cover
+        """Return representation."""
+        return 'pybossa.Retry(max_attempts=%d)' % self.max_attempts
+
+
+#: Policy used by the clients that do not set their own ``retry``.
+DEFAULT_RETRY = Retry()
@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+"""Coalescing of identical concurrent requests.
+
+~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+When many threads send the same GET at the same time, only the first one
+reaches the server; the others wait for its answer and share it.
+
+:license: MIT
+"""
+
+import threading
+
+
+def request_key(domain, id, params):
+    """Return the key identifying a GET of domain, id and params."""
+    return (domain, id,
+            tuple(sorted((k, str(v)) for k, v in (params or {}).items())))
+
+
+class _Call(object):
+
+    """A call in flight and its outcome."""
+
+    __slots__ = ('event', 'result', 'error')
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight(object):
+
+    """Run at most one call per key at a time, across threads."""
+
+    def __init__(self):
+        """Init method."""
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, func, deadline=None, background=False):
+        """Return func(), or the result of the call of key in flight.
+
+        Every caller waits for the shared call within its own deadline, so
+        the call itself must not depend on the deadline of the caller
+        starting it. With ``background``, that caller runs it on a new
+        thread and waits like the others, instead of running it itself.
+
+        :param key: Key of the call
+        :param func: Function making the call
+        :param deadline: Deadline of the caller
+        :type deadline: pbclient.timeouts.Deadline
+        :param background: Run func on a new thread, default False
+        :type background: boolean
+        :returns: ``(result, shared)``, where shared is True if the result
+            came from the call of another caller
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+        if leader and not background:
+            self._run(key, call, func)
+        elif leader:
+            thread = threading.Thread(target=self._run,
+                                      args=(key, call, func))
+            thread.daemon = True
+            thread.start()
+        timeout = deadline.remaining() if deadline is not None else None
+        while not call.event.wait(timeout):
+            deadline.check()
+            timeout = deadline.remaining()
+        if call.error is not None:
+            raise call.error
+        return call.result, not leader
+
+    def _run(self, key, call, func):
+        """Run the call of key and wake up its waiters."""
+        try:
+            call.result = func()
+        except BaseException as e:
+            call.error = e
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+"""Timeouts and time budgets of the PYBOSSA API requests.
+
+~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+:license: MIT
+"""
+
+import time
+
+import requests
+
+_clock = getattr(time, 'monotonic', time.time)
+
+
+class DeadlineExceeded(requests.Timeout):
+
+    """The time budget of an operation ran out."""
+
+
+class Deadline(object):
+
+    """Time budget shared by all the requests of an operation.
+
+    The budget keeps running across pages, retries and rate limit waits:
+    every request gets at most the remaining time as its timeout, and no
+    request is started once it is spent.
+
+    :param seconds: Time budget in seconds
+    :type seconds: float
+
+    """
+
+    def __init__(self, seconds):
+        """Init method."""
+        self.seconds = seconds
+        self.expires = _clock() + seconds
+
+    @classmethod
+    def coerce(cls, deadline):
+        """Return deadline as a Deadline, accepting seconds or None."""
+        if deadline is None or isinstance(deadline, cls):
+            return deadline
+        return cls(deadline)
+
+    def remaining(self):
+        """Return the seconds left, never negative."""
+        return max(self.expires - _clock(), 0.0)
+
+    def check(self):
+        """Raise DeadlineExceeded if the budget is spent."""
+        if self.remaining() <= 0:
+            raise DeadlineExceeded('deadline of %ss exceeded' % self.seconds)
+
+    def allows(self, delay):
+        """Return True if waiting delay seconds leaves some budget."""
+        return delay < self.remaining()
+
+    def cap(self, timeout):
+        """Return the (connect, read) timeout capped to the budget left."""
+        remaining = self.remaining()
+        if timeout is None:
+            return (remaining, remaining)
+        if not isinstance(timeout, tuple):
+            timeout = (timeout, timeout)
+        return tuple(remaining if t is None else min(t, remaining)
+                     for t in timeout)
+
+    def __repr__(self):  # pragma: no cover
+        """Return representation."""
+        return 'pybossa.Deadline(%.1fs left)' % self.remaining()
@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+"""Hashing of local files synced as helping materials.
+
+~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+:func:`pbclient.sync_helping_materials` stores the relative path and the
+SHA-256 of every file it uploads in the ``info`` of its helping material,
+under ``PATH_KEY`` and ``HASH_KEY``. The next sync hashes the directory
+again, in a pool of processes, and only uploads the files whose hash
+changed.
+
+:license: MIT
+"""
+
+import hashlib
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+#: Members of the helping material info holding the path and hash of a file.
+PATH_KEY, HASH_KEY = 'path', 'sha256'
+
+#: Size in bytes of the blocks read while hashing.
+BLOCK_SIZE = 1 << 20
+
+
+def file_digest(path):
+    """Return the hex SHA-256 and the size of the file path."""
+    digest = hashlib.sha256()
+    size = 0
+    with open(path, 'rb') as f:
+        while True:
+            block = f.read(BLOCK_SIZE)
+            if not block:
+                break
+            digest.update(block)
+            size += len(block)
+    return digest.hexdigest(), size
+
+
+def list_files(directory):
+    """Return the relative paths of the files under directory, sorted.
+
+    Hidden files and directories are skipped. The paths use ``/`` on every
+    platform, so they match the ones stored from another machine.
+    """
+    paths = []
+    for root, dirs, files in os.walk(directory):
+        dirs[:] = [d for d in dirs if not d.startswith('.')]
+        for name in files:
+            if not name.startswith('.'):
+                path = os.path.relpath(os.path.join(root, name), directory)
+                paths.append(path.replace(os.sep, '/'))
+    return sorted(paths)
+
+
+def hash_files(directory, processes=None):
+    """Return the hex SHA-256 and size of every file under directory.
+
+    :param directory: Directory to scan
+    :type directory: string
+    :param processes: Number of hashing processes, by default one per CPU;
+        1 hashes in this process
+    :type processes: integer
+    :rtype: dict
+    :returns: ``(digest, size)`` by relative path
+    """
+    paths = list_files(directory)
+    full = [os.path.join(directory, *path.split('/')) for path in paths]
+    if processes == 1 or len(paths) < 2:
+        return dict(zip(paths, map(file_digest, full)))
+    with ProcessPoolExecutor(processes) as pool:
+        workers = processes or os.cpu_count() or 1
+        chunksize = max(1, len(paths) // (workers * 4))
+        return dict(zip(paths, pool.map(file_digest, full,
+                                        chunksize=chunksize)))
+
+
+class SyncResult(object):
+
+    """Summary of a sync of helping materials.
+
+    ``uploaded`` and ``unchanged`` are the relative paths of the files sent
+    and skipped, ``replaced`` the ones sent because their hash changed,
+    ``failures`` the :class:`pbclient.Outcome` of the uploads that failed,
+    and ``orphaned`` the ids of the helping materials uploaded without their
+    path and hash, which could not be deleted.
+
+    """
+
+    def __init__(self):
+        """Init method."""
+        self.uploaded = []
+        self.replaced = []
+        self.unchanged = []
+        self.failures = []
+        self.orphaned = []
+        self.bytes_uploaded = 0
+        self.bytes_skipped = 0
+        self.hash_elapsed = 0.0
+        self.upload_elapsed = 0.0
+        self.elapsed = 0.0
+
+    @property
+    def time_saved(self):
+        """Return the seconds the unchanged files would have taken to upload.
+
+        It is estimated from the throughput of the files uploaded, so it is
+        None when none was.
+        """
+        if not self.bytes_uploaded or not self.upload_elapsed:
+            return None
+        return self.bytes_skipped * self.upload_elapsed / self.bytes_uploaded
+
+    def __repr__(self):  # pragma: no cover
+        """Return representation."""
+        return ('pybossa.SyncResult(%d uploaded, %d unchanged, '
+                '%d failures)' % (len(self.uploaded), len(self.unchanged),
+                                  len(self.failures)))
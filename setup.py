@@ -4,7 +4,8 @@ setup(
     name='pybossa-client',
     version='3.0.0',
     packages=find_packages(),
-    install_requires=['requests>=0.13.0'],
+    install_requires=['requests>=2.16'],
+    python_requires='>=3.6',
     # metadata for upload to PyPI
     author='Open Knowledge Foundation Labs',
     # TODO: change
@@ -14,6 +15,9 @@ setup(
     license='MIT',
     url='https://github.com/Scifabric/pybossa-client',
     download_url='https://github.com/Scifabric/pybossa-client/zipball/master',
+    extras_require={'aio': ['aiohttp>=3.0'],
+                    'frames': ['numpy', 'pandas'],
+                    'zstd': ['zstandard']},
     include_package_data=True,
     classifiers=[
         'Development Status :: 3 - Alpha',
@@ -22,6 +26,7 @@ setup(
         'License :: OSI Approved :: MIT License',
         'Operating System :: OS Independent',
         'Programming Language :: Python',
+        'Programming Language :: Python :: 3',
         'Topic :: Software Development :: Libraries :: Python Modules'
     ],
     entry_points=''''''
@@ -18,7 +18,12 @@ import pbclient
 import json
 from collections import namedtuple
 
-FakeRequest = namedtuple('FakeRequest', ['text', 'status_code', 'headers'])
+
+class FakeRequest(namedtuple('FakeRequest', ['text', 'status_code', 'headers'])):
+
+    @property
+    def content(self):
+        return self.text.encode('utf-8')
 
 
 class TestPyBossaClient(object):
@@ -0,0 +1,235 @@
+# -*- coding: utf8 -*-
+# Copyright (C) 2013 Daniel Lombraña González
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import asyncio
+import io
+import json
+from unittest import SkipTest
+
+import pbclient
+from base import TestPyBossaClient
+from nose.tools import assert_raises
+from pbclient.timeouts import Deadline, DeadlineExceeded
+
+try:
+    from aiohttp import web
+    from pbclient.aio import AsyncPyBossaClient, AsyncSingleFlight
+except ImportError:  # pragma: no cover
+    raise SkipTest('aiohttp is not installed')
+
+
+class TestPybossaClientAio(TestPyBossaClient):
+
+    def setUp(self):
+        super(TestPybossaClientAio, self).setUp()
+        self.requests = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.uploads = []
+        self.encodings = []
+
+    def run_client(self, coro_factory, **client_kwargs):
+        """Run coro_factory(client) against a local aiohttp server."""
+        async def handler(request):
+            self.requests.append((request.method, request.path,
+                                  dict(request.query)))
+            self.encodings.append(request.headers.get('Accept-Encoding'))
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            await asyncio.sleep(0.01)
+            self.in_flight -= 1
+            parts = request.path.split('/')
+            if request.method == 'DELETE':
+                return web.Response(status=204)
+            if request.content_type == 'multipart/form-data':
+                form = await request.post()
+                self.uploads.append((request.content_length,
+                                     form['project_id'], form['file'].filename,
+                                     form['file'].file.read()))
+                return web.json_response(dict(self.helping_material, id=1))
+            if request.method in ('POST', 'PUT'):
+                data = await request.json()
+                data['id'] = int(parts[3]) if len(parts) > 3 else 1
+                return web.json_response(data)
+            if len(parts) > 3:
+                if parts[3] == '404':
+                    return web.json_response(
+                        self.create_error_output('GET', 404, parts[2],
+                                                 'NotFound'), status=404)
+                return web.json_response(dict(self.task, id=int(parts[3])))
+            last_id = int(request.query.get('last_id', 0))
+            limit = int(request.query.get('limit', 20))
+            ids = range(last_id + 1, min(last_id + 1 + limit, 26))
+            return web.json_response([dict(self.task, id=i) for i in ids])
+
+        async def main():
+            app = web.Application()
+            app.router.add_route('*', '/{tail:.*}', handler)
+            runner = web.AppRunner(app)
+            await runner.setup()
+            site = web.TCPSite(runner, '127.0.0.1', 0)
+            await site.start()
+            port = site._server.sockets[0].getsockname()[1]
+            client = AsyncPyBossaClient('http://127.0.0.1:%d' % port,
+                                        api_key='tester', **client_kwargs)
+            try:
+                async with client:
+                    return await coro_factory(client)
+            finally:
+                await runner.cleanup()
+
+        loop = asyncio.new_event_loop()
+        try:
+            return loop.run_until_complete(main())
+        finally:
+            loop.close()
+
+    def test_get_task_objects(self):
+        """Test coroutines return domain objects"""
+        tasks = self.run_client(lambda c: c.find_tasks(1, state='completed'))
+        assert all(isinstance(t, pbclient.Task) for t in tasks)
+        method, path, query = self.requests[0]
+        assert path == '/api/task', path
+        assert query['api_key'] == 'tester', query
+        assert query['state'] == 'completed', query
+
+    def test_coalesce_stress(self):
+        """Test 32 coroutines getting the same task send one request"""
+        async def get(client):
+            return await asyncio.gather(
+                *[client.get_task(42) for _ in range(32)]), client.stats
+        tasks, stats = self.run_client(get, concurrency=32, coalesce=True)
+        assert len(self.requests) == 1, self.requests
+        assert all(task.id == 42 for task in tasks)
+        assert stats['coalesced'] == 31, stats
+        self.requests = []
+        self.run_client(lambda c: asyncio.gather(c.get_task(1),
+                                                 c.get_task(1)))
+        assert len(self.requests) == 2, self.requests
+
+    def test_single_flight_callers(self):
+        """Test a cancelled or late first caller fails no other caller"""
+        flight = AsyncSingleFlight()
+
+        async def slow():
+            await asyncio.sleep(0.1)
+            return 'slow'
+
+        async def main():
+            first = asyncio.ensure_future(
+                asyncio.wait_for(flight.do('a', slow), 0.01))
+            late = asyncio.ensure_future(flight.do('b', slow, Deadline(0.01)))
+            await asyncio.sleep(0)
+            waiters = asyncio.gather(flight.do('a', slow),
+                                     flight.do('b', slow))
+            for caller, error in ((first, asyncio.TimeoutError),
+                                  (late, DeadlineExceeded)):
+                try:
+                    await caller
+                except error:
+                    pass
+                else:  # pragma: no cover
+                    raise AssertionError('%s not raised' % error)
+            return await waiters
+
+        loop = asyncio.new_event_loop()
+        try:
+            results = loop.run_until_complete(main())
+        finally:
+            loop.close()
+        assert results == [('slow', True), ('slow', True)], results
+        assert flight._calls == {}
+
+    def test_accept_encoding_changed(self):
+        """Test changing accept_encoding applies to the open session"""
+        async def get(client):
+            await client.get_task(1)
+            client.set('accept_encoding', None)
+            await client.get_task(1)
+        self.run_client(get)
+        assert self.encodings == ['gzip, deflate', 'identity'], \
+            self.encodings
+
+    def test_unsupported_settings(self):
+        """Test the settings the async client ignores are refused"""
+        assert_raises(ValueError, AsyncPyBossaClient, 'http://localhost',
+                      cache=object())
+        client = AsyncPyBossaClient('http://localhost', retry=None)
+        assert client.opts['retry'] is None
+        assert_raises(ValueError, client.set, 'conditional', object())
+        assert 'conditional' not in client.opts
+
+    def test_errors(self):
+        """Test coroutines return the server errors"""
+        err = self.run_client(lambda c: c.get_project(404))
+        assert err['status_code'] == 404, err
+
+    def test_create_update_delete(self):
+        """Test create, update and delete coroutines"""
+        async def crud(client):
+            task = await client.create_task(1, {'a': 1})
+            task = await client.update_task(pbclient.Task(dict(self.task)))
+            return task, await client.delete_task(task.id)
+        task, deleted = self.run_client(crud)
+        assert task.id == self.task['id'], task
+        assert 'state' not in task.data
+        assert deleted is True
+        assert [r[0] for r in self.requests] == ['POST', 'PUT', 'DELETE']
+
+    def test_create_helpingmaterial(self):
+        """Test create_helpingmaterial streams the file"""
+        progress = []
+        fileobj = io.BytesIO(b'x' * 200000)
+        fileobj.name = 'tutorial.mp4'
+        hm = self.run_client(lambda c: c.create_helpingmaterial(
+            1, {}, file_path=fileobj,
+            progress=lambda sent, total: progress.append(sent)))
+        assert isinstance(hm, pbclient.HelpingMaterial), hm
+        length, project_id, filename, data = self.uploads[0]
+        assert progress[-1] == length, (progress, length)
+        assert project_id == '1', project_id
+        assert filename == 'tutorial.mp4', filename
+        assert data == fileobj.getvalue()
+
+    def test_iter_tasks(self):
+        """Test async iterators walk keyset pagination"""
+        async def collect(client):
+            return [task.id async for task in
+                    client.iter_tasks(1, page_size=10, prefetch=1)]
+        ids = self.run_client(collect)
+        assert ids == list(range(1, 26)), ids
+        last_ids = [r[2].get('last_id') for r in self.requests]
+        assert last_ids == [None, '10', '20'], last_ids
+
+    def test_concurrency_limit(self):
+        """Test the semaphore bounds the requests in flight"""
+        async def many(client):
+            return await asyncio.gather(*[client.get_project(i)
+                                          for i in range(1, 21)])
+        projects = self.run_client(many, concurrency=3)
+        assert [p.id for p in projects] == list(range(1, 21))
+        assert self.max_in_flight <= 3, self.max_in_flight
+
+    def test_create_tasks(self):
+        """Test create_tasks yields the outcomes in input order"""
+        async def create(client):
+            return [o async for o in client.create_tasks(1, range(20),
+                                                         concurrency=4)]
+        outcomes = self.run_client(create)
+        assert [o.item for o in outcomes] == list(range(20))
+        assert all(o.ok for o in outcomes)
+        assert all(isinstance(o.result, pbclient.Task) for o in outcomes)
+        assert self.max_in_flight <= 4, self.max_in_flight
@@ -0,0 +1,146 @@
+# -*- coding: utf8 -*-
+# Copyright (C) 2015 Daniel Lombraña González
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import pbclient
+from mock import patch
+from base import TestPyBossaClient
+from pbclient import cache, timeouts
+from pbclient.cache import ConditionalCache, TTLCache
+
+
+class TestPybossaClientCache(TestPyBossaClient):
+
+    def setUp(self):
+        super(TestPybossaClientCache, self).setUp()
+        self.cache = TTLCache(maxsize=2, ttl=10)
+        self.client.set('cache', self.cache)
+
+    def tearDown(self):
+        pbclient._opts.pop('cache', None)
+        pbclient._opts.pop('conditional', None)
+
+    def test_ttl_cache(self):
+        """Test entries expire and the least recently used is evicted"""
+        now = [100.0]
+        with patch.object(cache, '_clock', lambda: now[0]):
+            self.cache.set('a', 1)
+            self.cache.set('b', 2)
+            assert self.cache.get('a') == 1
+            self.cache.set('c', 3)
+            assert self.cache.get('b') is None
+            assert self.cache.evictions == 1
+            now[0] += 11
+            assert self.cache.get('a') is None
+        assert (self.cache.hits, self.cache.misses) == (1, 2)
+        generation = self.cache.generation()
+        self.cache.invalidate('x')
+        self.cache.set('d', 4, generation)
+        assert self.cache.get('d') is None
+        self.cache.clear()
+        assert len(self.cache) == 0
+        assert cache._clock is timeouts._clock
+
+    @patch('pbclient.requests.Session.get')
+    def test_get_cached(self, Mock):
+        """Test get_project, get_category and get_task are cached"""
+        for name, data in (('project', self.project),
+                           ('category', self.category),
+                           ('task', self.task)):
+            data = dict(data, info={'a': 1})
+            Mock.reset_mock()
+            Mock.return_value = self.create_fake_request(data, 200)
+            get = getattr(self.client, 'get_' + name)
+            first = get(data['id'])
+            second = get(data['id'])
+            assert Mock.call_count == 1, name
+            assert first.data == second.data == data, name
+            second.info['changed'] = True
+            assert 'changed' not in get(data['id']).info
+        assert self.cache.hits == 6, self.cache.hits
+
+    @patch('pbclient.requests.Session.get')
+    def test_get_errors_not_cached(self, Mock):
+        """Test errors are not cached"""
+        error = self.create_error_output(action='GET', status_code=404,
+                                         target='task',
+                                         exception_cls='NotFound')
+        Mock.return_value = self.create_fake_request(error, 404)
+        assert self.client.get_task(1) == error
+        assert self.client.get_task(1) == error
+        assert Mock.call_count == 2
+        assert len(self.cache) == 0
+
+    @patch('pbclient.requests.Session.delete')
+    @patch('pbclient.requests.Session.put')
+    @patch('pbclient.requests.Session.get')
+    def test_invalidation(self, Mock, PutMock, DeleteMock):
+        """Test updates and deletes drop the cached object"""
+        Mock.return_value = self.create_fake_request(self.task, 200)
+        PutMock.return_value = self.create_fake_request(self.task, 200)
+        DeleteMock.return_value = self.create_fake_request('', 204)
+        task = self.client.get_task(self.task['id'])
+        self.client.update_task(task)
+        self.client.get_task(self.task['id'])
+        assert Mock.call_count == 2, Mock.call_count
+        self.client.delete_task(self.task['id'])
+        self.client.get_task(self.task['id'])
+        assert Mock.call_count == 3, Mock.call_count
+
+    @patch('pbclient.requests.Session.get')
+    def test_conditional_get(self, Mock):
+        """Test GETs are revalidated with the ETag of the cached answer"""
+        conditional = ConditionalCache()
+        self.client.set('conditional', conditional)
+        self.client.set('cache', None)
+        tasks = [self.task]
+        Mock.side_effect = [
+            self.create_fake_request(tasks, 200, {'ETag': '"v1"'}),
+            self.create_fake_request('', 304, {'ETag': '"v1"'})]
+        first = self.client.find_tasks(1)
+        second = self.client.find_tasks(1)
+        assert [t.data for t in second] == [t.data for t in first] == tasks
+        assert 'headers' not in Mock.call_args_list[0][1]
+        assert Mock.call_args_list[1][1]['headers'] == {
+            'If-None-Match': '"v1"'}, Mock.call_args_list[1]
+        assert conditional.not_modified == 1
+        Mock.side_effect = [self.create_fake_request(
+            self.task, 200, {'Last-Modified': 'Mon, 1 Jan 2024'})] * 2
+        self.client.get_task(1)
+        self.client.get_task(1)
+        assert Mock.call_args[1]['headers'] == {
+            'If-Modified-Since': 'Mon, 1 Jan 2024'}
+
+    @patch('pbclient.codec.JSONCodec.loads')
+    @patch('pbclient.requests.Session.get')
+    def test_conditional_content_hash(self, Mock, LoadsMock):
+        """Test unchanged bodies without validators are decoded once"""
+        self.client.set('codec', 'json')
+        self.client.set('conditional', ConditionalCache())
+        self.client.set('cache', None)
+        LoadsMock.return_value = self.project
+        try:
+            Mock.side_effect = [
+                self.create_fake_request(self.project, 200, {}),
+                self.create_fake_request(self.project, 200, {}),
+                self.create_fake_request(dict(self.project, name='new'),
+                                         200, {})]
+            for _ in range(3):
+                assert self.client.get_project(1).id == self.project['id']
+            assert LoadsMock.call_count == 2, LoadsMock.call_count
+            assert 'headers' not in Mock.call_args[1]
+            assert pbclient._opts['conditional'].unchanged == 1
+        finally:
+            pbclient._opts.pop('codec')
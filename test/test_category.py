@@ -21,7 +21,7 @@ from nose.tools import assert_raises
 
 
 class TestPybossaClientCategory(TestPyBossaClient):
-    @patch('pbclient.requests.get')
+    @patch('pbclient.requests.Session.get')
     def test_get_category_not_found(self, Mock):
         """Test get category not found works"""
         # App does not exist should return 404 error object
@@ -31,7 +31,7 @@ class TestPybossaClientCategory(TestPyBossaClient):
         err = self.client.get_category(1)
         self.check_error_output(err, not_found)
 
-    @patch('pbclient.requests.get')
+    @patch('pbclient.requests.Session.get')
     def test_get_category_found(self, Mock):
         """Test get category found works"""
         Mock.return_value = self.create_fake_request(self.category, 200)
@@ -39,7 +39,7 @@ class TestPybossaClientCategory(TestPyBossaClient):
         assert category.id == self.category['id'], category
         assert category.short_name == self.category['short_name'], category
 
-    @patch('pbclient.requests.get')
+    @patch('pbclient.requests.Session.get')
     def test_get_category_errors(self, Mock):
         """Test get category errors works"""
         targets = ['category']
@@ -56,7 +56,7 @@ class TestPybossaClientCategory(TestPyBossaClient):
                 err = self.client.get_category(1)
                 self.check_error_output(err_output, err)
 
-    @patch('pbclient.requests.get')
+    @patch('pbclient.requests.Session.get')
     def test_get_categories(self, Mock):
         """Test get_categories works"""
         Mock.return_value = self.create_fake_request([self.category], 200)
@@ -71,7 +71,7 @@ class TestPybossaClientCategory(TestPyBossaClient):
         categories = self.client.get_categories()
         assert len(categories) == 0, categories
 
-    @patch('pbclient.requests.get')
+    @patch('pbclient.requests.Session.get')
     def test_get_categories_with_keyset_pagination(self, Mock):
         """Test get_categories uses keyset pagination if a last_id argument is
         provided"""
@@ -81,15 +81,16 @@ class TestPybossaClientCategory(TestPyBossaClient):
         Mock.assert_called_once_with('http://localhost:5000/api/category',
                                      params={'limit': 3,
                                              'last_id': 1,
-                                             'api_key': 'tester'})
+                                             'api_key': 'tester'},
+                                     timeout=pbclient.DEFAULT_TIMEOUT)
 
-    @patch('pbclient.requests.get')
+    @patch('pbclient.requests.Session.get')
     def test_get_categories_error(self, Mock):
         """Test get_categories error works"""
         Mock.return_value = self.create_fake_request(self.category, 200)
         assert_raises(TypeError, self.client.get_categories)
 
-    @patch('pbclient.requests.get')
+    @patch('pbclient.requests.Session.get')
     def test_find_category(self, Mock):
         """Test find_category works"""
         Mock.return_value = self.create_fake_request([self.category], 200)
@@ -100,7 +101,7 @@ class TestPybossaClientCategory(TestPyBossaClient):
         assert category.id == self.category['id'], category
         assert category.short_name == self.category['short_name'], category
 
-    @patch('pbclient.requests.get')
+    @patch('pbclient.requests.Session.get')
     def test_find_category_errors(self, Mock):
         """Test find category errors works"""
         targets = ['category']
@@ -117,14 +118,14 @@ class TestPybossaClientCategory(TestPyBossaClient):
                 err = self.client.find_category(short_name=self.category['short_name'])
                 self.check_error_output(err_output, err)
 
-    @patch('pbclient.requests.get')
+    @patch('pbclient.requests.Session.get')
     def test_find_category_not_found(self, Mock):
         """Test find_category not found works"""
         Mock.return_value = self.create_fake_request([], 200)
         categories = self.client.find_category(short_name="foobar")
         assert len(categories) == 0, categories
 
-    @patch('pbclient.requests.post')
+    @patch('pbclient.requests.Session.post')
     def test_create_category(self, Mock):
         """Test create_category works"""
         Mock.return_value = self.create_fake_request(self.category, 200)
@@ -134,7 +135,7 @@ class TestPybossaClientCategory(TestPyBossaClient):
         assert category.id == self.category['id']
         assert category.short_name == self.category['short_name']
 
-    @patch('pbclient.requests.post')
+    @patch('pbclient.requests.Session.post')
     def test_create_category_exists(self, Mock):
         """Test create_category duplicate entry works"""
         already_exists = self.create_error_output(action='POST', status_code=415,
@@ -146,7 +147,7 @@ class TestPybossaClientCategory(TestPyBossaClient):
             description=self.category['description'])
         self.check_error_output(category, already_exists)
 
-    @patch('pbclient.requests.post')
+    @patch('pbclient.requests.Session.post')
     def test_create_category_not_allowed(self, Mock):
         """Test create_category not authorized works"""
         not_authorized = self.create_error_output(action='POST', status_code=401,
@@ -158,7 +159,7 @@ class TestPybossaClientCategory(TestPyBossaClient):
             description=self.category['description'])
         self.check_error_output(category, not_authorized)
 
-    @patch('pbclient.requests.post')
+    @patch('pbclient.requests.Session.post')
     def test_create_category_forbidden(self, Mock):
         """Test create_category not forbidden works"""
         forbidden = self.create_error_output(action='POST', status_code=403,
@@ -170,7 +171,7 @@ class TestPybossaClientCategory(TestPyBossaClient):
             description=self.category['description'])
         self.check_error_output(category, forbidden)
 
-    @patch('pbclient.requests.put')
+    @patch('pbclient.requests.Session.put')
     def test_update_category(self, Mock):
         """Test update_category works"""
         Mock.return_value = self.create_fake_request(self.category, 200)
@@ -178,7 +179,7 @@ class TestPybossaClientCategory(TestPyBossaClient):
         assert category.id == self.category['id'], category
         assert category.short_name == self.category['short_name'], category
 
-    @patch('pbclient.requests.put')
+    @patch('pbclient.requests.Session.put')
     def test_update_category_not_found(self, Mock):
         """Test update_category not found works"""
         not_found = self.create_error_output(action='PUT', status_code=404,
@@ -187,7 +188,7 @@ class TestPybossaClientCategory(TestPyBossaClient):
         err = self.client.update_category(pbclient.Project(self.category))
         self.check_error_output(not_found, err)
 
-    @patch('pbclient.requests.put')
+    @patch('pbclient.requests.Session.put')
     def test_update_category_forbidden(self, Mock):
         """Test update_category forbidden works"""
         forbidden = self.create_error_output(action='PUT', status_code=403,
@@ -196,7 +197,7 @@ class TestPybossaClientCategory(TestPyBossaClient):
         err = self.client.update_category(pbclient.Project(self.category))
         self.check_error_output(forbidden, err)
 
-    @patch('pbclient.requests.put')
+    @patch('pbclient.requests.Session.put')
     def test_update_category_unauthorized(self, Mock):
         """Test update_category unauthorized works"""
         unauthorized = self.create_error_output(action='PUT', status_code=401,
@@ -205,14 +206,14 @@ class TestPybossaClientCategory(TestPyBossaClient):
         err = self.client.update_category(pbclient.Project(self.category))
         self.check_error_output(unauthorized, err)
 
-    @patch('pbclient.requests.delete')
+    @patch('pbclient.requests.Session.delete')
     def test_delete_category(self, Mock):
         """Test delete_category works"""
         Mock.return_value = self.create_fake_request('', 204, 'text/html')
         res = self.client.delete_category(1)
         assert res is True, res
 
-    @patch('pbclient.requests.delete')
+    @patch('pbclient.requests.Session.delete')
     def test_delete_category(self, Mock):
         """Test delete_category error works"""
         Mock.return_value = self.create_fake_request('404', 404, 'text/html')
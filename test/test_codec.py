@@ -0,0 +1,148 @@
+# -*- coding: utf8 -*-
+# Copyright (C) 2013 Daniel Lombraña González
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import gzip
+import json
+
+import pbclient
+from mock import patch
+from base import TestPyBossaClient
+from pbclient import codec
+
+
+class TestPybossaClientCodec(TestPyBossaClient):
+
+    def tearDown(self):
+        pbclient._opts.pop('codec', None)
+
+    def installed_codecs(self):
+        for name in codec.PREFERENCE:
+            try:
+                yield codec.get_codec(name)
+            except ImportError:
+                pass
+
+    def test_codecs(self):
+        """Test every installed codec encodes and decodes bytes"""
+        data = [dict(self.taskrun, info={'text': u'caf\xe9'})]
+        for c in self.installed_codecs():
+            encoded = c.dumps(data)
+            assert isinstance(encoded, bytes), c.name
+            assert json.loads(encoded.decode('utf-8')) == data, c.name
+            assert c.loads(encoded) == data, c.name
+            assert c.loads(encoded.decode('utf-8')) == data, c.name
+
+    def test_codecs_stdlib_input(self):
+        """Test every installed codec encodes what the stdlib encodes"""
+        data = {1: 'a', 'big': 2 ** 70, 'info': {2.5: [-2 ** 65]}}
+        expected = json.loads(json.dumps(data))
+        for c in self.installed_codecs():
+            encoded = c.dumps(data)
+            assert json.loads(encoded.decode('utf-8')) == expected, c.name
+
+    @patch('pbclient.requests.Session.post')
+    def test_create_task_int_keys(self, Mock):
+        """Test create_task accepts info dicts with integer keys"""
+        Mock.return_value = self.create_fake_request(self.task, 200)
+        self.client.create_task(1, {1: 'a'})
+        body = Mock.call_args[1]['data']
+        assert json.loads(body.decode('utf-8'))['info'] == {'1': 'a'}
+
+    def test_default_codec(self):
+        """Test the fastest installed codec is used by default"""
+        names = [c.name for c in self.installed_codecs()]
+        assert codec.get_codec().name == names[0], names
+        assert codec.get_codec() is codec.get_codec()
+        assert names[-1] == 'json'
+
+    @patch('pbclient.requests.Session.post')
+    def test_codec_setting(self, Mock):
+        """Test the client encodes and decodes with the codec setting"""
+        class Codec(codec.JSONCodec):
+            name = 'custom'
+            calls = []
+
+            def loads(self, data):
+                self.calls.append(('loads', data))
+                return codec.JSONCodec.loads(self, data)
+
+            def dumps(self, obj):
+                self.calls.append(('dumps', obj))
+                return codec.JSONCodec.dumps(self, obj)
+        custom = Codec()
+        self.client.set('codec', custom)
+        Mock.return_value = self.create_fake_request(self.task, 200)
+        task = self.client.create_task(1, {'a': 1})
+        assert task.id == self.task['id'], task
+        assert [c[0] for c in custom.calls] == ['dumps', 'loads']
+        assert isinstance(custom.calls[1][1], bytes)
+        assert isinstance(Mock.call_args[1]['data'], bytes)
+        self.client.set('codec', 'json')
+        assert pbclient._default._codec().name == 'json'
+
+    def test_compress(self):
+        """Test bodies are gzipped from the threshold on"""
+        headers = {'content-type': 'application/json'}
+        body = json.dumps({'text': 'x' * 2000}).encode('utf-8')
+        assert codec.compress(body, headers, None) == (body, headers)
+        assert codec.compress(body, headers, 10 ** 6) == (body, headers)
+        small, small_headers = codec.compress(b'{}', headers, True)
+        assert small == b'{}' and small_headers is headers
+        data, gz_headers = codec.compress(body, headers, True)
+        assert gz_headers['Content-Encoding'] == 'gzip'
+        assert 'Content-Encoding' not in headers
+        assert len(data) < len(body) // 10
+        assert gzip.decompress(data) == body
+
+    @patch('pbclient.requests.Session.put')
+    @patch('pbclient.requests.Session.post')
+    def test_compress_setting(self, Mock, PutMock):
+        """Test the client gzips large JSON bodies with compress set"""
+        Mock.return_value = self.create_fake_request(self.task, 200)
+        PutMock.return_value = self.create_fake_request(self.task, 200)
+        self.client.set('compress', 1000)
+        try:
+            self.client.create_task(1, {'text': 'x' * 2000})
+            kwargs = Mock.call_args[1]
+            assert kwargs['headers']['Content-Encoding'] == 'gzip'
+            info = json.loads(gzip.decompress(kwargs['data']))['info']
+            assert info == {'text': 'x' * 2000}
+            self.client.update_task(pbclient.Task(dict(self.task)))
+            assert 'Content-Encoding' not in PutMock.call_args[1]['headers']
+        finally:
+            pbclient._opts.pop('compress')
+
+    def test_accept_encoding(self):
+        """Test the session negotiates the encodings it decodes"""
+        client = pbclient.PyBossaClient('http://localhost')
+        headers = client._get_session().headers
+        assert headers['Accept-Encoding'] == codec.ACCEPT_ENCODING
+        client = pbclient.PyBossaClient('http://localhost',
+                                        accept_encoding=None)
+        assert client._get_session().headers['Accept-Encoding'] == 'identity'
+
+    @patch('pbclient.requests.Session.send')
+    def test_accept_encoding_changed(self, Mock):
+        """Test changing accept_encoding applies to the open session"""
+        Mock.return_value = self.create_fake_request([self.task], 200)
+        client = pbclient.PyBossaClient('http://localhost', rate_limit=False)
+        client.find_tasks(1)
+        sent = Mock.call_args[0][0].headers
+        assert sent['Accept-Encoding'] == codec.ACCEPT_ENCODING, sent
+        client.set('accept_encoding', None)
+        client.find_tasks(1)
+        sent = Mock.call_args[0][0].headers
+        assert sent['Accept-Encoding'] == 'identity', sent
@@ -32,10 +32,66 @@ class TestPybossaClientDefaults(TestPyBossaClient):
     def test_domain_object(self):
         data = {'foo': 'bar'}
         obj = pbclient.DomainObject(data)
-        assert 'foo' in obj.__dict__['data'].keys()
-        assert obj.__dict__['data'] == data
+        assert 'foo' in obj.data.keys()
+        assert obj.data == data
         assert obj.foo == 'bar'
 
+    def test_domain_object_compact(self):
+        """Test objects with the same keys share one schema"""
+        first = pbclient.TaskRun({'id': 1, 'info': {'a': 1}})
+        second = pbclient.TaskRun({'id': 2, 'info': {'a': 2}})
+        assert not hasattr(first, '__dict__')
+        assert type(first) is type(second)
+        assert isinstance(first, pbclient.TaskRun)
+        assert second.id == 2 and second.info == {'a': 2}
+        second.id = 3
+        assert second.id == 3 and first.id == 1
+        assert second.data == {'id': 3, 'info': {'a': 2}}
+        second.data['id'] = 4
+        assert second.id == 4, second.data
+        assert_raises(AttributeError, setattr, first, 'bar', 'three')
+        assert_raises(AttributeError, getattr, first, 'bar')
+        odd = pbclient.Task({'data': 1, '_id': 2})
+        assert odd._fields is None and odd._id == 2
+
+    def test_domain_object_compact_class(self):
+        """Test the compact class of an object accepts any keys"""
+        task = pbclient.Task({'id': 1, 'info': 'a'})
+        swapped = type(task)({'info': 'b', 'id': 2})
+        assert swapped.id == 2 and swapped.info == 'b', swapped.data
+        assert type(swapped) is not type(task)
+        fewer = type(task)({'id': 3})
+        assert fewer.data == {'id': 3}
+        assert_raises(AttributeError, getattr, fewer, 'info')
+        odd = type(task)({'_id': 4})
+        assert odd._fields is None and odd._id == 4
+        assert isinstance(odd, pbclient.Task)
+
+    def test_domain_object_from_json(self):
+        """Test lazy objects parse their JSON when first read"""
+        obj = pbclient.Task.from_json(b'{"id": 1, "info": {"a": 1}}')
+        assert obj._raw is not None
+        assert obj.id == 1
+        assert obj._raw is None
+        assert obj.info == {'a': 1}
+        obj = pbclient.Task.from_json('{"id": 1}')
+        assert obj.data == {'id': 1}
+        obj = pbclient.Task.from_json('{"id": 1}')
+        obj.id = 2
+        assert obj.id == 2
+        assert_raises(AttributeError, getattr, obj, 'nonething')
+
+    def test_domain_object_pickle(self):
+        """Test objects can be pickled and copied"""
+        import copy
+        import pickle
+        obj = pbclient.Task({'id': 1, 'info': {'a': 1}})
+        clone = pickle.loads(pickle.dumps(obj))
+        assert isinstance(clone, pbclient.Task)
+        assert clone.data == obj.data
+        lazy = pbclient.Task.from_json('{"id": 2}')
+        assert copy.copy(lazy).id == 2
+
     def test_domain_object_data(self):
         obj = pbclient.DomainObject({})
         obj.data = {'foo': 'bar'}
@@ -85,3 +141,127 @@ class TestPybossaClientDefaults(TestPyBossaClient):
         new_taskrun = pbclient._forbidden_attributes(taskrun)
         for key in taskrun.reserved_keys.keys():
             assert key not in new_taskrun.data.keys()
+
+    def test_session_is_reused(self):
+        """Test the pooled session is shared between calls."""
+        pbclient.close()
+        session = pbclient._get_session()
+        assert pbclient._get_session() is session
+        pbclient.close()
+        assert pbclient._get_session() is not session
+
+    def test_session_settings(self):
+        """Test session settings are applied to a new session."""
+        pbclient.set('pool_maxsize', 3)
+        pbclient.set('keep_alive', False)
+        try:
+            session = pbclient._get_session()
+            adapter = session.get_adapter('http://localhost:5000')
+            assert adapter._pool_maxsize == 3, adapter._pool_maxsize
+            assert session.headers['Connection'] == 'close'
+        finally:
+            pbclient.set('pool_maxsize', 10)
+            pbclient.set('keep_alive', True)
+        assert pbclient._get_session().headers['Connection'] == 'keep-alive'
+
+    @patch('pbclient.requests.Session.get')
+    def test_requests_use_session(self, Mock):
+        """Test requests are sent through the pooled session."""
+        Mock.return_value = self.create_fake_request([], 200)
+        pbclient.find_tasks(1)
+        assert Mock.called
+
+    @patch('pbclient.requests.Session.get')
+    def test_client_instances(self, Mock):
+        """Test clients keep their own endpoint and credentials."""
+        Mock.return_value = self.create_fake_request([], 200)
+        one = pbclient.PyBossaClient('http://one', api_key='key1')
+        two = pbclient.PyBossaClient('http://two')
+        one.find_tasks(1)
+        Mock.assert_called_with('http://one/api/task',
+                                params={'api_key': 'key1', 'project_id': 1},
+                                timeout=pbclient.DEFAULT_TIMEOUT)
+        two.find_tasks(1)
+        Mock.assert_called_with('http://two/api/task',
+                                params={'project_id': 1},
+                                timeout=pbclient.DEFAULT_TIMEOUT)
+        assert one._get_session() is not two._get_session()
+
+    @patch('pbclient.requests.Session.get')
+    def test_client_does_not_share_params(self, Mock):
+        """Test the api_key is not leaked between requests."""
+        Mock.return_value = self.create_fake_request([], 200)
+        pbclient._pybossa_req('get', 'task')
+        pbclient.PyBossaClient('http://two')._req('get', 'task')
+        Mock.assert_called_with('http://two/api/task', params={},
+                                timeout=pbclient.DEFAULT_TIMEOUT)
+
+    def test_module_facade(self):
+        """Test module functions use the default client."""
+        assert pbclient._default.opts is pbclient._opts
+        assert pbclient.get_tasks.__doc__ == \
+            pbclient.PyBossaClient.get_tasks.__doc__
+        with patch.object(pbclient.PyBossaClient, 'get_tasks') as Mock:
+            pbclient.get_tasks(1, limit=5)
+            Mock.assert_called_once_with(1, limit=5)
+
+    @patch('pbclient.requests.Session.get')
+    def test_client_threads(self, Mock):
+        """Test a client can be used from many threads."""
+        from concurrent.futures import ThreadPoolExecutor
+        Mock.return_value = self.create_fake_request([self.task], 200)
+        client = pbclient.PyBossaClient('http://one', api_key='key1')
+        with ThreadPoolExecutor(8) as pool:
+            res = list(pool.map(client.find_tasks, range(50)))
+        assert all(r[0].id == self.task['id'] for r in res)
+        for call in Mock.call_args_list:
+            assert call[1]['params']['api_key'] == 'key1'
+
+    def test_prefetch(self):
+        """Test prefetch keeps the order of the items."""
+        assert list(pbclient._prefetch(iter(range(100)), 3)) == \
+            list(range(100))
+
+    def test_prefetch_errors(self):
+        """Test prefetch raises the errors of the producer."""
+        def pages():
+            yield 1
+            raise ValueError('boom')
+        items = pbclient._prefetch(pages(), 2)
+        assert next(items) == 1
+        assert_raises(ValueError, next, items)
+
+    def test_prefetch_early_close(self):
+        """Test prefetch stops the producer when the consumer stops."""
+        import threading
+        closed = threading.Event()
+
+        def pages():
+            try:
+                i = 0
+                while True:
+                    yield i
+                    i += 1
+            finally:
+                closed.set()
+        items = pbclient._prefetch(pages(), 2)
+        assert next(items) == 0
+        items.close()
+        assert closed.is_set()
+
+    def test_prefetch_slow_producer(self):
+        """Test prefetch does not wait for a slow item when closed."""
+        import threading
+        import time
+        release = threading.Event()
+
+        def pages():
+            yield 0
+            release.wait(10)
+            yield 1
+        items = pbclient._prefetch(pages(), 1)
+        assert next(items) == 0
+        started = time.time()
+        items.close()
+        assert time.time() - started < 2
+        release.set()
@@ -0,0 +1,102 @@
+# -*- coding: utf8 -*-
+# Copyright (C) 2015 Daniel Lombraña González
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import csv
+import gzip
+import io
+import json
+import os
+import shutil
+import tempfile
+from unittest import SkipTest
+
+import pbclient
+from mock import patch
+from base import TestPyBossaClient
+from nose.tools import assert_raises
+from pbclient.exporter import export_pages
+
+
+class TestPybossaClientExport(TestPyBossaClient):
+
+    def setUp(self):
+        super(TestPybossaClientExport, self).setUp()
+        self.tmp = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def pages(self, count=5, size=2):
+        return [[dict(self.taskrun, id=i * size + j, info={'answer': j})
+                 for j in range(size)] for i in range(count)]
+
+    @patch('pbclient.requests.Session.get')
+    def test_export_ndjson(self, Mock):
+        """Test export streams every page to a NDJSON file"""
+        pages = self.pages() + [[]]
+        Mock.side_effect = [self.create_fake_request(page, 200)
+                            for page in pages]
+        path = os.path.join(self.tmp, 'taskruns.ndjson')
+        result = self.client.export(1, 'taskrun', path, page_size=2)
+        assert result.rows == 10, result.rows
+        assert result.throughput > 0
+        with open(path) as f:
+            rows = [json.loads(line) for line in f]
+        assert [row['id'] for row in rows] == list(range(10))
+        assert Mock.call_args_list[0][1]['params']['project_id'] == 1
+        assert os.listdir(self.tmp) == ['taskruns.ndjson']
+
+    def test_export_csv_gzip(self):
+        """Test CSV exports flatten info and infer gzip from the path"""
+        path = os.path.join(self.tmp, 'taskruns.csv.gz')
+        result = export_pages(self.pages(), path, 'csv')
+        assert result.rows == 10
+        with gzip.open(path, 'rt') as f:
+            rows = list(csv.DictReader(f))
+        assert len(rows) == 10
+        assert rows[3]['info.answer'] == '1', rows[3]
+        assert rows[0]['id'] == '0'
+        path = os.path.join(self.tmp, 'fields.csv')
+        export_pages(self.pages(), path, 'csv', fields=['id', 'info'])
+        with open(path) as f:
+            rows = list(csv.reader(f))
+        assert rows[0] == ['id', 'info']
+        assert json.loads(rows[1][1]) == {'answer': 0}
+
+    def test_export_zstd(self):
+        """Test exports can be compressed with zstd"""
+        try:
+            import zstandard
+        except ImportError:  # pragma: no cover
+            raise SkipTest('zstandard is not installed')
+        path = os.path.join(self.tmp, 'taskruns.ndjson.zst')
+        export_pages(self.pages(), path)
+        with open(path, 'rb') as f:
+            reader = zstandard.ZstdDecompressor().stream_reader(f)
+            lines = io.TextIOWrapper(reader, encoding='utf-8').readlines()
+        assert len(lines) == 10
+
+    def test_export_errors(self):
+        """Test failed exports leave no file behind"""
+        def pages():
+            yield self.pages()[0]
+            raise pbclient.PyBossaError({'status': 'failed'})
+        path = os.path.join(self.tmp, 'taskruns.ndjson')
+        assert_raises(pbclient.PyBossaError, export_pages, pages(), path)
+        assert os.listdir(self.tmp) == []
+        assert_raises(ValueError, export_pages, [], path, 'xml')
+        assert_raises(ValueError, export_pages, [], path, 'csv', 'lz4')
+        assert os.listdir(self.tmp) == []
@@ -0,0 +1,87 @@
+# -*- coding: utf8 -*-
+# Copyright (C) 2015 Daniel Lombraña González
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+from unittest import SkipTest
+
+import pbclient
+from mock import patch
+from base import TestPyBossaClient
+from pbclient.frames import build_frame
+
+try:
+    import numpy
+    import pandas
+except ImportError:  # pragma: no cover
+    raise SkipTest('numpy and pandas are not installed')
+
+
+class TestPybossaClientFrames(TestPyBossaClient):
+
+    def test_build_frame_types(self):
+        """Test columns are flattened and typed from the first page"""
+        pages = [[{'id': 1, 'ok': True, 'score': 1, 'info': {'a': 'x'}},
+                  {'id': 2, 'ok': False, 'score': None, 'info': {'a': 'y'}}],
+                 [{'id': 3, 'ok': True, 'score': 2.5, 'info': {'b': 1}}]]
+        arrays = build_frame(pages, as_frame=False)
+        assert sorted(arrays) == ['id', 'info.a', 'ok', 'score'], arrays
+        assert arrays['id'].dtype == numpy.int64
+        assert arrays['id'].tolist() == [1, 2, 3]
+        assert arrays['ok'].dtype == bool
+        assert arrays['score'].dtype == numpy.float64
+        assert numpy.isnan(arrays['score'][1])
+        assert arrays['score'][2] == 2.5
+        assert arrays['info.a'].tolist() == ['x', 'y', None]
+
+    def test_build_frame_widens(self):
+        """Test columns widen when a later value does not fit"""
+        pages = [[{'n': 1, 'flag': True}],
+                 [{'n': 'many', 'flag': None}]]
+        arrays = build_frame(pages, as_frame=False)
+        assert arrays['n'].dtype == object
+        assert arrays['n'].tolist() == [1, 'many']
+        assert arrays['flag'].tolist() == [True, None]
+        assert build_frame([], as_frame=False) == {}
+
+    def test_build_frame_big_ints(self):
+        """Test int columns widen to objects beyond 64 bits"""
+        pages = [[{'n': 1}, {'n': None}], [{'n': 2 ** 70}]]
+        arrays = build_frame(pages, as_frame=False)
+        assert arrays['n'].dtype == object
+        assert arrays['n'].tolist() == [1, None, 2 ** 70]
+
+    @patch('pbclient.requests.Session.get')
+    def test_taskruns_frame(self, Mock):
+        """Test taskruns_frame returns the selected columns of every page"""
+        pages = [[dict(self.taskrun, id=4, info={'answer': 'yes'}),
+                  dict(self.taskrun, id=7, info={'answer': 'no'})], []]
+        Mock.side_effect = [self.create_fake_request(page, 200)
+                            for page in pages]
+        frame = self.client.taskruns_frame(1, fields=['id', 'info.answer'],
+                                           page_size=2)
+        assert isinstance(frame, pandas.DataFrame)
+        assert list(frame.columns) == ['id', 'info.answer']
+        assert frame['id'].tolist() == [4, 7]
+        assert frame['info.answer'].tolist() == ['yes', 'no']
+        params = Mock.call_args_list[0][1]['params']
+        assert params['project_id'] == 1, params
+
+    @patch('pbclient.requests.Session.get')
+    def test_results_frame(self, Mock):
+        """Test results_frame can return NumPy arrays"""
+        Mock.return_value = self.create_fake_request([self.result], 200)
+        arrays = pbclient.results_frame(1, as_frame=False, prefetch=0)
+        assert arrays['id'].tolist() == [self.result['id']]
+        assert arrays['task_run_ids'][0] == self.result['task_run_ids']
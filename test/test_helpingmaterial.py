@@ -21,7 +21,7 @@ from base import TestPyBossaClient
 
 class TestPybossaClientHelpingMaterial(TestPyBossaClient):
 
-    @patch('pbclient.requests.get')
+    @patch('pbclient.requests.Session.get')
     def test_get_helping_material(self, Mock):
         """Test get_helping_materials works."""
         Mock.return_value = self.create_fake_request([self.helping_material.copy()], 200)
@@ -30,7 +30,7 @@ class TestPybossaClientHelpingMaterial(TestPyBossaClient):
         hm = res[0]
         assert hm.project_id == self.project['id'], hm
 
-    @patch('pbclient.requests.get')
+    @patch('pbclient.requests.Session.get')
     def test_get_helping_materials_with_keyset_pagination(self, Mock):
         """Test get_helping_materials uses keyset pagination if a last_id argument is
         provided"""
@@ -41,9 +41,10 @@ class TestPybossaClientHelpingMaterial(TestPyBossaClient):
                                      params={'api_key': 'tester',
                                              'project_id': 1,
                                              'limit': 3,
-                                             'last_id': 1})
+                                             'last_id': 1},
+                                     timeout=pbclient.DEFAULT_TIMEOUT)
 
-    @patch('pbclient.requests.get')
+    @patch('pbclient.requests.Session.get')
     def test_get_helping_materials_errors(self, Mock):
         """Test get helping materials errors works."""
         targets = ['helpingmaterial']
@@ -60,7 +61,7 @@ class TestPybossaClientHelpingMaterial(TestPyBossaClient):
                 err = self.client.get_helping_materials(1)
                 self.check_error_output(err_output, err)
 
-    @patch('pbclient.requests.get')
+    @patch('pbclient.requests.Session.get')
     def test_find_helping_materials(self, Mock):
         """Test find_helping_materials works"""
         Mock.return_value = self.create_fake_request([self.helping_material.copy()], 200)
@@ -72,7 +73,7 @@ class TestPybossaClientHelpingMaterial(TestPyBossaClient):
         assert helping.info == self.helping_material['info'], helping
         assert helping.media_url == self.helping_material['media_url'], helping
 
-    @patch('pbclient.requests.get')
+    @patch('pbclient.requests.Session.get')
     def test_find_helping_materials_errors(self, Mock):
         """Test find helping materials errors works."""
         targets = ['helpingmaterial']
@@ -89,7 +90,7 @@ class TestPybossaClientHelpingMaterial(TestPyBossaClient):
                 err = self.client.find_helping_materials(1)
                 self.check_error_output(err_output, err)
 
-    @patch('pbclient.requests.put')
+    @patch('pbclient.requests.Session.put')
     def test_update_helping_material(self, Mock):
         """Test update_helping_material works"""
         Mock.return_value = self.create_fake_request(self.helping_material, 200)
@@ -98,7 +99,7 @@ class TestPybossaClientHelpingMaterial(TestPyBossaClient):
         assert helping.project_id == self.helping_material['project_id'], helping
         assert helping.info == self.helping_material['info'], helping.info
 
-    @patch('pbclient.requests.put')
+    @patch('pbclient.requests.Session.put')
     def test_update_helping_material_errors(self, Mock):
         """Test update helping_material errors works"""
         targets = ['helpingmaterial']
@@ -0,0 +1,162 @@
+# -*- coding: utf8 -*-
+# Copyright (C) 2015 Daniel Lombraña González
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pbclient
+import requests
+from base import TestPyBossaClient
+from mock import patch
+from pbclient.cache import ConditionalCache, TTLCache
+from pbclient.hooks import RequestHook
+from pbclient.retry import Retry
+
+
+class Recorder(RequestHook):
+
+    def __init__(self):
+        self.events = []
+
+    def before_request(self, info):
+        self.events.append(('before', info.method, info.domain, info.id,
+                            info.attempt))
+
+    def after_request(self, info):
+        self.events.append(('after', info))
+
+
+class TestPybossaClientHooks(TestPyBossaClient):
+
+    def setUp(self):
+        super(TestPybossaClientHooks, self).setUp()
+        self.hook = self.client.add_hook(Recorder())
+
+    def tearDown(self):
+        self.client.remove_hook(self.hook)
+        pbclient._opts.pop('cache', None)
+        pbclient._opts.pop('conditional', None)
+        pbclient._opts.pop('retry', None)
+
+    def after(self):
+        return [event[1] for event in self.hook.events
+                if event[0] == 'after']
+
+    @patch('pbclient.requests.Session.get')
+    def test_hooks(self, Mock):
+        """Test hooks are called before and after every request"""
+        Mock.return_value = self.create_fake_request(self.project, 200)
+        self.client.get_project(1)
+        assert self.hook.events[0] == ('before', 'get', 'project', 1, 1)
+        info, = self.after()
+        assert info.status_code == 200, info
+        assert info.bytes_received == len(json.dumps(self.project))
+        assert info.bytes_sent == 0 and info.cached is None
+        assert info.elapsed >= info.server + info.decode > 0, info
+        self.client.remove_hook(self.hook)
+        self.client.get_project(1)
+        assert len(self.hook.events) == 2, self.hook.events
+
+    @patch('pbclient.time.sleep')
+    @patch('pbclient.requests.Session.get')
+    def test_hooks_attempts(self, Mock, sleep):
+        """Test hooks see every attempt and failure"""
+        error = self.create_error_output('GET', 502, 'task', 'BadGateway')
+        Mock.side_effect = [requests.ConnectionError('down'),
+                            self.create_fake_request(error, 502),
+                            self.create_fake_request([self.task], 200)]
+        self.client.find_tasks(1)
+        infos = self.after()
+        assert [i.attempt for i in infos] == [1, 2, 3], infos
+        assert [i.status_code for i in infos] == [None, 502, 200], infos
+        assert isinstance(infos[0].error, requests.ConnectionError)
+        self.client.set('retry', None)
+        Mock.side_effect = requests.ConnectionError('down')
+        try:
+            self.client.find_tasks(1)
+        except requests.ConnectionError:
+            pass
+        assert self.after()[-1].error is not None
+
+    @patch('pbclient.requests.Session.get')
+    def test_hooks_attempts_elapsed(self, Mock):
+        """Test the time of an attempt leaves out the wait before a retry"""
+        self.client.set('retry', Retry(backoff_factor=0.2, jitter=False))
+        error = self.create_error_output('GET', 503, 'task',
+                                         'ServiceUnavailable')
+        Mock.side_effect = [self.create_fake_request(error, 503),
+                            self.create_fake_request([self.task], 200)]
+        self.client.find_tasks(1)
+        first, second = self.after()
+        assert first.status_code == 503 and second.status_code == 200
+        assert first.elapsed < 0.1, first.elapsed
+
+    @patch('pbclient.requests.Session.get')
+    def test_hooks_cached(self, Mock):
+        """Test hooks report the reads served by a cache"""
+        self.client.set('cache', TTLCache())
+        Mock.return_value = self.create_fake_request(self.task, 200)
+        self.client.get_task(1)
+        self.client.get_task(1)
+        assert [i.cached for i in self.after()] == [None, 'cache']
+        assert self.hook.events[-2] == ('before', 'get', 'task', 1, 0)
+        self.client.set('cache', None)
+        self.client.set('conditional', ConditionalCache())
+        Mock.side_effect = [
+            self.create_fake_request([self.task], 200, {'ETag': '"v1"'}),
+            self.create_fake_request('', 304, {'ETag': '"v1"'}),
+            self.create_fake_request([self.task], 200)]
+        for _ in range(3):
+            self.client.find_tasks(1)
+        assert [i.cached for i in self.after()[2:]] == [
+            None, 'not_modified', 'unchanged'], self.after()
+
+    def test_hooks_connect(self):
+        """Test hooks time the connection of new sockets only"""
+        class Handler(BaseHTTPRequestHandler):
+
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                body = b'{"id": 1}'
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        server = HTTPServer(('127.0.0.1', 0), Handler)
+        threading.Thread(target=server.serve_forever).start()
+        client = pbclient.PyBossaClient(
+            'http://127.0.0.1:%d' % server.server_address[1],
+            rate_limit=False)
+        hook = client.add_hook(Recorder())
+        try:
+            client.get_project(1)
+            client.get_project(1)
+        finally:
+            client.close()
+            server.shutdown()
+            server.server_close()
+        first, second = [event[1] for event in hook.events
+                         if event[0] == 'after']
+        assert first.connect > 0 and second.connect == 0, (first, second)
+        assert first.bytes_received == second.bytes_received == 9
+        assert second.elapsed >= second.server + second.transfer
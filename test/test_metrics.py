@@ -0,0 +1,102 @@
+# -*- coding: utf8 -*-
+# Copyright (C) 2015 Daniel Lombraña González
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import os
+import shutil
+import tempfile
+
+import pbclient
+from base import TestPyBossaClient
+from mock import patch
+from pbclient.cache import TTLCache
+from pbclient.metrics import Histogram
+
+
+class TestPybossaClientMetrics(TestPyBossaClient):
+
+    def setUp(self):
+        super(TestPybossaClientMetrics, self).setUp()
+        self.metrics = self.client.add_hook(pbclient.Metrics())
+
+    def tearDown(self):
+        self.client.remove_hook(self.metrics)
+        pbclient._opts.pop('cache', None)
+
+    def test_histogram(self):
+        """Test the histogram percentiles are within a bucket"""
+        histogram = Histogram()
+        for ms in range(1, 1001):
+            histogram.record(ms / 1000.0)
+        summary = histogram.summary()
+        assert summary['count'] == 1000 and summary['max'] == 1.0
+        for name, exact in (('p50', 0.5), ('p95', 0.95), ('p99', 0.99)):
+            assert exact <= summary[name] <= exact * 1.19, summary
+        assert Histogram.bucket(Histogram.upper(8)) == 8
+        assert Histogram.bucket(0) == 0
+        assert histogram.cumulative([0, 40, 52, 80]) == [0, 102, 819, 1000]
+        assert Histogram().percentile(0.5) is None
+
+    @patch('pbclient.requests.Session.get')
+    def test_metrics(self, Mock):
+        """Test the registry counts requests, errors and cached reads"""
+        self.client.set('cache', TTLCache())
+        error = self.create_error_output('GET', 404, 'task', 'NotFound')
+        Mock.side_effect = [self.create_fake_request(self.task, 200),
+                            self.create_fake_request(error, 404)]
+        self.client.get_task(1)
+        self.client.get_task(1)
+        self.client.get_task(2)
+        snapshot = self.metrics.snapshot()
+        assert snapshot['requests'] == {'task': {'get': 2}}, snapshot
+        assert snapshot['errors'] == {'task': {'get': {'404': 1}}}
+        assert snapshot['cached'] == {'task': {'get': {'cache': 1}}}
+        assert snapshot['bytes_received']['task']['get'] > 0
+        latency = snapshot['latency']['task']['get']
+        assert latency['count'] == 2 and latency['p99'] >= latency['p50']
+        self.metrics.reset()
+        assert self.metrics.snapshot()['requests'] == {}
+
+    @patch('pbclient.requests.Session.get')
+    def test_prometheus(self, Mock):
+        """Test the metrics render in the Prometheus text format"""
+        Mock.return_value = self.create_fake_request([self.task], 200)
+        for _ in range(3):
+            self.client.find_tasks(1)
+        text = self.metrics.to_prometheus()
+        lines = text.splitlines()
+        assert '# TYPE pybossa_client_requests_total counter' in lines
+        assert 'pybossa_client_requests_total{domain="task",method="get"} 3' \
+            in lines
+        assert '# TYPE pybossa_client_request_duration_seconds histogram' \
+            in lines
+        buckets = [line for line in lines if '_bucket{' in line]
+        counts = [int(line.rsplit(' ', 1)[1]) for line in buckets]
+        assert counts == sorted(counts) and counts[-1] == 3, buckets
+        assert buckets[0].startswith(
+            'pybossa_client_request_duration_seconds_bucket'
+            '{domain="task",method="get",le="0.0001"}'), buckets[0]
+        assert buckets[-1].endswith('le="+Inf"} 3'), buckets[-1]
+        assert ('pybossa_client_request_duration_seconds_count'
+                '{domain="task",method="get"} 3') in lines
+        tmp = tempfile.mkdtemp()
+        try:
+            path = os.path.join(tmp, 'pbclient.prom')
+            self.metrics.write_prometheus(path, prefix='job')
+            with open(path) as f:
+                assert f.read().startswith('# HELP job_requests_total')
+            assert os.listdir(tmp) == ['pbclient.prom']
+        finally:
+            shutil.rmtree(tmp)
@@ -0,0 +1,133 @@
+# -*- coding: utf8 -*-
+# Copyright (C) 2015 Daniel Lombraña González
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import os
+import shutil
+import tempfile
+
+import pbclient
+from mock import patch
+from base import TestPyBossaClient
+from nose.tools import assert_raises
+from pbclient.mirror import Mirror
+
+
+class TestPybossaClientMirror(TestPyBossaClient):
+
+    def setUp(self):
+        super(TestPybossaClientMirror, self).setUp()
+        self.tmp = tempfile.mkdtemp()
+        self.mirror = Mirror(os.path.join(self.tmp, 'mirror.db'))
+        self.data = dict(task={}, taskrun={}, result={}, helpingmaterial={})
+        self.requests = []
+
+    def tearDown(self):
+        self.mirror.close()
+        shutil.rmtree(self.tmp)
+
+    def add(self, domain, id, **fields):
+        self.data[domain][id] = dict(id=id, project_id=1, **fields)
+
+    def fake_server(self):
+        """Return a fake Session.get serving self.data."""
+        def get(url, params, timeout):
+            path = url.split('/api/')[1].split('/')
+            domain = path[0]
+            self.requests.append((domain, dict(params)))
+            if len(path) == 2:
+                item = self.data[domain].get(int(path[1]))
+                if item is None:
+                    return self.create_fake_request(
+                        dict(status='failed', status_code=404), 404)
+                return self.create_fake_request(item, 200)
+            last_id = params.get('last_id', 0)
+            page = [item for id, item in sorted(self.data[domain].items())
+                    if id > last_id and
+                    all(item.get(key) == params[key] for key in params
+                        if key in ('project_id', 'task_id'))]
+            return self.create_fake_request(page[:params['limit']], 200)
+        return get
+
+    @patch('pbclient.requests.Session.get')
+    def test_sync_incremental(self, Mock):
+        """Test syncs only download new and changed objects"""
+        Mock.side_effect = self.fake_server()
+        for id in (1, 2, 3):
+            self.add('task', id, state='ongoing')
+        self.add('taskrun', 10, task_id=1)
+        stats = self.mirror.sync(1, page_size=2)
+        assert stats['task'] == dict(new=3, refreshed=0), stats
+        assert stats['taskrun'] == dict(new=1, refreshed=0), stats
+        assert self.mirror.last_id(1, 'task') == 3
+        assert self.mirror.count('task', project_id=1) == 3
+
+        # Nothing new: one request per domain.
+        del self.requests[:]
+        stats = self.mirror.sync(1, page_size=2)
+        assert all(s == dict(new=0, refreshed=0) for s in stats.values())
+        assert len(self.requests) == 4, self.requests
+        assert self.requests[0][1]['last_id'] == 10
+
+        # A new task run completes task 2, and a new result version
+        # replaces the first one of task 1.
+        self.add('taskrun', 11, task_id=2)
+        self.data['task'][2]['state'] = 'completed'
+        self.add('task', 4, state='ongoing')
+        self.add('result', 20, task_id=1, last_version=True)
+        self.mirror.sync(1)
+        self.data['result'][20]['last_version'] = False
+        self.add('result', 21, task_id=1, last_version=True)
+        del self.requests[:]
+        stats = self.mirror.sync(1)
+        assert stats['result'] == dict(new=1, refreshed=2), stats
+        tasks = list(self.mirror.find('task', state='completed'))
+        assert [task.id for task in tasks] == [2], tasks
+        assert isinstance(tasks[0], pbclient.Task)
+        results = list(self.mirror.find('result', last_version=True))
+        assert [result.id for result in results] == [21]
+        assert self.mirror.count('task') == 4
+
+    @patch('pbclient.requests.Session.get')
+    def test_sync_refresh_deleted(self, Mock):
+        """Test refreshed tasks deleted on the server are dropped"""
+        Mock.side_effect = self.fake_server()
+        self.add('task', 1, state='ongoing')
+        self.add('task', 2, state='ongoing')
+        self.mirror.sync(1)
+        self.add('taskrun', 10, task_id=1)
+        del self.data['task'][1]
+        stats = self.mirror.sync(1)
+        assert stats['task'] == dict(new=0, refreshed=0), stats
+        assert [task.id for task in self.mirror.find('task')] == [2]
+
+    @patch('pbclient.requests.Session.get')
+    def test_sync_full(self, Mock):
+        """Test full syncs download everything again"""
+        Mock.side_effect = self.fake_server()
+        self.add('result', 1, task_id=1, info=None)
+        self.mirror.sync(1, domains=['result'])
+        self.data['result'][1]['info'] = {'answer': 'yes'}
+        self.mirror.sync(1, domains=['result'])
+        assert next(self.mirror.find('result')).info is None
+        stats = self.mirror.sync(1, domains=['result'], full=True)
+        assert stats == dict(result=dict(new=1, refreshed=0)), stats
+        assert next(self.mirror.find('result')).info == {'answer': 'yes'}
+
+    def test_errors(self):
+        """Test unknown domains and members are rejected"""
+        assert_raises(ValueError, self.mirror.sync, 1, ['project'])
+        assert_raises(ValueError, self.mirror.count, 'task', **{'a b': 1})
+        assert_raises(ValueError, list, self.mirror.find('user'))
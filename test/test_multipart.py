@@ -0,0 +1,198 @@
+# -*- coding: utf8 -*-
+# Copyright (C) 2015 Daniel Lombraña González
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import email
+import io
+import json
+import mmap
+import os
+import pathlib
+import shutil
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pbclient
+from base import TestPyBossaClient
+from mock import patch
+from pbclient.multipart import MultipartEncoder
+
+
+def parse(body):
+    """Return the parts of a multipart body by field name."""
+    message = email.message_from_bytes(
+        b'Content-Type: ' + body.content_type.encode('ascii') + b'\r\n\r\n' +
+        body.read())
+    return dict((part.get_param('name', header='content-disposition'), part)
+                for part in message.get_payload())
+
+
+class TestPybossaClientMultipart(TestPyBossaClient):
+
+    def setUp(self):
+        super(TestPybossaClientMultipart, self).setUp()
+        self.tmp = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp, 'tutorial.mp4')
+        self.data = os.urandom(300000)
+        with open(self.path, 'wb') as f:
+            f.write(self.data)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def test_encode(self):
+        """Test MultipartEncoder encodes fields and files"""
+        body = MultipartEncoder({'project_id': 1},
+                                {'file': io.BytesIO(b'hello')})
+        size = len(body)
+        parts = parse(body)
+        assert body.sent == size, (body.sent, size)
+        assert parts['project_id'].get_payload() == '1'
+        assert parts['file'].get_payload(decode=True) == b'hello'
+        assert parts['file'].get_filename() == 'file'
+
+    def test_path(self):
+        """Test MultipartEncoder streams a path and closes it"""
+        calls = []
+        with MultipartEncoder({'project_id': 1}, {'file': self.path},
+                              lambda sent, total: calls.append(sent),
+                              chunk_size=4096) as body:
+            fileobj = body._opened[0]
+            chunks = list(body)
+            body.rewind()
+            part = parse(body)['file']
+        assert fileobj.closed
+        assert max(len(chunk) for chunk in chunks) == 4096
+        assert len(b''.join(chunks)) == len(body)
+        assert calls[-1] == len(body), calls
+        assert part.get_filename() == 'tutorial.mp4'
+        assert part.get_content_type() == 'video/mp4'
+        assert part.get_payload(decode=True) == self.data
+
+    def test_pathlib(self):
+        """Test MultipartEncoder opens path-like objects"""
+        with MultipartEncoder(files={'file': pathlib.Path(self.path)}) as body:
+            fileobj = body._opened[0]
+            part = parse(body)['file']
+        assert fileobj.closed
+        assert part.get_filename() == 'tutorial.mp4'
+        assert part.get_payload(decode=True) == self.data
+
+    def test_mmap(self):
+        """Test MultipartEncoder streams a memory-mapped file"""
+        with open(self.path, 'rb') as f:
+            m = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            try:
+                body = MultipartEncoder(files={'file': m})
+                assert parse(body)['file'].get_payload(decode=True) == \
+                    self.data
+                body.close()
+                assert not m.closed
+            finally:
+                m.close()
+
+    def test_rewind(self):
+        """Test MultipartEncoder sends the same body after a rewind"""
+        body = MultipartEncoder({'a': 'b'}, {'file': self.path})
+        first = body.read(1000) + body.read()
+        body.rewind()
+        assert body.read() == first
+        body.close()
+
+    def test_missing_path(self):
+        """Test MultipartEncoder closes the files opened on error"""
+        opened = []
+        real_open = open
+
+        def fake_open(*args):
+            f = real_open(*args)
+            opened.append(f)
+            return f
+
+        with patch('pbclient.multipart.open', fake_open, create=True):
+            try:
+                MultipartEncoder(files={'a': self.path,
+                                        'b': self.path + '.missing'})
+            except IOError:
+                pass
+            else:  # pragma: no cover
+                raise AssertionError('missing file not reported')
+        assert opened and all(f.closed for f in opened)
+
+    @patch('pbclient.requests.Session.post')
+    def test_create_helpingmaterial(self, Mock):
+        """Test create_helpingmaterial streams the file and closes it"""
+        bodies = []
+
+        def post(url, params=None, data=None, headers=None, timeout=None):
+            bodies.append((data, data._opened[0], data.read()))
+            return self.create_fake_request(
+                dict(self.helping_material, id=1), 200)
+
+        Mock.side_effect = post
+        progress = []
+        res = self.client.create_helpingmaterial(
+            1, {}, file_path=self.path,
+            progress=lambda sent, total: progress.append((sent, total)))
+        assert res.id == 1, res
+        body, fileobj, sent = bodies[0]
+        assert fileobj.closed
+        assert Mock.call_args[1]['headers'] == {
+            'Content-Type': body.content_type}
+        assert len(sent) == len(body) and progress[-1][0] == len(body)
+
+    def test_upload(self):
+        """Test create_helpingmaterial uploads with a Content-Length"""
+        received = []
+
+        class Handler(BaseHTTPRequestHandler):
+
+            def do_POST(self):
+                length = int(self.headers['Content-Length'])
+                received.append((self.headers, self.rfile.read(length)))
+                body = json.dumps(dict(id=1, project_id=1)).encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        server = HTTPServer(('127.0.0.1', 0), Handler)
+        threading.Thread(target=server.serve_forever).start()
+        client = pbclient.PyBossaClient(
+            'http://127.0.0.1:%d' % server.server_address[1],
+            rate_limit=False)
+        try:
+            with open(self.path, 'rb') as f:
+                res = client.create_helpingmaterial(1, {}, file_path=f)
+                assert not f.closed
+        finally:
+            client.close()
+            server.shutdown()
+            server.server_close()
+        assert res.id == 1, res
+        headers, raw = received[0]
+        assert 'Transfer-Encoding' not in headers
+        message = email.message_from_bytes(
+            b'Content-Type: ' + headers['Content-Type'].encode('ascii') +
+            b'\r\n\r\n' + raw)
+        file_part, = [part for part in message.get_payload()
+                      if part.get_filename()]
+        assert file_part.get_filename() == 'tutorial.mp4'
+        assert file_part.get_payload(decode=True) == self.data
@@ -22,7 +22,7 @@ from nose.tools import assert_raises
 
 class TestPybossaClientProject(TestPyBossaClient):
 
-    @patch('pbclient.requests.get')
+    @patch('pbclient.requests.Session.get')
     def test_get_project_not_found(self, Mock):
         """Test get_project not found works"""
         # Project does not exist should return 404 error object
@@ -34,7 +34,7 @@ class TestPybossaClientProject(TestPyBossaClient):
         err = self.client.get_project(1)
         self.check_error_output(err, not_found)
 
-    @patch('pbclient.requests.get')
+    @patch('pbclient.requests.Session.get')
     def test_get_project_found(self, Mock):
         """Test get_project found works"""
         Mock.return_value = self.create_fake_request(self.project, 200)
@@ -42,7 +42,7 @@ class TestPybossaClientProject(TestPyBossaClient):
         assert project.id == self.project['id'], project
         assert project.short_name == self.project['short_name'], project
 
-    @patch('pbclient.requests.get')
+    @patch('pbclient.requests.Session.get')
     def test_get_project_errors(self, Mock):
         """Test get project errors works"""
         targets = ['project']
@@ -59,7 +59,7 @@ class TestPybossaClientProject(TestPyBossaClient):
                 err = self.client.get_project(1)
                 self.check_error_output(err_output, err)
 
-    @patch('pbclient.requests.get')
+    @patch('pbclient.requests.Session.get')
     def test_get_projects(self, Mock):
         """Test get_projects works"""
         Mock.return_value = self.create_fake_request([self.project], 200)
@@ -74,7 +74,7 @@ class TestPybossaClientProject(TestPyBossaClient):
         projects = self.client.get_projects()
         assert len(projects) == 0, projects
 
-    @patch('pbclient.requests.get')
+    @patch('pbclient.requests.Session.get')
     def test_get_projects_with_keyset_pagination(self, Mock):
         """Test get_projects uses keyset pagination if a last_id argument is
         provided"""
@@ -84,15 +84,16 @@ class TestPybossaClientProject(TestPyBossaClient):
         Mock.assert_called_once_with('http://localhost:5000/api/project',
                                      params={'limit': 3,
                                              'last_id': 1,
-                                             'api_key': 'tester'})
+                                             'api_key': 'tester'},
+                                     timeout=pbclient.DEFAULT_TIMEOUT)
 
-    @patch('pbclient.requests.get')
+    @patch('pbclient.requests.Session.get')
     def test_get_projects_raises_error_if_not_list(self, Mock):
         """Test get_projects only accepts lists of projects from the server"""
         Mock.return_value = self.create_fake_request(self.project, 200)
         assert_raises(TypeError, self.client.get_projects)
 
-    @patch('pbclient.requests.get')
+    @patch('pbclient.requests.Session.get')
     def test_find_project(self, Mock):
         """Test find_project works"""
         Mock.return_value = self.create_fake_request([self.project], 200)
@@ -103,7 +104,7 @@ class TestPybossaClientProject(TestPyBossaClient):
         assert project.id == self.project['id'], project
         assert project.short_name == self.project['short_name'], project
 
-    @patch('pbclient.requests.get')
+    @patch('pbclient.requests.Session.get')
     def test_find_project_errors(self, Mock):
         """Test find project errors works"""
         targets = ['project']
@@ -120,14 +121,14 @@ class TestPybossaClientProject(TestPyBossaClient):
                 err = self.client.find_project(short_name=self.project['short_name'])
                 self.check_error_output(err_output, err)
 
-    @patch('pbclient.requests.get')
+    @patch('pbclient.requests.Session.get')
     def test_find_project_not_found(self, Mock):
         """Test find_project not found works"""
         Mock.return_value = self.create_fake_request([], 200)
         projects = self.client.find_project(short_name="foobar")
         assert len(projects) == 0, projects
 
-    @patch('pbclient.requests.post')
+    @patch('pbclient.requests.Session.post')
     def test_create_project(self, Mock):
         """Test create_project works"""
         Mock.return_value = self.create_fake_request(self.project, 200)
@@ -137,7 +138,7 @@ class TestPybossaClientProject(TestPyBossaClient):
         assert project.id == self.project['id']
         assert project.short_name == self.project['short_name']
 
-    @patch('pbclient.requests.post')
+    @patch('pbclient.requests.Session.post')
     def test_create_project_exists(self, Mock):
         """Test create_project duplicate entry works"""
         already_exists = self.create_error_output(action='POST', status_code=415,
@@ -149,7 +150,7 @@ class TestPybossaClientProject(TestPyBossaClient):
                                      description=self.project['description'])
         self.check_error_output(project, already_exists)
 
-    @patch('pbclient.requests.post')
+    @patch('pbclient.requests.Session.post')
     def test_create_project_not_allowed(self, Mock):
         """Test create_project not authorized works"""
         not_authorized = self.create_error_output(action='POST', status_code=401,
@@ -161,7 +162,7 @@ class TestPybossaClientProject(TestPyBossaClient):
                                      description=self.project['description'])
         self.check_error_output(project, not_authorized)
 
-    @patch('pbclient.requests.post')
+    @patch('pbclient.requests.Session.post')
     def test_create_project_forbidden(self, Mock):
         """Test create_project not forbidden works"""
         forbidden = self.create_error_output(action='POST', status_code=403,
@@ -173,7 +174,7 @@ class TestPybossaClientProject(TestPyBossaClient):
                                      description=self.project['description'])
         self.check_error_output(project, forbidden)
 
-    @patch('pbclient.requests.put')
+    @patch('pbclient.requests.Session.put')
     def test_update_project(self, Mock):
         """Test update_project works"""
         Mock.return_value = self.create_fake_request(self.project, 200)
@@ -182,7 +183,7 @@ class TestPybossaClientProject(TestPyBossaClient):
         assert u_project.id == self.project['id'], project
         assert u_project.short_name == self.project['short_name'], project
 
-    @patch('pbclient.requests.put')
+    @patch('pbclient.requests.Session.put')
     def test_update_project_400(self, Mock):
         """Test update_project does not allow reserved attributes works"""
         bad_request= self.create_error_output(action='PUT',
@@ -193,7 +194,7 @@ class TestPybossaClientProject(TestPyBossaClient):
         err = self.client.update_project(pbclient.Project(self.project.copy()))
         self.check_error_output(bad_request, err)
 
-    @patch('pbclient.requests.put')
+    @patch('pbclient.requests.Session.put')
     def test_update_project_not_found(self, Mock):
         """Test update_project not found works"""
         not_found = self.create_error_output(action='PUT', status_code=404,
@@ -202,7 +203,7 @@ class TestPybossaClientProject(TestPyBossaClient):
         err = self.client.update_project(pbclient.Project(self.project.copy()))
         self.check_error_output(not_found, err)
 
-    @patch('pbclient.requests.put')
+    @patch('pbclient.requests.Session.put')
     def test_update_project_forbidden(self, Mock):
         """Test update_project forbidden works"""
         forbidden = self.create_error_output(action='PUT', status_code=403,
@@ -212,7 +213,7 @@ class TestPybossaClientProject(TestPyBossaClient):
         err = self.client.update_project(project)
         self.check_error_output(forbidden, err)
 
-    @patch('pbclient.requests.put')
+    @patch('pbclient.requests.Session.put')
     def test_update_project_unauthorized(self, Mock):
         """Test update_project unauthorized works"""
         unauthorized = self.create_error_output(action='PUT', status_code=401,
@@ -222,7 +223,7 @@ class TestPybossaClientProject(TestPyBossaClient):
         err = self.client.update_project(project)
         self.check_error_output(unauthorized, err)
 
-    @patch('pbclient.requests.delete')
+    @patch('pbclient.requests.Session.delete')
     def test_delete_project(self, Mock):
         """Test delete_project works"""
         Mock.return_value = self.create_fake_request('', 204, 'text/html')
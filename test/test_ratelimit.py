@@ -0,0 +1,122 @@
+# -*- coding: utf8 -*-
+# Copyright (C) 2013 Daniel Lombraña González
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import time
+
+import pbclient
+from mock import patch
+from base import TestPyBossaClient
+from pbclient import ratelimit
+from pbclient.ratelimit import RateLimiter, get_limiter
+
+
+def limit_headers(remaining, reset_in):
+    return {'content-type': 'application/json',
+            'X-RateLimit-Limit': '300',
+            'X-RateLimit-Remaining': str(remaining),
+            'X-RateLimit-Reset': str(int(time.time() + reset_in))}
+
+
+class TestPybossaClientRateLimit(TestPyBossaClient):
+
+    def setUp(self):
+        super(TestPybossaClientRateLimit, self).setUp()
+        ratelimit._limiters.clear()
+        self.client.reset_stats()
+
+    def tearDown(self):
+        ratelimit._limiters.clear()
+
+    def test_no_headers(self):
+        """Test requests are not paced before the limits are known"""
+        limiter = RateLimiter()
+        assert [limiter.reserve() for _ in range(100)] == [0] * 100
+
+    def test_pacing(self):
+        """Test requests are spread over the remaining window"""
+        limiter = RateLimiter(margin=0, burst=1)
+        limiter.update(200, limit_headers(remaining=10, reset_in=100))
+        assert abs(limiter.rate - 0.1) < 0.01, limiter.rate
+        delays = [limiter.reserve() for _ in range(4)]
+        assert delays[0] == 0, delays
+        for previous, delay in zip(delays, delays[1:]):
+            assert 9 < delay - previous < 11, delays
+
+    def test_margin(self):
+        """Test the margin keeps some requests of the window unused"""
+        limiter = RateLimiter(margin=5, burst=10)
+        limiter.update(200, limit_headers(remaining=7, reset_in=60))
+        assert limiter.tokens == 2, limiter.tokens
+
+    def test_too_many_requests(self):
+        """Test a 429 blocks every caller until the window resets"""
+        limiter = RateLimiter()
+        limiter.update(429, {'Retry-After': '30'})
+        assert 29 < limiter.reserve() <= 30
+        assert 29 < limiter.reserve() <= 30
+
+    def test_shared_limiter(self):
+        """Test clients with the same API key share one limiter"""
+        assert get_limiter('http://a', 'key') is get_limiter('http://a', 'key')
+        assert get_limiter('http://a', 'key') is not \
+            get_limiter('http://a', 'other')
+        one = pbclient.PyBossaClient('http://a', api_key='key')
+        two = pbclient.PyBossaClient('http://a', api_key='key')
+        assert one._rate_limiter() is two._rate_limiter()
+        one.set('rate_limit', False)
+        assert one._rate_limiter() is None
+
+    @patch('pbclient.time.sleep')
+    @patch('pbclient.requests.Session.get')
+    def test_wait_out_429(self, Mock, sleep):
+        """Test 429 answers are waited out and the request sent again"""
+        error = self.create_error_output('GET', 429, 'task',
+                                         'TooManyRequests')
+        Mock.side_effect = [
+            self.create_fake_request(error, 429, {'Retry-After': '2'}),
+            self.create_fake_request([self.task], 200,
+                                     limit_headers(100, 60))]
+        tasks = self.client.find_tasks(1)
+        assert tasks[0].id == self.task['id'], tasks
+        assert Mock.call_count == 2, Mock.call_count
+        assert 1 < sleep.call_args[0][0] <= 2, sleep.call_args
+        assert self.client.stats['throttled'] == 1, self.client.stats
+        assert self.client.stats['retries'] == 0, self.client.stats
+        assert self.client.stats['rate_limit_wait'] > 1, self.client.stats
+
+    @patch('pbclient.time.sleep')
+    @patch('pbclient.requests.Session.post')
+    def test_wait_out_429_post(self, Mock, sleep):
+        """Test a 429 POST is sent again, as it was not processed"""
+        error = self.create_error_output('POST', 429, 'task',
+                                         'TooManyRequests')
+        Mock.side_effect = [
+            self.create_fake_request(error, 429, {'Retry-After': '1'}),
+            self.create_fake_request(self.task, 200)]
+        task = self.client.create_task(1, {})
+        assert task.id == self.task['id'], task
+
+    @patch('pbclient.time.sleep')
+    @patch('pbclient.requests.Session.get')
+    def test_give_up_429(self, Mock, sleep):
+        """Test the 429 error is returned after MAX_THROTTLED waits"""
+        error = self.create_error_output('GET', 429, 'task',
+                                         'TooManyRequests')
+        Mock.return_value = self.create_fake_request(error, 429,
+                                                     {'Retry-After': '1'})
+        err = self.client.find_tasks(1)
+        self.check_error_output(error, err)
+        assert Mock.call_count == pbclient.MAX_THROTTLED + 1
@@ -21,7 +21,7 @@ from base import TestPyBossaClient
 
 class TestPybossaClientResult(TestPyBossaClient):
 
-    @patch('pbclient.requests.get')
+    @patch('pbclient.requests.Session.get')
     def test_get_results(self, Mock):
         """Test get_results works."""
         Mock.return_value = self.create_fake_request([self.result.copy()], 200)
@@ -31,7 +31,7 @@ class TestPybossaClientResult(TestPyBossaClient):
         assert result.id == self.task['id'], result
         assert result.project_id == self.task['project_id'], result
 
-    @patch('pbclient.requests.get')
+    @patch('pbclient.requests.Session.get')
     def test_get_results_with_keyset_pagination(self, Mock):
         """Test get_results uses keyset pagination if a last_id argument is
         provided"""
@@ -42,9 +42,10 @@ class TestPybossaClientResult(TestPyBossaClient):
                                      params={'api_key': 'tester',
                                              'project_id': 1,
                                              'limit': 3,
-                                             'last_id': 1})
+                                             'last_id': 1},
+                                     timeout=pbclient.DEFAULT_TIMEOUT)
 
-    @patch('pbclient.requests.get')
+    @patch('pbclient.requests.Session.get')
     def test_get_results_errors(self, Mock):
         """Test get results errors works."""
         targets = ['result']
@@ -61,7 +62,7 @@ class TestPybossaClientResult(TestPyBossaClient):
                 err = self.client.get_results(1)
                 self.check_error_output(err_output, err)
 
-    @patch('pbclient.requests.get')
+    @patch('pbclient.requests.Session.get')
     def test_find_results(self, Mock):
         """Test find_results works"""
         Mock.return_value = self.create_fake_request([self.result.copy()], 200)
@@ -73,7 +74,7 @@ class TestPybossaClientResult(TestPyBossaClient):
         assert result.task_id == self.result['task_id'], result
         assert result.task_run_ids == self.result['task_run_ids'], result
 
-    @patch('pbclient.requests.get')
+    @patch('pbclient.requests.Session.get')
     def test_find_results_errors(self, Mock):
         """Test find results errors works."""
         targets = ['result']
@@ -90,7 +91,7 @@ class TestPybossaClientResult(TestPyBossaClient):
                 err = self.client.find_results(1)
                 self.check_error_output(err_output, err)
 
-    @patch('pbclient.requests.put')
+    @patch('pbclient.requests.Session.put')
     def test_update_result(self, Mock):
         """Test update_result works"""
         Mock.return_value = self.create_fake_request(self.result, 200)
@@ -101,7 +102,7 @@ class TestPybossaClientResult(TestPyBossaClient):
         assert result.task_run_ids == self.result['task_run_ids'], result
         assert result.info == self.result['info'], result.info
 
-    @patch('pbclient.requests.put')
+    @patch('pbclient.requests.Session.put')
     def test_update_result_errors(self, Mock):
         """Test update result errors works"""
         targets = ['result']
@@ -117,3 +118,39 @@ class TestPybossaClientResult(TestPyBossaClient):
                                                              errors[error])
                 err = self.client.update_result(pbclient.Result(self.result.copy()))
                 self.check_error_output(err_output, err)
+
+    @patch('pbclient.requests.Session.put')
+    def test_update_results(self, Mock):
+        """Test update_results reports failures per result"""
+        err_output = self.create_error_output(action='PUT', status_code=400,
+                                              target='result',
+                                              exception_cls='BadRequest')
+
+        def put(url, params, headers, data, timeout):
+            if url.endswith('/3'):
+                return self.create_fake_request(err_output, 400)
+            return self.create_fake_request(self.result, 200)
+        Mock.side_effect = put
+        results = [pbclient.Result(dict(self.result, id=i))
+                   for i in range(1, 6)]
+        res = self.client.update_results(results).wait()
+        assert res.succeeded == 4, res
+        assert [o.index for o in res.failures] == [2], res.failures
+        self.check_error_output(err_output, res.failures[0].error)
+
+    @patch('pbclient.requests.Session.get')
+    def test_get_results_by_task_ids(self, Mock):
+        """Test get_results_by_task_ids returns the last version per task"""
+        def get(url, params, timeout):
+            task_id = params['task_id']
+            if task_id == 3:
+                return self.create_fake_request([], 200)
+            return self.create_fake_request(
+                [dict(self.result, id=task_id * 10 + i, task_id=task_id,
+                      last_version=i == task_id % 2) for i in range(2)],
+                200)
+        Mock.side_effect = get
+        results = self.client.get_results_by_task_ids([1, 2, 2, 3])
+        assert sorted(results) == [1, 2], results
+        assert results[1].id == 11 and results[2].id == 20, results
+        assert Mock.call_count == 3, Mock.call_count
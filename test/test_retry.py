@@ -0,0 +1,119 @@
+# -*- coding: utf8 -*-
+# Copyright (C) 2013 Daniel Lombraña González
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import pbclient
+import requests
+from mock import patch
+from base import TestPyBossaClient
+from nose.tools import assert_raises
+from pbclient.retry import Retry
+
+
+class TestPybossaClientRetry(TestPyBossaClient):
+
+    def setUp(self):
+        super(TestPybossaClientRetry, self).setUp()
+        self.client.reset_stats()
+        self.client.set('retry', Retry(max_attempts=3, backoff_factor=1,
+                                       jitter=False))
+
+    def tearDown(self):
+        del pbclient._opts['retry']
+
+    def test_policy_methods(self):
+        """Test only idempotent methods are retried by default"""
+        retry = Retry()
+        assert retry.should_retry('get', 1, status=502)
+        assert retry.should_retry('put', 1, status=503)
+        assert retry.should_retry('delete', 1, status=500)
+        assert not retry.should_retry('post', 1, status=502)
+        assert Retry(retry_post=True).should_retry('post', 1, status=502)
+
+    def test_policy_limits(self):
+        """Test the policy stops after max_attempts"""
+        retry = Retry(max_attempts=2)
+        assert retry.should_retry('get', 1, status=502)
+        assert not retry.should_retry('get', 2, status=502)
+        assert not retry.should_retry('get', 1, status=404)
+        assert retry.should_retry('get', 1,
+                                  exception=requests.ConnectionError())
+        assert not retry.should_retry('get', 1, exception=ValueError())
+
+    def test_policy_backoff(self):
+        """Test exponential backoff with jitter"""
+        retry = Retry(backoff_factor=0.5, backoff_max=3, jitter=False)
+        assert [retry.backoff(n) for n in (1, 2, 3, 4)] == [0.5, 1, 2, 3]
+        retry = Retry(backoff_factor=0.5, backoff_max=3)
+        delays = [retry.backoff(3) for _ in range(100)]
+        assert all(0 <= d <= 2 for d in delays), delays
+        assert len(set(delays)) > 1, delays
+
+    @patch('pbclient.time.sleep')
+    @patch('pbclient.requests.Session.get')
+    def test_retry_status(self, Mock, sleep):
+        """Test GET requests are retried on transient errors"""
+        error = self.create_error_output('GET', 502, 'task', 'BadGateway')
+        Mock.side_effect = [self.create_fake_request(error, 502),
+                            self.create_fake_request(error, 502),
+                            self.create_fake_request([self.task], 200)]
+        tasks = self.client.find_tasks(1)
+        assert tasks[0].id == self.task['id'], tasks
+        assert Mock.call_count == 3, Mock.call_count
+        assert [c[0][0] for c in sleep.call_args_list] == [1, 2]
+        stats = self.client.stats
+        assert stats['requests'] == 3, stats
+        assert stats['retries'] == 2, stats
+        assert stats['retry_wait'] == 3, stats
+
+    @patch('pbclient.time.sleep')
+    @patch('pbclient.requests.Session.get')
+    def test_retry_gives_up(self, Mock, sleep):
+        """Test the last error is returned after max_attempts"""
+        error = self.create_error_output('GET', 503, 'task', 'Unavailable')
+        Mock.return_value = self.create_fake_request(error, 503)
+        err = self.client.find_tasks(1)
+        self.check_error_output(error, err)
+        assert Mock.call_count == 3, Mock.call_count
+
+    @patch('pbclient.time.sleep')
+    @patch('pbclient.requests.Session.get')
+    def test_retry_exceptions(self, Mock, sleep):
+        """Test connection errors are retried and raised at the end"""
+        Mock.side_effect = requests.ConnectionError('reset')
+        assert_raises(requests.ConnectionError, self.client.find_tasks, 1)
+        assert Mock.call_count == 3, Mock.call_count
+
+    @patch('pbclient.time.sleep')
+    @patch('pbclient.requests.Session.post')
+    def test_no_retry_post(self, Mock, sleep):
+        """Test POST requests are not retried by default"""
+        error = self.create_error_output('POST', 502, 'task', 'BadGateway')
+        Mock.return_value = self.create_fake_request(error, 502)
+        self.client.create_task(1, {})
+        assert Mock.call_count == 1, Mock.call_count
+        self.client.set('retry', Retry(retry_post=True, jitter=False))
+        Mock.reset_mock()
+        self.client.create_task(1, {})
+        assert Mock.call_count == 3, Mock.call_count
+
+    @patch('pbclient.time.sleep')
+    @patch('pbclient.requests.Session.get')
+    def test_retry_disabled(self, Mock, sleep):
+        """Test retries can be disabled"""
+        self.client.set('retry', None)
+        Mock.side_effect = requests.ConnectionError('reset')
+        assert_raises(requests.ConnectionError, self.client.find_tasks, 1)
+        assert Mock.call_count == 1, Mock.call_count
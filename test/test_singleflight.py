@@ -0,0 +1,144 @@
+# -*- coding: utf8 -*-
+# Copyright (C) 2015 Daniel Lombraña González
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+
+import pbclient
+from base import TestPyBossaClient
+from nose.tools import assert_raises
+from pbclient.singleflight import SingleFlight
+from pbclient.timeouts import Deadline, DeadlineExceeded
+
+
+class _Server(ThreadingMixIn, HTTPServer):
+
+    daemon_threads = True
+
+
+class TestPybossaClientSingleFlight(TestPyBossaClient):
+
+    def setUp(self):
+        super(TestPybossaClientSingleFlight, self).setUp()
+        self.hits = []
+        test = self
+
+        class Handler(BaseHTTPRequestHandler):
+
+            def do_GET(self):
+                test.hits.append(self.path)
+                time.sleep(0.2)
+                body = json.dumps(dict(test.project, id=42)).encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = _Server(('127.0.0.1', 0), Handler)
+        threading.Thread(target=self.server.serve_forever).start()
+        endpoint = 'http://127.0.0.1:%d' % self.server.server_address[1]
+        self.pool = pbclient.PyBossaClient(endpoint, pool_maxsize=32,
+                                           rate_limit=False, coalesce=True)
+
+    def tearDown(self):
+        self.pool.close()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_coalesce_stress(self):
+        """Test 32 threads getting the same project send one request"""
+        barrier = threading.Barrier(32)
+
+        def get(_):
+            barrier.wait()
+            return self.pool.get_project(42)
+
+        with ThreadPoolExecutor(max_workers=32) as executor:
+            projects = list(executor.map(get, range(32)))
+        assert len(self.hits) == 1, self.hits
+        assert all(project.id == 42 for project in projects)
+        assert self.pool.stats['coalesced'] == 31, self.pool.stats
+
+    def test_coalesce_keys(self):
+        """Test different or sequential GETs are not coalesced"""
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            list(executor.map(lambda p: self.pool.find_project(name=p),
+                              ['a', 'b']))
+        self.pool.get_project(42)
+        self.pool.get_project(42)
+        assert len(self.hits) == 4, self.hits
+        self.pool.set('coalesce', False)
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            list(executor.map(lambda _: self.pool.get_project(42), [1, 2]))
+        assert len(self.hits) == 6, self.hits
+
+    def test_single_flight(self):
+        """Test errors are shared and waiting callers honour deadlines"""
+        flight = SingleFlight()
+        started = threading.Event()
+
+        def fail():
+            started.set()
+            time.sleep(0.1)
+            raise ValueError('boom')
+
+        def follower():
+            started.wait()
+            return flight.do('key', lambda: 'mine')
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            future = executor.submit(follower)
+            assert_raises(ValueError, flight.do, 'key', fail)
+            assert_raises(ValueError, future.result)
+        assert flight.do('key', lambda: 'mine') == ('mine', False)
+
+        started.clear()
+
+        def slow():
+            started.set()
+            time.sleep(0.3)
+            return 'slow'
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            future = executor.submit(flight.do, 'key', slow)
+            started.wait()
+            assert_raises(DeadlineExceeded, flight.do, 'key',
+                          lambda: 'mine', Deadline(0.05))
+            assert future.result() == ('slow', False)
+
+    def test_coalesce_deadlines(self):
+        """Test a short deadline of the first caller fails no other caller"""
+        def leader():
+            with self.pool.deadline(0.05):
+                return self.pool.get_project(42)
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            future = executor.submit(leader)
+            while not self.hits:
+                time.sleep(0.01)
+            project = self.pool.get_project(42)
+            assert_raises(DeadlineExceeded, future.result)
+        assert project.id == 42, project
+        assert len(self.hits) == 1, self.hits
+        assert self.pool.stats['coalesced'] == 1, self.pool.stats
@@ -17,17 +17,18 @@
 import pbclient
 from mock import patch
 from base import TestPyBossaClient
+from nose.tools import assert_raises
 
 
 class TestPybossaClientTask(TestPyBossaClient):
-    @patch('pbclient.requests.delete')
+    @patch('pbclient.requests.Session.delete')
     def test_delete_task(self, Mock):
         """Test delete_task works"""
         Mock.return_value = self.create_fake_request('', 204, 'text/html')
         res = self.client.delete_task(1)
         assert res is True, res
 
-    @patch('pbclient.requests.get')
+    @patch('pbclient.requests.Session.get')
     def test_get_tasks(self, Mock):
         """Test get_tasks works"""
         Mock.return_value = self.create_fake_request([self.task.copy()], 200)
@@ -37,7 +38,7 @@ class TestPybossaClientTask(TestPyBossaClient):
         assert task.id == self.task['id'], task
         assert task.project_id == self.task['project_id'], task
 
-    @patch('pbclient.requests.get')
+    @patch('pbclient.requests.Session.get')
     def test_get_tasks_with_keyset_pagination(self, Mock):
         """Test get_tasks uses keyset pagination if a last_id argument is
         provided"""
@@ -48,9 +49,10 @@ class TestPybossaClientTask(TestPyBossaClient):
                                      params={'api_key': 'tester',
                                              'project_id': 1,
                                              'limit': 3,
-                                             'last_id': 1})
+                                             'last_id': 1},
+                                     timeout=pbclient.DEFAULT_TIMEOUT)
 
-    @patch('pbclient.requests.get')
+    @patch('pbclient.requests.Session.get')
     def test_get_tasks_errors(self, Mock):
         """Test get tasks errors works"""
         targets = ['task']
@@ -67,7 +69,7 @@ class TestPybossaClientTask(TestPyBossaClient):
                 err = self.client.get_tasks(1)
                 self.check_error_output(err_output, err)
 
-    @patch('pbclient.requests.get')
+    @patch('pbclient.requests.Session.get')
     def test_find_tasks(self, Mock):
         """Test find_tasks works"""
         Mock.return_value = self.create_fake_request([self.task.copy()], 200)
@@ -77,7 +79,7 @@ class TestPybossaClientTask(TestPyBossaClient):
         assert task.id == self.task['id'], task
         assert task.project_id == self.task['project_id'], task
 
-    @patch('pbclient.requests.get')
+    @patch('pbclient.requests.Session.get')
     def test_find_tasks_errors(self, Mock):
         """Test find task errors works"""
         targets = ['task']
@@ -94,7 +96,7 @@ class TestPybossaClientTask(TestPyBossaClient):
                 err = self.client.find_tasks(1)
                 self.check_error_output(err_output, err)
 
-    @patch('pbclient.requests.post')
+    @patch('pbclient.requests.Session.post')
     def test_create_task(self, Mock):
         """Test create_task works"""
         Mock.return_value = self.create_fake_request(self.task.copy(), 200)
@@ -102,7 +104,7 @@ class TestPybossaClientTask(TestPyBossaClient):
         assert task.id == self.task['id'], task
         assert task.project_id == self.task['project_id'], task
 
-    @patch('pbclient.requests.post')
+    @patch('pbclient.requests.Session.post')
     def test_create_task_errors(self, Mock):
         """Test create task errors works"""
         targets = ['task']
@@ -119,7 +121,7 @@ class TestPybossaClientTask(TestPyBossaClient):
                 err = self.client.create_task(self.project['id'], self.task['info'])
                 self.check_error_output(err_output, err)
 
-    @patch('pbclient.requests.put')
+    @patch('pbclient.requests.Session.put')
     def test_update_task(self, Mock):
         """Test update_task works"""
         Mock.return_value = self.create_fake_request(self.task, 200)
@@ -127,7 +129,7 @@ class TestPybossaClientTask(TestPyBossaClient):
         assert task.id == self.task['id'], task
         assert task.project_id == self.task['project_id'], task
 
-    @patch('pbclient.requests.put')
+    @patch('pbclient.requests.Session.put')
     def test_update_task_errors(self, Mock):
         """Test update task errors works"""
         targets = ['task']
@@ -143,3 +145,159 @@ class TestPybossaClientTask(TestPyBossaClient):
                                                              errors[error])
                 err = self.client.update_task(pbclient.Task(self.task.copy()))
                 self.check_error_output(err_output, err)
+
+    @patch('pbclient.requests.Session.get')
+    def test_iter_tasks(self, Mock):
+        """Test iter_tasks walks keyset pagination"""
+        pages = [[dict(self.task, id=1), dict(self.task, id=2)],
+                 [dict(self.task, id=3)]]
+        Mock.side_effect = [self.create_fake_request(page, 200)
+                            for page in pages]
+        tasks = self.client.iter_tasks(1, page_size=2, state='completed')
+        assert [task.id for task in tasks] == [1, 2, 3]
+        assert Mock.call_count == 2, Mock.call_count
+        Mock.assert_called_with('http://localhost:5000/api/task',
+                                params={'api_key': 'tester',
+                                        'project_id': 1,
+                                        'state': 'completed',
+                                        'limit': 2,
+                                        'last_id': 2},
+                                timeout=pbclient.DEFAULT_TIMEOUT)
+
+    @patch('pbclient.requests.Session.get')
+    def test_iter_tasks_full_last_page(self, Mock):
+        """Test iter_tasks stops on an empty page"""
+        pages = [[dict(self.task, id=1)], []]
+        Mock.side_effect = [self.create_fake_request(page, 200)
+                            for page in pages]
+        tasks = list(self.client.iter_tasks(1, page_size=1))
+        assert len(tasks) == 1, tasks
+        assert Mock.call_count == 2, Mock.call_count
+
+    @patch('pbclient.requests.Session.get')
+    def test_iter_tasks_errors(self, Mock):
+        """Test iter_tasks raises on server errors"""
+        err_output = self.create_error_output(action='GET', status_code=401,
+                                              target='task',
+                                              exception_cls='Unauthorized')
+        Mock.return_value = self.create_fake_request(err_output, 401)
+        try:
+            list(self.client.iter_tasks(1))
+            assert False, 'PyBossaError not raised'
+        except pbclient.PyBossaError as e:
+            self.check_error_output(err_output, e.error)
+
+    @patch('pbclient.requests.Session.post')
+    def test_create_tasks(self, Mock):
+        """Test create_tasks returns the outcomes in input order"""
+        import json
+        import time
+
+        def post(url, params, headers, data, timeout):
+            task = json.loads(data)
+            if task['info'] == 3:
+                return self.create_fake_request(self.create_error_output(
+                    'POST', 400, 'task', 'BadRequest'), 400)
+            if task['info'] == 5:
+                raise ValueError('boom')
+            time.sleep(0.001 * (10 - task['info']))
+            return self.create_fake_request(dict(task, id=task['info'] + 1),
+                                             200)
+        Mock.side_effect = post
+        consumed = []
+
+        def infos():
+            for i in range(10):
+                consumed.append(i)
+                yield i
+        outcomes = self.client.create_tasks(1, infos(), n_answers=2,
+                                            concurrency=2)
+        first = next(outcomes)
+        assert first.ok and first.result.id == 1, first
+        # Twice the concurrency pending, the concurrency buffered and one
+        # outcome handed over.
+        assert len(consumed) <= 7, consumed
+        outcomes = [first] + list(outcomes)
+        assert [o.index for o in outcomes] == list(range(10))
+        assert [o.item for o in outcomes] == list(range(10))
+        assert outcomes[3].error['status_code'] == 400, outcomes[3]
+        assert isinstance(outcomes[5].error, ValueError), outcomes[5]
+        ok = [o for o in outcomes if o.ok]
+        assert len(ok) == 8, ok
+        assert all(o.result.n_answers == 2 for o in ok)
+
+    @patch('pbclient.requests.Session.put')
+    def test_update_tasks(self, Mock):
+        """Test update_tasks reports every task"""
+        Mock.return_value = self.create_fake_request(self.task, 200)
+        tasks = [pbclient.Task(dict(self.task, id=i)) for i in range(1, 6)]
+        res = self.client.update_tasks(tasks, concurrency=2).wait()
+        assert res.total == 5 and res.succeeded == 5, res
+        assert res.failed == 0 and res.failures == [], res
+        assert res.throughput > 0, res
+        assert Mock.call_count == 5, Mock.call_count
+
+    @patch('pbclient.requests.Session.delete')
+    def test_delete_tasks(self, Mock):
+        """Test delete_tasks accepts tasks and ids"""
+        err_output = self.create_error_output(action='DELETE',
+                                              status_code=404,
+                                              target='task',
+                                              exception_cls='NotFound')
+        Mock.side_effect = [self.create_fake_request('', 204, 'text/html'),
+                            self.create_fake_request(err_output, 404)]
+        res = self.client.delete_tasks([pbclient.Task(self.task), 2],
+                                       concurrency=1)
+        outcomes = list(res)
+        assert outcomes[0].ok and outcomes[0].result is True, outcomes
+        assert not outcomes[1].ok, outcomes
+        assert res.failures == [outcomes[1]], res.failures
+        urls = [call[0][0] for call in Mock.call_args_list]
+        assert urls == ['http://localhost:5000/api/task/1',
+                        'http://localhost:5000/api/task/2'], urls
+
+    @patch('pbclient.requests.Session.get')
+    def test_get_tasks_by_ids(self, Mock):
+        """Test get_tasks_by_ids fetches id runs with keyset queries"""
+        ids = [i for i in range(1, 400) if i % 5]
+
+        def get(url, params, timeout):
+            last_id = params.get('last_id', 0)
+            page = [i for i in ids if i > last_id][:params['limit']]
+            return self.create_fake_request(
+                [dict(self.task, id=i) for i in page], 200)
+        Mock.side_effect = get
+        wanted = [3, 3, 1, 50, 99, 100, 101, 250, 251, 390, 395, 1000]
+        tasks = self.client.get_tasks_by_ids(wanted, concurrency=2)
+        assert sorted(tasks) == [1, 3, 99, 101, 251], sorted(tasks)
+        assert all(isinstance(t, pbclient.Task) and t.id == i
+                   for i, t in tasks.items())
+        queries = sorted((call[1]['params']['last_id'],
+                          call[1]['params']['limit'])
+                         for call in Mock.call_args_list)
+        assert queries == [(0, 100), (100, 1), (249, 2), (389, 6),
+                           (999, 1)], queries
+
+    @patch('pbclient.requests.Session.get')
+    def test_get_tasks_by_ids_large_pages(self, Mock):
+        """Test get_tasks_by_ids with runs longer than the server maximum"""
+        def get(url, params, timeout):
+            last_id = params.get('last_id', 0)
+            limit = min(params['limit'], 100)
+            return self.create_fake_request(
+                [dict(self.task, id=i)
+                 for i in range(last_id + 1, last_id + limit + 1)], 200)
+        Mock.side_effect = get
+        tasks = self.client.get_tasks_by_ids(range(1, 301), page_size=300)
+        assert sorted(tasks) == list(range(1, 301)), len(tasks)
+
+    @patch('pbclient.requests.Session.get')
+    def test_get_tasks_by_ids_errors(self, Mock):
+        """Test get_tasks_by_ids raises the server errors"""
+        err_output = self.create_error_output(action='GET', status_code=401,
+                                              target='task',
+                                              exception_cls='Unauthorized')
+        Mock.return_value = self.create_fake_request(err_output, 401)
+        assert_raises(pbclient.PyBossaError, self.client.get_tasks_by_ids,
+                      [1, 2])
+        assert self.client.get_tasks_by_ids([]) == {}
@@ -14,13 +14,14 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+import pbclient
 from mock import patch
 from base import TestPyBossaClient
 from nose.tools import assert_raises
 
 
 class TestPybossaClientTaskRun(TestPyBossaClient):
-    @patch('pbclient.requests.delete')
+    @patch('pbclient.requests.Session.delete')
     def test_project_task_taskrun_delete(self, Mock):
         """Test delete project, task and taskrun errors works"""
         targets = ['project', 'task', 'taskrun']
@@ -41,7 +42,7 @@ class TestPybossaClientTaskRun(TestPyBossaClient):
                     err = self.client.delete_taskrun(1)
                 self.check_error_output(err_output, err)
 
-    @patch('pbclient.requests.get')
+    @patch('pbclient.requests.Session.get')
     def test_get_taskruns(self, Mock):
         """Test get_taskruns works"""
         Mock.return_value = self.create_fake_request([self.taskrun], 200)
@@ -51,7 +52,7 @@ class TestPybossaClientTaskRun(TestPyBossaClient):
         assert taskrun.id == self.taskrun['id'], taskrun
         assert taskrun.project_id == self.taskrun['project_id'], taskrun
 
-    @patch('pbclient.requests.get')
+    @patch('pbclient.requests.Session.get')
     def test_get_taskruns_with_keyset_pagination(self, Mock):
         """Test get_taskruns uses keyset pagination if a last_id argument is
         provided"""
@@ -62,15 +63,16 @@ class TestPybossaClientTaskRun(TestPyBossaClient):
                                      params={'api_key': 'tester',
                                              'project_id': 1,
                                              'limit': 3,
-                                             'last_id': 1})
+                                             'last_id': 1},
+                                     timeout=pbclient.DEFAULT_TIMEOUT)
 
-    @patch('pbclient.requests.get')
+    @patch('pbclient.requests.Session.get')
     def test_get_taskruns_error(self, Mock):
         """Test get_taskruns error works"""
         Mock.return_value = self.create_fake_request(self.taskrun, 200)
         assert_raises(TypeError, self.client.get_taskruns, 1)
 
-    @patch('pbclient.requests.get')
+    @patch('pbclient.requests.Session.get')
     def test_find_taskruns(self, Mock):
         """Test find_taskruns works"""
         Mock.return_value = self.create_fake_request([self.taskrun], 200)
@@ -80,7 +82,7 @@ class TestPybossaClientTaskRun(TestPyBossaClient):
         assert taskrun.id == self.taskrun['id'], taskrun
         assert taskrun.project_id == self.taskrun['project_id'], taskrun
 
-    @patch('pbclient.requests.get')
+    @patch('pbclient.requests.Session.get')
     def test_find_taskruns_errors(self, Mock):
         """Test find taskruns errors works"""
         targets = ['taskrun']
@@ -96,3 +98,97 @@ class TestPybossaClientTaskRun(TestPyBossaClient):
                                                              errors[error])
                 err = self.client.find_taskruns(1)
                 self.check_error_output(err_output, err)
+
+    @patch('pbclient.requests.Session.get')
+    def test_iter_taskruns(self, Mock):
+        """Test iter_taskruns walks keyset pagination"""
+        pages = [[dict(self.taskrun, id=4), dict(self.taskrun, id=7)], []]
+        Mock.side_effect = [self.create_fake_request(page, 200)
+                            for page in pages]
+        taskruns = self.client.iter_taskruns(1, page_size=2, last_id=3)
+        assert [taskrun.id for taskrun in taskruns] == [4, 7]
+        params = [call[1]['params']['last_id']
+                  for call in Mock.call_args_list]
+        assert params == [3, 7], params
+
+    @patch('pbclient.requests.Session.get')
+    def test_iter_taskruns_prefetch(self, Mock):
+        """Test iter_taskruns can download pages in the background"""
+        pages = [[dict(self.taskrun, id=i), dict(self.taskrun, id=i + 1)]
+                 for i in range(1, 20, 2)] + [[]]
+        Mock.side_effect = [self.create_fake_request(page, 200)
+                            for page in pages]
+        taskruns = self.client.iter_taskruns(1, page_size=2, prefetch=2)
+        assert [taskrun.id for taskrun in taskruns] == list(range(1, 21))
+        assert Mock.call_count == 11, Mock.call_count
+
+    def fake_server(self, ids):
+        """Return a fake Session.get answering keyset queries over ids."""
+        def get(url, params, timeout):
+            limit = min(params['limit'], 100)
+            if params.get('desc'):
+                page = sorted(ids, reverse=True)[:limit]
+            else:
+                last_id = params.get('last_id', 0)
+                page = [i for i in sorted(ids) if i > last_id][:limit]
+            return self.create_fake_request(
+                [dict(self.taskrun, id=i) for i in page], 200)
+        return get
+
+    @patch('pbclient.requests.Session.get')
+    def test_iter_taskruns_large_pages(self, Mock):
+        """Test pages larger than the server maximum are not cut short"""
+        ids = list(range(1, 251))
+        Mock.side_effect = self.fake_server(ids)
+        taskruns = self.client.iter_taskruns(1, page_size=1000)
+        assert [t.id for t in taskruns] == ids
+        assert Mock.call_args[1]['params']['limit'] == 100
+        Mock.side_effect = self.fake_server(ids)
+        taskruns = self.client.iter_parallel('taskrun', 1, workers=2,
+                                             chunk_size=300, page_size=300)
+        assert [t.id for t in taskruns] == ids
+
+    @patch('pbclient.requests.Session.get')
+    def test_iter_parallel(self, Mock):
+        """Test iter_parallel returns every object in id order"""
+        ids = [i for i in range(3, 500) if i % 7]
+        Mock.side_effect = self.fake_server(ids)
+        taskruns = self.client.iter_parallel('taskrun', 1, workers=4,
+                                             chunk_size=25, page_size=10)
+        taskruns = list(taskruns)
+        assert all(isinstance(t, pbclient.TaskRun) for t in taskruns)
+        assert [t.id for t in taskruns] == ids
+
+    @patch('pbclient.requests.Session.get')
+    def test_iter_parallel_unordered(self, Mock):
+        """Test iter_parallel can return objects in any order"""
+        ids = list(range(1, 300))
+        Mock.side_effect = self.fake_server(ids)
+        taskruns = self.client.iter_parallel('taskrun', 1, workers=3,
+                                             chunk_size=30, ordered=False)
+        assert sorted(t.id for t in taskruns) == ids
+
+    @patch('pbclient.requests.Session.get')
+    def test_iter_parallel_empty(self, Mock):
+        """Test iter_parallel with no objects"""
+        Mock.side_effect = self.fake_server([])
+        assert list(self.client.iter_parallel('taskrun', 1)) == []
+
+    @patch('pbclient.requests.Session.delete')
+    def test_delete_taskruns(self, Mock):
+        """Test delete_taskruns deletes every task run"""
+        Mock.return_value = self.create_fake_request('', 204, 'text/html')
+        res = self.client.delete_taskruns(range(1, 11), concurrency=4).wait()
+        assert res.succeeded == 10, res
+        assert Mock.call_count == 10, Mock.call_count
+
+    @patch('pbclient.requests.Session.delete')
+    def test_delete_taskruns_not_consumed(self, Mock):
+        """Test delete_taskruns deletes without reading the outcomes"""
+        import time
+        Mock.return_value = self.create_fake_request('', 204, 'text/html')
+        self.client.delete_taskruns(range(1, 101), concurrency=4)
+        started = time.time()
+        while Mock.call_count < 100 and time.time() - started < 5:
+            time.sleep(0.01)
+        assert Mock.call_count == 100, Mock.call_count
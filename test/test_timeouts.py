@@ -0,0 +1,187 @@
+# -*- coding: utf8 -*-
+# Copyright (C) 2013 Daniel Lombraña González
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import os
+import shutil
+import tempfile
+import threading
+
+import pbclient
+from mock import patch
+from base import TestPyBossaClient
+from nose.tools import assert_raises
+from pbclient.timeouts import Deadline, DeadlineExceeded
+from pbclient.retry import Retry
+
+
+class FakeClock(object):
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestPybossaClientTimeouts(TestPyBossaClient):
+
+    def setUp(self):
+        super(TestPybossaClientTimeouts, self).setUp()
+        self.clock = FakeClock()
+        self.patcher = patch('pbclient.timeouts._clock', self.clock)
+        self.patcher.start()
+
+    def tearDown(self):
+        self.patcher.stop()
+        pbclient._opts.pop('timeout', None)
+        pbclient._opts.pop('retry', None)
+
+    def test_deadline(self):
+        """Test the deadline budget"""
+        deadline = Deadline(10)
+        assert deadline.remaining() == 10
+        assert deadline.cap((3, 60)) == (3, 10)
+        assert deadline.cap(None) == (10, 10)
+        assert deadline.cap(20) == (10, 10)
+        self.clock.now += 4
+        assert deadline.remaining() == 6
+        assert deadline.allows(5) and not deadline.allows(6)
+        self.clock.now += 6
+        assert_raises(DeadlineExceeded, deadline.check)
+        assert Deadline.coerce(deadline) is deadline
+        assert Deadline.coerce(None) is None
+
+    @patch('pbclient.requests.Session.get')
+    def test_timeout_setting(self, Mock):
+        """Test the timeout setting and per call overrides"""
+        Mock.return_value = self.create_fake_request([], 200)
+        self.client.find_tasks(1)
+        assert Mock.call_args[1]['timeout'] == pbclient.DEFAULT_TIMEOUT
+        self.client.set('timeout', (1, 2))
+        self.client.find_tasks(1)
+        assert Mock.call_args[1]['timeout'] == (1, 2)
+        with self.client.timeout(5):
+            self.client.find_tasks(1)
+            assert Mock.call_args[1]['timeout'] == 5
+
+            def other_thread():
+                self.client.find_tasks(1)
+                assert Mock.call_args[1]['timeout'] == (1, 2)
+            thread = threading.Thread(target=other_thread)
+            thread.start()
+            thread.join()
+        self.client.find_tasks(1)
+        assert Mock.call_args[1]['timeout'] == (1, 2)
+
+    @patch('pbclient.requests.Session.get')
+    def test_deadline_caps_timeout(self, Mock):
+        """Test requests never wait longer than the deadline"""
+        Mock.return_value = self.create_fake_request([], 200)
+        with self.client.deadline(30):
+            self.clock.now += 25
+            self.client.find_tasks(1)
+            assert Mock.call_args[1]['timeout'] == (5, 5)
+            self.clock.now += 5
+            assert_raises(DeadlineExceeded, self.client.find_tasks, 1)
+        assert Mock.call_count == 1, Mock.call_count
+
+    @patch('pbclient.time.sleep')
+    @patch('pbclient.requests.Session.get')
+    def test_deadline_stops_retries(self, Mock, sleep):
+        """Test retries do not wait beyond the deadline"""
+        self.client.set('retry', Retry(max_attempts=5, backoff_factor=4,
+                                       jitter=False))
+        error = self.create_error_output('GET', 502, 'task', 'BadGateway')
+        Mock.return_value = self.create_fake_request(error, 502)
+
+        def advance(delay):
+            self.clock.now += delay
+        sleep.side_effect = advance
+        with self.client.deadline(10):
+            assert_raises(DeadlineExceeded, self.client.find_tasks, 1)
+        assert Mock.call_count == 2, Mock.call_count
+        assert [c[0][0] for c in sleep.call_args_list] == [4]
+
+    @patch('pbclient.requests.Session.get')
+    def test_iter_deadline(self, Mock):
+        """Test the deadline carries across the pages"""
+        def get(url, params, timeout):
+            self.clock.now += 4
+            last_id = params.get('last_id', 0)
+            return self.create_fake_request(
+                [dict(self.task, id=last_id + 1)], 200)
+        Mock.side_effect = get
+        tasks = self.client.iter_tasks(1, page_size=1, deadline=10)
+        ids = []
+        try:
+            for task in tasks:
+                ids.append(task.id)
+            assert False, 'DeadlineExceeded not raised'
+        except DeadlineExceeded:
+            pass
+        assert ids == [1, 2, 3], ids
+
+    @patch('pbclient.requests.Session.post')
+    def test_bulk_deadline(self, Mock):
+        """Test a bulk operation stops once the deadline is spent"""
+        def post(url, params, headers, data, timeout):
+            self.clock.now += 1
+            return self.create_fake_request(self.task, 200)
+        Mock.side_effect = post
+        res = self.client.create_tasks(1, range(100), concurrency=1,
+                                       deadline=5)
+        assert_raises(DeadlineExceeded, res.wait)
+        assert 4 <= res.total < 10, res.total
+        assert Mock.call_count == res.succeeded
+        assert all(isinstance(o.error, DeadlineExceeded)
+                   for o in res.failures), res.failures
+
+    @patch('pbclient.requests.Session.post')
+    @patch('pbclient.requests.Session.get')
+    def test_overrides_in_workers(self, Mock, Post):
+        """Test worker threads honour the timeout and deadline overrides"""
+        timeouts = []
+
+        def get(url, params, timeout):
+            timeouts.append(timeout)
+            self.clock.now += 4
+            last_id = params.get('last_id', 0)
+            return self.create_fake_request(
+                [dict(self.task, id=last_id + 1)], 200)
+
+        def post(url, params, headers, data, timeout):
+            timeouts.append(timeout)
+            self.clock.now += 1
+            return self.create_fake_request(self.task, 200)
+        Mock.side_effect = get
+        Post.side_effect = post
+        tmp = tempfile.mkdtemp()
+        try:
+            path = os.path.join(tmp, 'tasks.ndjson')
+            with self.client.timeout(3), self.client.deadline(10):
+                assert_raises(DeadlineExceeded, self.client.export, 1,
+                              'task', path, page_size=1)
+        finally:
+            shutil.rmtree(tmp)
+        assert Mock.call_count == 3, Mock.call_count
+        assert timeouts == [(3, 3), (3, 3), (2, 2)], timeouts
+        with self.client.deadline(5):
+            res = self.client.create_tasks(1, range(100), concurrency=1)
+        assert_raises(DeadlineExceeded, res.wait)
+        assert 4 <= res.total < 10, res.total
+        assert Post.call_count == res.succeeded
+        assert all(isinstance(o.error, DeadlineExceeded)
+                   for o in res.failures), res.failures
@@ -0,0 +1,191 @@
+# -*- coding: utf8 -*-
+# Copyright (C) 2015 Daniel Lombraña González
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import email
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+
+import pbclient
+from base import TestPyBossaClient
+from pbclient.uploads import file_digest, hash_files, list_files
+
+
+class _Server(ThreadingMixIn, HTTPServer):
+
+    daemon_threads = True
+
+
+class TestPybossaClientUploads(TestPyBossaClient):
+
+    def setUp(self):
+        super(TestPybossaClientUploads, self).setUp()
+        self.tmp = tempfile.mkdtemp()
+        self.write('a.jpg', b'a' * 1000)
+        self.write('sub/b.jpg', b'b' * 2000)
+        self.write('.hidden', b'x')
+        self.materials = {}
+        self.next_id = 0
+        self.methods = []
+        self.failing = set()
+        self.lock = threading.Lock()
+        test = self
+
+        class Handler(BaseHTTPRequestHandler):
+
+            def answer(self, status, obj=None):
+                body = b'' if obj is None else json.dumps(obj).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def body(self):
+                length = int(self.headers['Content-Length'])
+                return self.rfile.read(length)
+
+            def do_GET(self):
+                test.methods.append('GET')
+                last_id = int(self.path.split('last_id=')[1].split('&')[0]) \
+                    if 'last_id=' in self.path else 0
+                with test.lock:
+                    items = [test.materials[i] for i in sorted(test.materials)
+                             if i > last_id][:100]
+                self.answer(200, items)
+
+            def do_POST(self):
+                test.methods.append('POST')
+                message = email.message_from_bytes(
+                    b'Content-Type: ' +
+                    self.headers['Content-Type'].encode('ascii') +
+                    b'\r\n\r\n' + self.body())
+                part, = [p for p in message.get_payload()
+                         if p.get_filename()]
+                with test.lock:
+                    test.next_id += 1
+                    hm = dict(id=test.next_id, project_id=1,
+                              info=dict(file_name=part.get_filename()),
+                              size=len(part.get_payload(decode=True)))
+                    test.materials[hm['id']] = hm
+                self.answer(200, hm)
+
+            def fail(self, method):
+                if method not in test.failing:
+                    return False
+                self.answer(400, dict(status='failed', action=method,
+                                      status_code=400,
+                                      exception_cls='BadRequest'))
+                return True
+
+            def do_PUT(self):
+                test.methods.append('PUT')
+                if self.fail('PUT'):
+                    return
+                hm_id = int(self.path.split('?')[0].split('/')[-1])
+                data = json.loads(self.body().decode('utf-8'))
+                with test.lock:
+                    test.materials[hm_id].update(info=data['info'])
+                    self.answer(200, test.materials[hm_id])
+
+            def do_DELETE(self):
+                test.methods.append('DELETE')
+                if self.fail('DELETE'):
+                    return
+                hm_id = int(self.path.split('?')[0].split('/')[-1])
+                with test.lock:
+                    del test.materials[hm_id]
+                self.answer(204)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = _Server(('127.0.0.1', 0), Handler)
+        threading.Thread(target=self.server.serve_forever).start()
+        self.pool = pbclient.PyBossaClient(
+            'http://127.0.0.1:%d' % self.server.server_address[1],
+            rate_limit=False)
+
+    def tearDown(self):
+        self.pool.close()
+        self.server.shutdown()
+        self.server.server_close()
+        shutil.rmtree(self.tmp)
+
+    def write(self, path, data):
+        path = os.path.join(self.tmp, *path.split('/'))
+        if not os.path.isdir(os.path.dirname(path)):
+            os.makedirs(os.path.dirname(path))
+        with open(path, 'wb') as f:
+            f.write(data)
+
+    def test_hash_files(self):
+        """Test hash_files hashes every visible file"""
+        assert list_files(self.tmp) == ['a.jpg', 'sub/b.jpg']
+        digests = hash_files(self.tmp, processes=2)
+        assert digests == hash_files(self.tmp, processes=1)
+        assert digests['a.jpg'] == (hashlib.sha256(b'a' * 1000).hexdigest(),
+                                    1000)
+        assert file_digest(os.path.join(self.tmp, 'sub', 'b.jpg')) == \
+            digests['sub/b.jpg']
+
+    def test_sync_helping_materials(self):
+        """Test sync_helping_materials only uploads new and changed files"""
+        res = self.pool.sync_helping_materials(1, self.tmp, processes=1)
+        assert res.uploaded == ['a.jpg', 'sub/b.jpg'], res.uploaded
+        assert res.bytes_uploaded == 3000 and res.bytes_skipped == 0
+        assert res.time_saved == 0, res.time_saved
+        infos = sorted((hm['info']['path'], hm['info']['file_name'])
+                       for hm in self.materials.values())
+        assert infos == [('a.jpg', 'a.jpg'), ('sub/b.jpg', 'b.jpg')], infos
+
+        self.write('a.jpg', b'c' * 500)
+        self.write('new.png', b'n' * 10)
+        self.methods = []
+        res = self.pool.sync_helping_materials(1, self.tmp, processes=1)
+        assert res.uploaded == ['a.jpg', 'new.png'], res.uploaded
+        assert res.replaced == ['a.jpg'], res.replaced
+        assert res.unchanged == ['sub/b.jpg'], res.unchanged
+        assert res.bytes_skipped == 2000 and res.bytes_uploaded == 510
+        assert res.time_saved > 0, res.time_saved
+        assert not res.failures
+        assert sorted(self.methods) == ['DELETE', 'GET', 'POST', 'POST',
+                                        'PUT', 'PUT'], self.methods
+        sizes = sorted((hm['info']['path'], hm['size'])
+                       for hm in self.materials.values())
+        assert sizes == [('a.jpg', 500), ('new.png', 10),
+                         ('sub/b.jpg', 2000)], sizes
+
+        self.methods = []
+        res = self.pool.sync_helping_materials(1, self.tmp)
+        assert res.uploaded == [] and len(res.unchanged) == 3, res.uploaded
+        assert self.methods == ['GET'], self.methods
+
+    def test_sync_helping_materials_orphans(self):
+        """Test sync_helping_materials deletes the uploads it cannot tag"""
+        self.failing.add('PUT')
+        res = self.pool.sync_helping_materials(1, self.tmp, processes=1)
+        assert res.uploaded == [] and len(res.failures) == 2, res.failures
+        assert res.orphaned == [] and self.materials == {}, self.materials
+        self.failing.add('DELETE')
+        res = self.pool.sync_helping_materials(1, self.tmp, processes=1)
+        assert sorted(res.orphaned) == sorted(self.materials), res.orphaned
+        assert len(res.orphaned) == 2, res.orphaned